@@ -4,6 +4,8 @@ import os
 import logging
 from dotenv import load_dotenv
 from src.orchestrator import RunOrchestrator
+from src.foundation.config_loader import AppConfig
+from src.foundation.blob_store import get_blob_store
 
 # Load environment variables
 load_dotenv()
@@ -54,6 +56,18 @@ def handle_execute_run(args):
         logger.error(f"Execute Run Failed: {e}")
         sys.exit(1)
 
+def handle_gc_store(args):
+    try:
+        logger.info(f"Command: gc-store (dry_run={args.dry_run})")
+        store = get_blob_store(AppConfig.load().paths.blob_store_root)
+        report = store.gc(dry_run=args.dry_run, grace_s=args.grace_hours * 3600)
+        prefix = "Would remove" if args.dry_run else "Removed"
+        print(f"Stale references: {report.stale_refs}")
+        print(f"{prefix} {report.blobs_removed} blobs ({report.bytes_freed / (1024 * 1024):.1f} MiB)")
+    except Exception as e:
+        logger.error(f"Store GC Failed: {e}")
+        sys.exit(1)
+
 def main():
     parser = argparse.ArgumentParser(description="FinanceVideoPlatform CLI Runner")
     subparsers = parser.add_subparsers(dest="command", required=True, help="Command to execute")
@@ -71,6 +85,12 @@ def main():
     execute_parser.add_argument("--run-id", required=True, help="Run ID to execute")
     execute_parser.set_defaults(func=handle_execute_run)
 
+    # Command: gc-store
+    gc_parser = subparsers.add_parser("gc-store", help="Delete blob store content no run references anymore")
+    gc_parser.add_argument("--dry-run", action="store_true", help="Report what would be removed")
+    gc_parser.add_argument("--grace-hours", type=float, default=1.0, help="Keep blobs added within this window")
+    gc_parser.set_defaults(func=handle_gc_store)
+
     args = parser.parse_args()
     args.func(args)
 
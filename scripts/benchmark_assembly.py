@@ -0,0 +1,109 @@
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.assembly import VideoAssembler, ASSEMBLY_ENGINES
+
+def ffmpeg(*args):
+    subprocess.check_call(["ffmpeg", "-y", "-loglevel", "error", *args])
+
+def build_timeline(work_dir: str, shots: int, width: int, height: int, fps: int, shot_s: float):
+    """
+    Synthetic timeline from lavfi sources: mostly Veo-like clips, every 5th shot
+    a still (image loop), every 10th shot missing (black fill).
+    A handful of unique sources are rendered once and copied per shot.
+    """
+    assets_dir = os.path.join(work_dir, "assets")
+    os.makedirs(assets_dir, exist_ok=True)
+    src_dir = os.path.join(work_dir, "sources")
+    os.makedirs(src_dir, exist_ok=True)
+
+    clip_sources = []
+    for i in range(4):
+        path = os.path.join(src_dir, f"clip_{i}.mp4")
+        # Veo-ish: 1280x720 @ 24fps, a bit longer than the shot so it gets trimmed
+        ffmpeg("-f", "lavfi", "-i", f"testsrc2=s=1280x720:r=24:d={shot_s + 1}",
+               "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", path)
+        clip_sources.append(path)
+    still = os.path.join(src_dir, "still.png")
+    ffmpeg("-f", "lavfi", "-i", "smptebars=s=1024x1024", "-frames:v", "1", still)
+
+    audio_path = os.path.join(work_dir, "vo.m4a")
+    ffmpeg("-f", "lavfi", "-i", f"sine=frequency=220:duration={shots * shot_s}", "-c:a", "aac", audio_path)
+
+    specs = []
+    for i in range(shots):
+        shot_id = f"S{i:04d}"
+        if i % 10 == 9:
+            pass  # No asset: black fill
+        elif i % 5 == 4:
+            shutil.copy(still, os.path.join(assets_dir, f"{shot_id}_start.png"))
+        else:
+            shutil.copy(clip_sources[i % len(clip_sources)], os.path.join(assets_dir, f"{shot_id}.mp4"))
+        specs.append(SimpleNamespace(id=shot_id, duration_s=shot_s))
+    return specs, audio_path
+
+def run_engine(work_dir: str, engine: str, specs, audio_path: str, width: int, height: int, fps: int):
+    """Returns (elapsed seconds, engine that actually rendered the output)."""
+    # Cold start: no cached chunks from a previous engine run
+    shutil.rmtree(os.path.join(work_dir, "assembly_staging"), ignore_errors=True)
+    assembler = VideoAssembler(work_dir, width=width, height=height, fps=fps, engine=engine)
+    start = time.perf_counter()
+    output = assembler.assemble(specs, audio_path)
+    elapsed = time.perf_counter() - start
+    os.replace(output, os.path.join(work_dir, f"final_{engine}.mp4"))
+    return elapsed, assembler.last_engine
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chunked vs filtergraph assembly on a synthetic timeline.")
+    parser.add_argument("--shots", type=int, default=150, help="Number of shots")
+    parser.add_argument("--shot-seconds", type=float, default=2.0, help="Duration of each shot")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--engines", nargs="+", default=list(ASSEMBLY_ENGINES), choices=ASSEMBLY_ENGINES)
+    parser.add_argument("--keep", action="store_true", help="Keep the work directory")
+    args = parser.parse_args()
+
+    if not shutil.which("ffmpeg"):
+        sys.exit("ffmpeg not found on PATH")
+
+    work_dir = tempfile.mkdtemp(prefix="assembly_bench_")
+    try:
+        print(f"Building synthetic timeline: {args.shots} shots x {args.shot_seconds}s in {work_dir}")
+        specs, audio_path = build_timeline(work_dir, args.shots, args.width, args.height, args.fps, args.shot_seconds)
+
+        results = {}
+        for engine in args.engines:
+            results[engine] = run_engine(work_dir, engine, specs, audio_path, args.width, args.height, args.fps)
+
+        print("\n=== Assembly Benchmark ===")
+        print(f"Shots: {args.shots}  Shot length: {args.shot_seconds}s  Output: {args.width}x{args.height}@{args.fps}")
+        baseline = results.get("chunked", (None, None))[0]
+        fallbacks = []
+        for engine, (elapsed, used) in results.items():
+            if used != engine:
+                # assemble() fell back to another engine: the time is not this engine's
+                fallbacks.append(engine)
+                print(f"{engine:<12} {elapsed:8.2f}s  (FELL BACK to {used}; not comparable)")
+                continue
+            speedup = f"  ({baseline / elapsed:.2f}x vs chunked)" if baseline and engine != "chunked" else ""
+            print(f"{engine:<12} {elapsed:8.2f}s{speedup}")
+        if fallbacks:
+            sys.exit(f"Engine(s) fell back during the benchmark: {', '.join(fallbacks)}")
+    finally:
+        if args.keep:
+            print(f"Work directory kept: {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
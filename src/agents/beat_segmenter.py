@@ -9,8 +9,9 @@ import logging
 from typing import List, Dict, Any, Tuple
 from datetime import datetime
 
-from src.llm import LLMClient, LLMJsonRequest, LLMMessage
+from src.llm import LLMClient, LLMJsonRequest, LLMMessage, LLMResponse, generate_many
 from .beat_models import Beat, BeatSource, BeatLLMResponse, BeatSheetMeta
+from src.foundation.progress import ProgressReporter
 
 logger = logging.getLogger(__name__)
 
@@ -94,14 +95,18 @@ class BeatSegmenterAgent:
     Segments a script into beats using ranges to avoid "hallucinating" text or visuals.
     """
     
-    def __init__(self, llm: LLMClient, config: Dict[str, Any] = None):
+    def __init__(self, llm: LLMClient, config: Dict[str, Any] = None, progress: ProgressReporter = None):
         self.llm = llm
         self.config = config or {}
+        # Per-chunk progress (StepContext.progress); counters only when not given
+        self.progress = progress or ProgressReporter()
         # Dynamic resizing overrides these if script is long enough
         self.min_beats_default = self.config.get("min_beats", 6)
         self.max_beats_default = self.config.get("max_beats", 18)
         self.target_beat_duration = self.config.get("target_beat_duration", 4.0) # Seconds per beat (T-103/Bible req)
         self.contamination_threshold = self.config.get("visual_contamination_threshold", 30)
+        # Max chunk requests in flight at once (1 = sequential, legacy behaviour)
+        self.max_concurrent_chunks = max(1, int(self.config.get("max_concurrent_chunks", 4)))
         self.agent_version = "BeatSegmenter/1.2" # Version Bump for Dynamic Sizes
 
     def segment_script(self, run_id: str, script_text: str, bible_text: str = None) -> Tuple[List[Beat], BeatSheetMeta]:
@@ -136,29 +141,15 @@ class BeatSegmenterAgent:
         chunks = self._create_chunks(narrable_lines, markers)
         logger.info(f"Script split into {len(chunks)} chunks for processing.")
         
+        # Step B: Segment chunks (bounded concurrency), then re-stitch in chunk order
+        chunk_results = self._segment_chunks(run_id, chunks, bible_text)
+        
         all_llm_beats = []
         global_beat_order = 1
         
-        for i, chunk in enumerate(chunks):
-            chunk_lines = chunk['lines']
+        for chunk, chunk_beats in zip(chunks, chunk_results):
             offset = chunk['offset']
             
-            logger.info(f"Processing Chunk {i+1}/{len(chunks)}: Lines {offset+1}-{offset+len(chunk_lines)}")
-            
-            # Numbered script relative to chunk
-            numbered_script = "\n".join([f"{i+1}: {line}" for i, line in enumerate(chunk_lines)])
-            
-            # Dynamic limits for chunk
-            chunk_text = "\n".join(chunk_lines)
-            c_min, c_max = self._calculate_dynamic_limits(chunk_text)
-            
-            # Call LLM
-            try:
-                chunk_beats = self._get_segmentation_from_llm(run_id, numbered_script, c_min, c_max, bible_text)
-            except Exception as e:
-                logger.error(f"FAILED Processing Chunk {i+1}: {e}", exc_info=True)
-                raise e
-            
             # Adjust and collect
             for b in chunk_beats:
                 b.line_start += offset
@@ -186,6 +177,61 @@ class BeatSegmenterAgent:
         
         return beats, meta
 
+    def _segment_chunks(self, run_id: str, chunks: List[Dict], bible_text: str = None) -> List[List[BeatLLMResponse]]:
+        """
+        Segment every chunk, keeping at most `max_concurrent_chunks` LLM requests in flight.
+        Results are returned in chunk order regardless of completion order.
+        """
+        self.progress.start(len(chunks), "Segmenting script")
+        try:
+            if self.max_concurrent_chunks <= 1 or len(chunks) <= 1:
+                results = []
+                for i, chunk in enumerate(chunks):
+                    results.append(self._segment_chunk(run_id, i, len(chunks), chunk, bible_text))
+                    self.progress.advance()
+                return results
+            
+            concurrency = min(self.max_concurrent_chunks, len(chunks))
+            logger.info(f"Segmenting {len(chunks)} chunks with up to {concurrency} concurrent requests.")
+            
+            requests = [self._chunk_request(run_id, i, len(chunks), chunk, bible_text) for i, chunk in enumerate(chunks)]
+            try:
+                # Responses come back in chunk order, not completion order
+                responses = generate_many(self.llm, requests, max_concurrency=concurrency, on_done=self.progress.advance)
+            except Exception as e:
+                logger.error(f"FAILED Processing Chunks: {e}", exc_info=True)
+                raise
+            return [self._parse_segmentation(req, response) for req, response in zip(requests, responses)]
+        finally:
+            self.progress.flush()
+
+    def _segment_chunk(self, run_id: str, index: int, total: int, chunk: Dict, bible_text: str = None) -> List[BeatLLMResponse]:
+        """Run LLM segmentation for a single chunk. Line numbers stay chunk-relative."""
+        req = self._chunk_request(run_id, index, total, chunk, bible_text)
+        
+        # Call LLM
+        try:
+            return self._parse_segmentation(req, self.llm.generate_json(req))
+        except Exception as e:
+            logger.error(f"FAILED Processing Chunk {index+1}: {e}", exc_info=True)
+            raise e
+
+    def _chunk_request(self, run_id: str, index: int, total: int, chunk: Dict, bible_text: str = None) -> LLMJsonRequest:
+        """Segmentation request for one chunk (numbered chunk-relative, limits sized to the chunk)."""
+        chunk_lines = chunk['lines']
+        offset = chunk['offset']
+        
+        logger.info(f"Processing Chunk {index+1}/{total}: Lines {offset+1}-{offset+len(chunk_lines)}")
+        
+        # Numbered script relative to chunk
+        numbered_script = "\n".join([f"{i+1}: {line}" for i, line in enumerate(chunk_lines)])
+        
+        # Dynamic limits for chunk
+        chunk_text = "\n".join(chunk_lines)
+        c_min, c_max = self._calculate_dynamic_limits(chunk_text)
+        
+        return self._segmentation_request(run_id, numbered_script, c_min, c_max, bible_text)
+
     def _calculate_dynamic_limits(self, script_text: str) -> Tuple[int, int]:
         """Calculate min/max beats based on script word count and target duration."""
         # Clean text
@@ -277,6 +323,10 @@ class BeatSegmenterAgent:
 
     def _get_segmentation_from_llm(self, run_id: str, numbered_script: str, min_beats: int, max_beats: int, bible_text: str = None) -> List[BeatLLMResponse]:
         """Call LLM to get beat ranges (T-103.3 Step B)"""
+        req = self._segmentation_request(run_id, numbered_script, min_beats, max_beats, bible_text)
+        return self._parse_segmentation(req, self.llm.generate_json(req))
+
+    def _segmentation_request(self, run_id: str, numbered_script: str, min_beats: int, max_beats: int, bible_text: str = None) -> LLMJsonRequest:
         schema = {
             "type": "object",
             "required": ["beats"],
@@ -325,12 +375,17 @@ class BeatSegmenterAgent:
             max_tokens=12000, # Increased for long scripts (150+ beats)
             timeout_s=600.0   # Significantly increased for long generation time
         )
+        return req
 
-        response = self.llm.generate_json(req)
-        
+    def _parse_segmentation(self, req: LLMJsonRequest, response: LLMResponse) -> List[BeatLLMResponse]:
         # Convert to model list
-        beats_data = response.json.get("beats", [])
-        return [BeatLLMResponse(**b) for b in beats_data]
+        try:
+            beats_data = response.json.get("beats", [])
+            return [BeatLLMResponse(**b) for b in beats_data]
+        except Exception:
+            # Don't let the response cache replay a completion we can't use
+            self.llm.invalidate(req)
+            raise
 
     def _post_process(self, run_id: str, script_lines: List[str], llm_beats: List[BeatLLMResponse], min_expected: int = None, max_expected: int = None) -> Tuple[List[Beat], BeatSheetMeta]:
         """Post-process LLM output into final Beats (T-103.3 Step C)"""
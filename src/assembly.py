@@ -1,11 +1,28 @@
 import os
 import subprocess
 import json
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 from .models import Manifest, ShotSpec
+from .cache.cache_manager import CacheManager
+from .foundation.hashing import hash_file_sha256
+from .foundation.media_probe import get_media_probe, MediaInfo, StreamInfo, FFprobeNotFound, MediaProbeError
+from .foundation.progress import ProgressReporter
+
+# Bump when the chunk render recipe changes in a way the key can't see
+CHUNK_CACHE_VERSION = 3
+ENCODE_ARGS = [
+    "-c:v", "libx264",
+    "-preset", "ultrafast", # assembly speed important
+    "-crf", "23",
+]
+
+ASSEMBLY_ENGINES = ("chunked", "filtergraph")
 
 class VideoAssembler:
-    def __init__(self, output_dir: str, width: int = 1920, height: int = 1080, fps: int = 30):
+    def __init__(self, output_dir: str, width: int = 1920, height: int = 1080, fps: int = 30,
+                 workers: Optional[int] = None, threads_per_chunk: Optional[int] = None, engine: Optional[str] = None,
+                 progress: Optional[ProgressReporter] = None):
         self.output_dir = output_dir
         self.assets_dir = os.path.join(output_dir, "assets")
         self.staging_dir = os.path.join(output_dir, "assembly_staging")
@@ -15,57 +32,121 @@ class VideoAssembler:
         self.height = height
         self.fps = fps
 
+        # Chunk encodes are independent ffmpeg processes; run several at once and
+        # split the cores between them so N encodes don't each spawn cpu_count threads.
+        cpus = os.cpu_count() or 1
+        self.workers = max(1, workers or int(os.environ.get("ASSEMBLY_WORKERS", "0")) or max(1, cpus // 2))
+        self.threads_per_chunk = max(1, threads_per_chunk or int(os.environ.get("ASSEMBLY_THREADS_PER_CHUNK", "0")) or cpus // self.workers)
+
+        self.probe = get_media_probe()
+        # Per-chunk progress (StepContext.services["progress"]); counters only when not given
+        self.progress = progress or ProgressReporter()
+
+        self.engine = (engine or os.environ.get("ASSEMBLY_ENGINE", "chunked")).lower()
+        if self.engine not in ASSEMBLY_ENGINES:
+            raise ValueError(f"Unknown assembly engine '{self.engine}'. Expected one of {ASSEMBLY_ENGINES}")
+        # Engine that produced the last output (differs from self.engine after a fallback)
+        self.last_engine: Optional[str] = None
+
     def assemble(self, shot_specs: List[ShotSpec], audio_path: str) -> str:
         """
         Assembles the video. Returns path to final output.
+        Engine "chunked" (default): encode one chunk per shot, then concat (cached, parallel).
+        Engine "filtergraph": one ffmpeg with a single filter_complex graph and one encode;
+        falls back to the chunked path if it fails (see `last_engine`).
         """
-        print(f"Starting Assembly of {len(shot_specs)} shots...")
+        print(f"Starting Assembly of {len(shot_specs)} shots [Engine: {self.engine}]...")
         
+        # 1. Identify Sources
+        sources = [self._resolve_source(shot) for shot in shot_specs]
+
+        output_filename = "final_render.mp4"
+        output_path = os.path.join(self.output_dir, output_filename)
+
+        if self.engine == "filtergraph":
+            try:
+                output = self._assemble_filtergraph(sources, audio_path, output_path)
+                self.last_engine = "filtergraph"
+                return output
+            except (subprocess.CalledProcessError, OSError) as e:
+                print(f"WARNING: Filtergraph assembly failed ({e}). Falling back to chunked assembly.")
+
+        output = self._assemble_chunked(sources, audio_path, output_path)
+        self.last_engine = "chunked"
+        return output
+
+    def _resolve_source(self, shot: ShotSpec) -> Tuple[str, str, float, bool]:
+        """Returns (shot_id, source_path or "BLACK", duration, is_video)."""
+        # Try .mp4 first, then .png (fallback or static)
+        mp4_path = os.path.join(self.assets_dir, f"{shot.id}.mp4")
+        # If not using ID, maybe using role convention? 
+        # Current generator uses {shot_id}.mp4 or {shot_id}_ref.png
+        # We'll check standard names.
+        
+        source_path = None
+        is_video = False
+        
+        if os.path.exists(mp4_path):
+            source_path = mp4_path
+            is_video = True
+        else:
+             # Fallback to image
+             png_path = os.path.join(self.assets_dir, f"{shot.id}_start.png") # Try strict first
+             if not os.path.exists(png_path):
+                 # Try loose convention logic or just skip/fail?
+                 # Robustness: Try finding any file starting with shot_id?
+                 # MVP: strict name
+                 pass
+             
+             if os.path.exists(png_path):
+                 source_path = png_path
+                 is_video = False
+        
+        if not source_path:
+            print(f"WARNING: No asset for {shot.id}. Generating Black Frame.")
+            # We will handle black frame in ffmpeg generation
+            source_path = "BLACK"
+
+        # Exact duration required
+        return shot.id, source_path, shot.duration_s, is_video
+
+    def _assemble_chunked(self, sources: List[Tuple[str, str, float, bool]], audio_path: str, output_path: str) -> str:
         concat_list_path = os.path.join(self.staging_dir, "concat_list.txt")
-        chunks = []
+        jobs = []
+        source_hashes = self._load_source_hashes()
 
         # 1. Pre-process Chunks
-        for i, shot in enumerate(shot_specs):
-            # Identify Source
-            # Try .mp4 first, then .png (fallback or static)
-            mp4_path = os.path.join(self.assets_dir, f"{shot.id}.mp4")
-            # If not using ID, maybe using role convention? 
-            # Current generator uses {shot_id}.mp4 or {shot_id}_ref.png
-            # We'll check standard names.
-            
-            source_path = None
-            is_video = False
-            
-            if os.path.exists(mp4_path):
-                source_path = mp4_path
-                is_video = True
-            else:
-                 # Fallback to image
-                 png_path = os.path.join(self.assets_dir, f"{shot.id}_start.png") # Try strict first
-                 if not os.path.exists(png_path):
-                     # Try loose convention logic or just skip/fail?
-                     # Robustness: Try finding any file starting with shot_id?
-                     # MVP: strict name
-                     pass
-                 
-                 if os.path.exists(png_path):
-                     source_path = png_path
-                     is_video = False
-            
-            if not source_path:
-                print(f"WARNING: No asset for {shot.id}. Generating Black Frame.")
-                # We will handle black frame in ffmpeg generation
-                source_path = "BLACK"
-
-            chunk_filename = f"chunk_{i:04d}_{shot.id}.mp4"
+        for shot_id, source_path, duration, is_video in sources:
+            # Content-addressed name: an unchanged shot maps to the chunk already on disk
+            chunk_key = self._chunk_key(source_path, duration, is_video, source_hashes)
+            chunk_filename = f"chunk_{shot_id}_{chunk_key[:16]}.mp4"
             chunk_path = os.path.join(self.staging_dir, chunk_filename)
             
-            # Exact duration required
-            duration = shot.duration_s
-            
-            self._render_chunk(source_path, chunk_path, duration, is_video)
-            chunks.append(chunk_path)
-            print(f"Rendered Chunk {i+1}/{len(shot_specs)}: {chunk_filename}")
+            jobs.append([source_path, chunk_path, duration, is_video, False])
+
+        self._save_source_hashes(source_hashes)
+
+        # Clips that already match the output format are trimmed by stream copy.
+        # One batched probe for every clip still to render (cached per file version).
+        to_probe = [job[0] for job in jobs if job[3] and not os.path.exists(job[1])]
+        if to_probe:
+            try:
+                probed = self.probe.probe_many(to_probe)
+            except FFprobeNotFound:
+                print("WARNING: ffprobe not found; re-encoding every clip.")
+                probed = {}
+            # Copied and encoded chunks end up in one stream-copied concat
+            signature = self._encoder_signature() if probed else None
+            for job in jobs:
+                if job[0] in probed:
+                    job[4] = self._is_conformant(probed[job[0]], job[2], signature)
+        jobs = [tuple(job) for job in jobs]
+
+        chunks = [job[1] for job in jobs]
+        stale = [job for job in jobs if not os.path.exists(job[1])]
+        copies = sum(1 for job in stale if job[4])
+        print(f"Chunk cache: {len(jobs) - len(stale)} reused, {len(stale)} to render ({copies} by stream copy)")
+        self._render_chunks(stale)
 
         # 2. Write Concat List
         with open(concat_list_path, "w") as f:
@@ -76,9 +157,6 @@ class VideoAssembler:
                 f.write(f"file '{safe_path}'\n")
 
         # 3. Concatenate & Mux Audio
-        output_filename = "final_render.mp4"
-        output_path = os.path.join(self.output_dir, output_filename)
-        
         # ffmpeg -f concat -safe 0 -i list.txt -i audio.mp3 -c:v copy -map 0:v -map 1:a -shortest out.mp4
         # Note: We re-encoded chunks to be identical, so copy is safe and fast.
         
@@ -98,9 +176,233 @@ class VideoAssembler:
         
         print(f"Running Final Concat: {' '.join(cmd)}")
         subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
-        
+
+        self._prune_chunks([shot_id for shot_id, _, _, _ in sources], chunks)
+        return output_path
+
+    def _prune_chunks(self, shot_ids: List[str], current_chunks: List[str]):
+        """
+        Deletes older chunks of these shots (rerolled clip, changed duration...).
+        Only called after a successful concat, so a failed run keeps its cache.
+        """
+        current = {os.path.basename(chunk) for chunk in current_chunks}
+        shot_ids = set(shot_ids)
+        removed = 0
+        for name in os.listdir(self.staging_dir):
+            if not name.startswith("chunk_") or not name.endswith(".mp4") or name in current:
+                continue
+            # chunk_{shot_id}_{key[:16]}.mp4; shot ids may contain underscores
+            shot_id, _, key = name[len("chunk_"):-len(".mp4")].rpartition("_")
+            if shot_id not in shot_ids or len(key) != 16:
+                continue
+            try:
+                os.remove(os.path.join(self.staging_dir, name))
+                removed += 1
+            except OSError as e:
+                print(f"Warning: Could not remove stale chunk {name}: {e}")
+        if removed:
+            print(f"Removed {removed} stale chunks")
+
+
+    def _assemble_filtergraph(self, sources: List[Tuple[str, str, float, bool]], audio_path: str, output_path: str) -> str:
+        """
+        Single-pass engine: every shot is an ffmpeg input (image loop, trimmed
+        video or lavfi black), normalized in one filter_complex, concatenated
+        and muxed with the voiceover in a single encode. No intermediate chunks.
+        """
+        cmd = ["ffmpeg", "-y"]
+        graph = []
+        for i, (shot_id, source_path, duration, is_video) in enumerate(sources):
+            if source_path == "BLACK":
+                cmd.extend(["-f", "lavfi", "-t", str(duration), "-i", f"color=c=black:s={self.width}x{self.height}:r={self.fps}"])
+            elif not is_video:
+                cmd.extend(["-loop", "1", "-t", str(duration), "-i", source_path])
+            else:
+                cmd.extend(["-t", str(duration), "-i", source_path])
+            # Same normalization as a chunk, then exact duration and a zeroed timeline for concat
+            graph.append(f"[{i}:v]{self._filter_str()},trim=duration={duration},setpts=PTS-STARTPTS[v{i}]")
+
+        labels = "".join(f"[v{i}]" for i in range(len(sources)))
+        graph.append(f"{labels}concat=n={len(sources)}:v=1:a=0[outv]")
+
+        # The graph goes in a file: 150 shots would blow past command-line limits on Windows
+        script_path = os.path.join(self.staging_dir, "filtergraph.txt")
+        with open(script_path, "w") as f:
+            f.write(";\n".join(graph))
+
+        cmd.extend(["-i", audio_path])
+        cmd.extend([
+            "-filter_complex_script", script_path,
+            "-map", "[outv]",
+            "-map", f"{len(sources)}:a",
+        ])
+        cmd.extend(ENCODE_ARGS)
+        cmd.extend([
+            "-c:a", "aac",
+            "-shortest",
+            output_path
+        ])
+
+        print(f"Running Filtergraph Assembly: {len(sources)} inputs, graph in {script_path}")
+        subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
         return output_path
 
+    def _filter_str(self) -> str:
+        # scale=-1:1080 helps keep aspect ratio, but we want strict 1920x1080. 
+        # force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2
+        return f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease,pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={self.fps},format=yuv420p"
+
+    def _chunk_key(self, source_path: str, duration: float, is_video: bool, source_hashes: dict) -> str:
+        """Hash of everything that determines the chunk's pixels."""
+        source_sha = "BLACK" if source_path == "BLACK" else self._source_sha256(source_path, source_hashes)
+        return CacheManager.compute_key({
+            "version": CHUNK_CACHE_VERSION,
+            "source_sha256": source_sha,
+            "is_video": is_video,
+            "duration": duration,
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "filter": self._filter_str(),
+            "encode": ENCODE_ARGS,
+        })
+
+    def _source_sha256(self, path: str, source_hashes: dict) -> str:
+        """SHA-256 of a source asset, memoized by (size, mtime) so unchanged clips aren't re-read."""
+        st = os.stat(path)
+        entry = source_hashes.get(path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["sha256"]
+        sha = hash_file_sha256(path)
+        source_hashes[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha}
+        return sha
+
+    def _encoder_signature(self) -> Optional[Tuple[str, int, str]]:
+        """
+        H.264 signature of the chunks we encode, read from a one-frame reference
+        render. The final concat copies the first chunk's decoder config, so a clip
+        may only be stream-copied when its profile, level and SPS/PPS are the same.
+        None (copy nothing) if the reference can't be rendered or probed.
+        """
+        key = CacheManager.compute_key({
+            "version": CHUNK_CACHE_VERSION,
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "encode": ENCODE_ARGS,
+        })
+        reference_path = os.path.join(self.staging_dir, f"encoder_ref_{key[:16]}.mp4")
+        try:
+            if not os.path.exists(reference_path):
+                self._render_chunk("BLACK", reference_path, 1.0 / self.fps, False)
+            info = self.probe.probe(reference_path)
+        except (subprocess.CalledProcessError, OSError, MediaProbeError) as e:
+            print(f"WARNING: Could not probe the encoder reference ({e}); re-encoding every clip.")
+            return None
+        return self._h264_signature(info.video)
+
+    @staticmethod
+    def _h264_signature(stream: Optional[StreamInfo]) -> Optional[Tuple[str, int, str]]:
+        if not stream or stream.codec_name != "h264" or not stream.extradata_hash:
+            return None
+        return stream.profile, stream.level, stream.extradata_hash
+
+    def _is_conformant(self, info: Optional[MediaInfo], duration: float, signature: Optional[Tuple[str, int, str]]) -> bool:
+        """True if the clip can go into the concat untouched (only trimmed)."""
+        stream = info.video if info else None
+        if not stream or signature is None:
+            return False
+        return (
+            self._h264_signature(stream) == signature
+            and stream.width == self.width
+            and stream.height == self.height
+            and stream.pix_fmt == "yuv420p"
+            and stream.r_frame_rate in (f"{self.fps}/1", str(self.fps))
+            and stream.sample_aspect_ratio in (None, "1:1", "0:1", "N/A")
+            # A short clip still goes through the encoder path
+            and info.duration_s >= duration
+        )
+
+    def _load_source_hashes(self) -> dict:
+        path = os.path.join(self.staging_dir, "source_hashes.json")
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                print(f"Warning: Corrupt {path}; re-hashing sources.")
+        return {}
+
+    def _save_source_hashes(self, source_hashes: dict):
+        path = os.path.join(self.staging_dir, "source_hashes.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(source_hashes, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _render_chunks(self, jobs: List[Tuple[str, str, float, bool, bool]]) -> List[str]:
+        """
+        Renders all chunks, `self.workers` at a time.
+        Returns chunk paths in shot order regardless of completion order.
+        """
+        total = len(jobs)
+        if not total:
+            return []
+        workers = min(self.workers, total) or 1
+        print(f"Rendering {total} chunks [Workers: {workers}, Threads/Chunk: {self.threads_per_chunk}]")
+
+        def render(index: int, job: Tuple[str, str, float, bool, bool]) -> str:
+            source_path, chunk_path, duration, is_video, stream_copy = job
+            if stream_copy:
+                self._copy_chunk(source_path, chunk_path, duration)
+            else:
+                self._render_chunk(source_path, chunk_path, duration, is_video)
+            print(f"Rendered Chunk {index + 1}/{total}: {os.path.basename(chunk_path)}")
+            self.progress.advance(message=f"Rendered chunk {os.path.basename(chunk_path)}")
+            return chunk_path
+
+        self.progress.start(total, "Rendering chunks")
+        try:
+            if workers == 1:
+                return [render(i, job) for i, job in enumerate(jobs)]
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assembly") as executor:
+                futures = [executor.submit(render, i, job) for i, job in enumerate(jobs)]
+                try:
+                    return [future.result() for future in futures]
+                except Exception:
+                    # Don't start the remaining encodes; running ones finish
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        finally:
+            self.progress.flush()
+
+    def _copy_chunk(self, source, output, duration):
+        """
+        Fast path for conformant clips: trim by stream copy, no transcode.
+        Chunks always start at t=0 (a keyframe), so only the tail is cut and
+        no smart cut is needed; the cut lands on the packet boundary.
+        """
+        tmp_output = output[:-len(".mp4")] + ".part.mp4"
+        cmd = [
+            "ffmpeg", "-y",
+            "-t", str(duration),
+            "-i", source,
+            "-map", "0:v:0",
+            "-c", "copy",
+            "-an",
+            "-video_track_timescale", str(self.fps * 512), # same timebase as encoded chunks for the concat
+            tmp_output
+        ]
+        try:
+            subprocess.check_call(cmd)
+            os.replace(tmp_output, output)
+        except subprocess.CalledProcessError:
+            print(f"Stream copy failed for {source}; re-encoding.")
+            if os.path.exists(tmp_output):
+                os.remove(tmp_output)
+            self._render_chunk(source, output, duration, True)
+
     def _render_chunk(self, source, output, duration, is_video):
         """
         Normalizes any input to exactly:
@@ -110,11 +412,9 @@ class VideoAssembler:
         - Fixed Duration
         """
         # Base filters
-        # scale=-1:1080 helps keep aspect ratio, but we want strict 1920x1080. 
-        # force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2
-        filter_str = f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease,pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={self.fps},format=yuv420p"
+        filter_str = self._filter_str()
         
-        cmd = ["ffmpeg", "-y"]
+        cmd = ["ffmpeg", "-y", "-filter_threads", str(self.threads_per_chunk)]
         
         if source == "BLACK":
             # Generate black video
@@ -151,16 +451,21 @@ class VideoAssembler:
                 cmd.extend(["-vf", filter_str])
 
         # Encoding speed/quality
+        # Rendered under a temp name: the cache treats any existing chunk file as complete
+        tmp_output = output[:-len(".mp4")] + ".part.mp4"
+        cmd.extend(ENCODE_ARGS)
         cmd.extend([
-            "-c:v", "libx264",
-            "-preset", "ultrafast", # assembly speed important
-            "-crf", "23",
-            output
+            "-threads", str(self.threads_per_chunk), # CPU budget per parallel encode
+            "-video_track_timescale", str(self.fps * 512),
+            tmp_output
         ])
         
         try:
             # DEBUG: capture output to see error
             subprocess.check_call(cmd)
+            os.replace(tmp_output, output)
         except subprocess.CalledProcessError as e:
             print(f"Error rendering chunk {output} from {source}")
+            if os.path.exists(tmp_output):
+                os.remove(tmp_output)
             raise e
@@ -4,6 +4,8 @@ import time
 from typing import List, Dict, Tuple
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from .models import AlignmentSource, AlignmentStats
+from .clients.http import get_session
+from .foundation.media_probe import get_media_probe
 
 class AudioAligner:
     def __init__(self, source: AlignmentSource = AlignmentSource.FORCED_ALIGNMENT):
@@ -13,41 +15,14 @@ class AudioAligner:
             
         self.source = source
         self.api_key = os.environ.get("OPENAI_API_KEY", "")
+        self.http = get_session()
 
     def get_audio_duration(self, audio_path: str) -> float:
         """
-        Uses ffprobe to get precise audio duration.
+        Uses ffprobe (via the shared, cached MediaProbe) to get precise audio duration.
         """
-        import subprocess
-        import shutil
-        
-        ffprobe_cmd = shutil.which("ffprobe")
-        
-        # Fallback to common locations if not found in PATH
-        if not ffprobe_cmd:
-            common_paths = ["/usr/bin/ffprobe", "/usr/local/bin/ffprobe", "/bin/ffprobe"]
-            for path in common_paths:
-                if os.path.exists(path):
-                    ffprobe_cmd = path
-                    break
-        
-        if not ffprobe_cmd:
-            # Last resort: just use "ffprobe" string and hope
-            print("WARNING: Could not find ffprobe in PATH or common locations. Using default 'ffprobe'.")
-            ffprobe_cmd = "ffprobe"
-        else:
-            print(f"DEBUG: Using ffprobe at: {ffprobe_cmd}")
-
         try:
-            cmd = [
-                ffprobe_cmd, 
-                "-v", "error", 
-                "-show_entries", "format=duration", 
-                "-of", "default=noprint_wrappers=1:nokey=1", 
-                audio_path
-            ]
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
-            return float(result.stdout.strip())
+            return get_media_probe().probe(audio_path).duration_s
         except Exception as e:
             print(f"Error getting duration for {audio_path}: {e}")
             raise RuntimeError(f"Could not check audio duration: {e}")
@@ -118,7 +93,7 @@ class AudioAligner:
                     "timestamp_granularities[]": "word"
                 }
                 
-                resp = requests.post(
+                resp = self.http.post(
                     "https://api.openai.com/v1/audio/transcriptions",
                     headers=headers,
                     files=files,
@@ -0,0 +1,101 @@
+import os
+import json
+import shutil
+import hashlib
+from typing import Any, Dict, Optional
+from ..database_manager import DatabaseManager
+from ..foundation.blob_store import BlobStore, get_blob_store
+from ..foundation.paths import project_path
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def init_image_fingerprint(local_path: Optional[str], url: Optional[str] = None) -> Optional[str]:
+    """
+    Identity of an init/reference image for cache keys: the content hash of the
+    local file when we have it (URLs from the provider expire and change per
+    upload), otherwise the URL itself.
+    """
+    if local_path and os.path.exists(local_path):
+        return f"sha256:{file_sha256(local_path)}"
+    return url or None
+
+class GenerationCache:
+    """
+    Content-addressed cache of generated assets (images, clips), backed by the
+    `assets.cache_key` column. A key covers every generation input, so a hit
+    is the same render regardless of which run or version produced it.
+    With a BlobStore, stored renders are adopted into it and cache hits are
+    linked from the blob, so every run holding a render shares one copy.
+    """
+    def __init__(self, db: DatabaseManager, blob_store: Optional[BlobStore] = None):
+        self.db = db
+        self.blob_store = blob_store
+
+    def lookup(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Newest asset for `cache_key` whose file still exists on disk."""
+        for asset in self.db.find_assets_by_cache_key(cache_key):
+            if asset.get("path") and os.path.exists(asset["path"]):
+                return asset
+        return None
+
+    def is_current(self, path: str, cache_key: str) -> bool:
+        """
+        True if `path` exists and was produced from `cache_key`, or if nothing
+        is known about it (files from runs predating the cache are kept).
+        """
+        if not os.path.exists(path):
+            return False
+        latest = self.db.find_latest_asset_by_path(os.path.abspath(path))
+        return latest is None or not latest.get("cache_key") or latest["cache_key"] == cache_key
+
+    def materialize(self, asset: Dict[str, Any], dest_path: str) -> str:
+        """
+        Places the cached file at `dest_path`: linked from the blob store when
+        there is one, otherwise hardlinked from the earlier run (copy if the
+        filesystem can't link).
+        """
+        src_path = asset["path"]
+        if os.path.exists(dest_path) and os.path.samefile(src_path, dest_path):
+            return dest_path
+        if self.blob_store:
+            digest = self.blob_store.adopt(src_path, self._known_sha256(asset))
+            self.blob_store.link(digest, dest_path)
+            return dest_path
+        part_path = dest_path + ".part"
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        try:
+            os.link(src_path, part_path)
+        except OSError:
+            shutil.copy2(src_path, part_path)
+        os.replace(part_path, dest_path)
+        return dest_path
+
+    def store(self, cache_key: str, shot_id: str, asset_type: str, path: str, role: Optional[str] = None,
+              url: Optional[str] = None, meta: Optional[Dict[str, Any]] = None) -> str:
+        """Registers a generated (or reused) asset under its cache key. Returns the asset_id."""
+        if self.blob_store:
+            sha256 = self.blob_store.adopt(path, (meta or {}).get("sha256"))
+            meta = {**(meta or {}), "sha256": sha256}
+        return self.db.register_asset(
+            shot_id, asset_type, os.path.abspath(path), role=role, url=url, meta=meta, cache_key=cache_key
+        )
+
+    @staticmethod
+    def _known_sha256(asset: Dict[str, Any]) -> Optional[str]:
+        try:
+            return json.loads(asset.get("metadata") or "{}").get("sha256")
+        except ValueError:
+            return None
+
+def default_generation_cache() -> Optional[GenerationCache]:
+    """Cache on the pipeline DB (the API server's, by default) unless disabled with GENERATION_CACHE=0."""
+    if os.environ.get("GENERATION_CACHE", "1") == "0":
+        return None
+    db_path = project_path(os.environ.get("PIPELINE_DB_PATH", "pipeline.db"))
+    return GenerationCache(DatabaseManager(db_path), get_blob_store())
@@ -1,7 +1,8 @@
 import os
-import requests
 import json
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
+from .http import get_session
+from ..llm.rate_limit import get_rate_governor, estimate_tokens, parse_retry_after
 
 class AgentClient:
     """
@@ -10,6 +11,10 @@ class AgentClient:
     """
     def __init__(self):
         self.api_key = os.environ.get("AGENT_API_KEY")
+        # Pooled keep-alive session shared with the other provider clients
+        self.http = get_session()
+        # RPM/TPM budget shared with every other LLM client in the process
+        self.governor = get_rate_governor()
         gemini_key = os.environ.get("GEMINI_API_KEY")
         
         self.mock_mode = os.environ.get("AGENT_MOCK_MODE", "0") == "1"
@@ -19,10 +24,12 @@ class AgentClient:
             # Default to Google OpenAI-compat endpoint
             self.base_url = os.environ.get("AGENT_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai")
             self.model = os.environ.get("AGENT_MODEL", "gemini-1.5-flash")
+            self.provider = "gemini"
             print(f"DEBUG: Using Gemini API Key with model {self.model}")
         else:
             self.base_url = os.environ.get("AGENT_BASE_URL", "https://api.openai.com/v1")
             self.model = os.environ.get("AGENT_MODEL", "gpt-3.5-turbo")
+            self.provider = "openai"
         
         if not self.api_key and not self.mock_mode:
             print("WARNING: AGENT_API_KEY (or GEMINI_API_KEY) not set. Agent calls will fail or fallback if handled.")
@@ -79,10 +86,7 @@ class AgentClient:
             if "chat/completions" not in url and not url.endswith("/"):
                  url += "/chat/completions"
 
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._post_completion(self.provider, self.model, url, payload, len(prompt), headers=headers, timeout=30)
             content = data["choices"][0]["message"]["content"]
             
             # Simple JSON cleanup if md blocks are used
@@ -95,6 +99,76 @@ class AgentClient:
             # On failure, return None -> Fallback
             return None
 
+    def suggest_visuals_batch(self, script_texts: List[str], context: Optional[str] = None) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        suggest_visuals for several segments in one request.
+        Returns {segment index: {"metaphor", "camera", "intent"}} for the indices the
+        agent answered; entries are not validated here. None when the agent is
+        unavailable or the call fails, so the caller falls back per segment.
+        """
+        if self.mock_mode or not self.api_key:
+            return None
+
+        segments = json.dumps([{"index": i, "text": text} for i, text in enumerate(script_texts)], indent=2)
+        prompt = f"""
+        You are a Visual Director for a finance video.
+        For EACH of the following script segments, suggest a visual metaphor (image description) and a camera movement.
+        
+        Script Segments (JSON):
+        {segments}
+        Context: {context or "N/A"}
+        
+        Available Camera Movements: STATIC, PAN_LEFT, PAN_RIGHT, TILT_UP, TILT_DOWN, ZOOM_IN, ZOOM_OUT
+        
+        Respond ONLY with a valid JSON object with exactly one entry per segment index, in this format:
+        {{
+            "shots": [
+                {{
+                    "index": 0,
+                    "metaphor": "Detailed visual description of the scene...",
+                    "camera": "CAMERA_MOVEMENT_ENUM",
+                    "intent": "Brief explanation of the director's intent..."
+                }}
+            ]
+        }}
+        """
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are a helpful creative assistant outputting JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.7,
+            "response_format": {"type": "json_object"}
+        }
+
+        try:
+            url = f"{self.base_url}/chat/completions"
+            if "chat/completions" not in url and not url.endswith("/"):
+                 url += "/chat/completions"
+
+            # One answer per segment takes longer than a single suggestion
+            data = self._post_completion(self.provider, self.model, url, payload, len(prompt), headers=headers, timeout=30 + 5 * len(script_texts))
+            content = data["choices"][0]["message"]["content"]
+            content = content.replace("```json", "").replace("```", "").strip()
+            
+            suggestions = {}
+            for shot in json.loads(content).get("shots", []):
+                index = shot.get("index") if isinstance(shot, dict) else None
+                if isinstance(index, int) and 0 <= index < len(script_texts):
+                    suggestions[index] = shot
+            return suggestions
+
+        except Exception as e:
+            print(f"Agent API Error (batch of {len(script_texts)}): {e}")
+            return None
+
     def render_nanobanana_prompt(self, input_data: Dict) -> str:
         """
         GPT-04 Prompt Renderer for NanoBananaPro.
@@ -176,10 +250,9 @@ Render final NanoBananaPro prompt:"""
             if "chat/completions" not in url and not url.endswith("/"):
                 url += "/chat/completions"
             
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._post_completion(
+                self.provider, self.model, url, payload, len(system_prompt) + len(user_prompt), headers=headers, timeout=30
+            )
             content = data["choices"][0]["message"]["content"]
             return content.strip()
         except Exception as e:
@@ -206,12 +279,27 @@ Render final NanoBananaPro prompt:"""
         }
         
         try:
-            response = requests.post(url, json=payload, timeout=60)
-            response.raise_for_status()
-            data = response.json()
+            data = self._post_completion("gemini", model, url, payload, len(full_text), timeout=60)
             # Extract text
             return data["candidates"][0]["content"]["parts"][0]["text"].strip()
         except Exception as e:
             print(f"Gemini Native Error: {e}")
             return f"{user_prompt} [GEMINI_ERROR]"
 
+    def _post_completion(self, provider: str, model: str, url: str, payload: Dict, prompt_chars: int, **kwargs) -> Dict:
+        """
+        POSTs a completion through the rate governor and returns the decoded body.
+        A 429 pauses every caller of the model for its Retry-After; the reported
+        usage corrects the token estimate.
+        """
+        lease = self.governor.acquire(provider, model, estimate_tokens(prompt_chars))
+        response = self.http.post(url, json=payload, **kwargs)
+        if response.status_code == 429:
+            self.governor.penalize(provider, model, parse_retry_after(response.headers))
+        response.raise_for_status()
+        
+        data = response.json()
+        usage = data.get("usage") or {}  # OpenAI-compatible
+        usage_metadata = data.get("usageMetadata") or {}  # Gemini native
+        lease.record(usage.get("total_tokens") or usage_metadata.get("totalTokenCount"))
+        return data
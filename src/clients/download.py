@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import hashlib
+import requests
+from dataclasses import dataclass
+from typing import Optional
+from .http import get_session
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+@dataclass(frozen=True)
+class DownloadResult:
+    path: str
+    sha256: str
+    size_bytes: int
+    resumed_from: int = 0
+
+def stream_download(url: str, dest_path: str, timeout: float = 60, max_attempts: int = 3,
+                    chunk_size: int = CHUNK_SIZE, session: Optional[requests.Session] = None) -> DownloadResult:
+    """
+    Streams `url` to `dest_path` without buffering the whole body in memory.
+    Data goes to `<dest_path>.part` next to the target (same filesystem) and is
+    renamed into place once complete, so readers never see a partial asset.
+    The SHA-256 is computed while streaming. A leftover .part file (previous
+    crash or a dropped connection) is resumed with an HTTP Range request, but
+    only if its sidecar (`<dest_path>.part.src`) says it came from the same URL;
+    the sidecar's ETag/Last-Modified is sent as If-Range so a changed resource
+    comes back whole. If the server ignores the range the download restarts
+    from zero.
+    `timeout` applies per socket read, not to the whole transfer.
+    """
+    part_path = dest_path + ".part"
+    http = session or get_session()
+    last_error = None
+
+    for attempt in range(1, max_attempts + 1):
+        source = _resumable_source(part_path, url)
+        offset = os.path.getsize(part_path) if source is not None else 0
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if source.get("validator"):
+                headers["If-Range"] = source["validator"]
+        try:
+            with http.get(url, headers=headers, stream=True, timeout=timeout) as r:
+                if r.status_code == 416:
+                    # Range not satisfiable: the .part is stale or already complete; start over
+                    _discard_part(part_path)
+                    continue
+                r.raise_for_status()
+
+                if offset and r.status_code != 206:
+                    print(f"Server ignored Range for {os.path.basename(dest_path)}; restarting download.")
+                    offset = 0
+                if not offset:
+                    _write_source(part_path, url, r.headers)
+
+                digest = hashlib.sha256()
+                if offset:
+                    # Re-hash what is already on disk so the digest covers the whole file
+                    with open(part_path, "rb") as f:
+                        for block in iter(lambda: f.read(chunk_size), b""):
+                            digest.update(block)
+                    print(f"Resuming {os.path.basename(dest_path)} from byte {offset}")
+
+                size = offset
+                with open(part_path, "ab" if offset else "wb") as f:
+                    for block in r.iter_content(chunk_size=chunk_size):
+                        if not block:
+                            continue
+                        f.write(block)
+                        digest.update(block)
+                        size += len(block)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                # Content-Length counts encoded bytes; only comparable for identity transfers
+                expected = r.headers.get("Content-Length")
+                if expected is not None and not r.headers.get("Content-Encoding") and size - offset != int(expected):
+                    raise IOError(f"Short read: got {size - offset} of {expected} bytes")
+
+            os.replace(part_path, dest_path)
+            _remove(part_path + ".src")
+            return DownloadResult(path=dest_path, sha256=digest.hexdigest(), size_bytes=size, resumed_from=offset)
+
+        except requests.exceptions.HTTPError:
+            raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError, IOError) as e:
+            last_error = e
+            print(f"Download interrupted ({os.path.basename(dest_path)}, attempt {attempt}/{max_attempts}): {e}")
+            time.sleep(min(2 ** attempt, 10))
+
+    raise RuntimeError(f"Download failed after {max_attempts} attempts: {url}") from last_error
+
+def _resumable_source(part_path: str, url: str) -> Optional[dict]:
+    """
+    Sidecar of a leftover .part if it was downloaded from `url`, else None.
+    A .part from another URL (reroll, regenerated asset) or of unknown origin
+    is deleted: appending to it would splice two different files.
+    """
+    if not os.path.exists(part_path):
+        return None
+    try:
+        with open(part_path + ".src") as f:
+            source = json.load(f)
+    except (OSError, ValueError):
+        source = None
+    if not source or source.get("url") != url:
+        print(f"Discarding partial download {os.path.basename(part_path)} (different or unknown source)")
+        _discard_part(part_path)
+        return None
+    return source
+
+def _write_source(part_path: str, url: str, headers) -> None:
+    # Weak ETags are not allowed in If-Range; fall back to Last-Modified
+    etag = headers.get("ETag")
+    validator = etag if etag and not etag.startswith("W/") else headers.get("Last-Modified")
+    with open(part_path + ".src", "w") as f:
+        json.dump({"url": url, "validator": validator}, f)
+
+def _discard_part(part_path: str) -> None:
+    _remove(part_path)
+    _remove(part_path + ".src")
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def write_atomic(dest_path: str, data: bytes) -> DownloadResult:
+    """Same contract as stream_download for bytes produced locally (mock mode)."""
+    part_path = dest_path + ".part"
+    with open(part_path, "wb") as f:
+        f.write(data)
+    os.replace(part_path, dest_path)
+    return DownloadResult(path=dest_path, sha256=hashlib.sha256(data).hexdigest(), size_bytes=len(data))
@@ -0,0 +1,57 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Optional
+from urllib3.util.retry import Retry
+
+# Transient statuses worth retrying (rate limit + gateway/backend hiccups)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def build_retry() -> Retry:
+    """
+    Shared retry/backoff policy.
+    Connection failures are retried for every method (the request never reached
+    the server). Read errors and retryable statuses only for idempotent methods,
+    so a POST that creates a paid job is never sent twice.
+    """
+    return Retry(
+        total=None,
+        connect=int(os.environ.get("HTTP_RETRY_CONNECT", "3")),
+        read=2,
+        status=3,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,  # excludes POST
+        backoff_factor=float(os.environ.get("HTTP_RETRY_BACKOFF", "0.5")),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the last response back to raise_for_status()
+    )
+
+def build_session(pool_maxsize: Optional[int] = None) -> requests.Session:
+    """A keep-alive session with a per-host connection pool of `pool_maxsize`."""
+    pool_maxsize = pool_maxsize or int(os.environ.get("HTTP_POOL_MAXSIZE", "16"))
+    adapter = HTTPAdapter(
+        pool_connections=8,  # distinct hosts kept warm (Kie.ai, tempfile CDN, OpenAI, ...)
+        pool_maxsize=pool_maxsize,
+        pool_block=False,
+        max_retries=build_retry(),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """
+    Process-wide pooled session shared by the provider clients.
+    Reusing it keeps TCP/TLS connections alive across polling checks,
+    downloads and LLM calls instead of handshaking on every request.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_session()
+        return _session
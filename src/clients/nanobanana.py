@@ -1,10 +1,12 @@
 import os
-import requests
-import time
 import json
 import base64
+from concurrent.futures import Future
 from typing import Optional, Tuple
 from ..models import NanobananaRequest
+from .poller import get_poller, IMAGE_POLL_POLICY
+from .download import DownloadResult, stream_download, write_atomic
+from .http import get_session
 
 class NanobananaClient:
     """
@@ -14,31 +16,32 @@ class NanobananaClient:
         # Prefer KIE_API_KEY, fallback to specific key
         self.api_key = api_key or os.environ.get("KIE_API_KEY") or os.environ.get("NANOBANANA_API_KEY")
         self.base_url = os.environ.get("KIE_API_BASE", "https://api.kie.ai")
+        self.http = get_session()
         self.model_id = os.environ.get("KIE_NANO_BANANA_MODEL", "nano-banana-pro")
         
         if not self.api_key:
             print("WARNING: KIE_API_KEY (or NANOBANANA_API_KEY) not set. Real generation will fail.")
 
 
-    def generate_image(self, request: NanobananaRequest) -> Tuple[bytes, str]:
+    def generate_image(self, request: NanobananaRequest, dest_path: str) -> Tuple[DownloadResult, str]:
         """
-        Generates a single image via Kie.ai async job.
-        Returns (image_bytes, remote_url).
+        Generates a single image via Kie.ai async job and streams it to dest_path.
+        Returns (DownloadResult, remote_url).
         """
         # [MOCK MODE] Cost-free validation
         if os.environ.get("KIE_MOCK_MODE") == "1" or os.environ.get("NANOBANANA_MOCK_MODE") == "1":
             print(f"NANOBANANA (MOCK): Generating dummy bytes for {request.shot_id}")
             # Return 1x1 transparent PNG bytes + dummy URL
             dummy_bytes = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82'
-            return (dummy_bytes, "https://mock.kie.ai/image.png")
+            return (write_atomic(dest_path, dummy_bytes), "https://mock.kie.ai/image.png")
 
         if not self.api_key:
             raise ValueError("Missing KIE_API_KEY")
 
         task_id = self._create_task(request)
         image_url = self._poll_result(task_id)
-        img_bytes = self._download_image(image_url)
-        return (img_bytes, image_url)
+        result = self._download_image(image_url, dest_path)
+        return (result, image_url)
 
     def _create_task(self, req: NanobananaRequest) -> str:
         url = f"{self.base_url}/api/v1/jobs/createTask"
@@ -84,7 +87,7 @@ class NanobananaClient:
         # If we had image input support in our Request model, we would add it here
         
         print(f"NANOBANANA CREATE: {req.shot_id} -> {url}")
-        resp = requests.post(url, json=payload, headers=headers, timeout=20)
+        resp = self.http.post(url, json=payload, headers=headers, timeout=20)
         resp.raise_for_status()
         data = resp.json()
         
@@ -97,55 +100,53 @@ class NanobananaClient:
         return task_id
 
     def _poll_result(self, task_id: str) -> str:
+        return self.poll_async(task_id).result()
+
+    def poll_async(self, task_id: str) -> Future:
+        """Tracks the task on the shared poller. Future resolves to the image URL."""
+        print(f"NANOBANANA POLLING: {task_id}...")
+        return get_poller().track(task_id, self._check_task, IMAGE_POLL_POLICY)
+
+    def _check_task(self, task_id: str, attempt: int, elapsed_s: float) -> Optional[str]:
+        """Single status check. Returns the image URL when done, None while pending."""
         url = f"{self.base_url}/api/v1/jobs/recordInfo"
         headers = {"Authorization": f"Bearer {self.api_key}"}
         
-        max_retries = 90 # 90 * 2s = 180s (3 min) max wait
+        try:
+            resp = self.http.get(url, params={"taskId": task_id}, headers=headers, timeout=10)
+            resp.raise_for_status()
+            res_data = resp.json()
+        except Exception as e:
+            print(f"Polling warning ({task_id}, attempt {attempt}): {e}")
+            return None
         
-        print(f"NANOBANANA POLLING: {task_id}...")
+        # According to docs: data.state
+        inner_data = res_data.get("data", {})
+        state = inner_data.get("state")
         
-        for attempt in range(max_retries):
+        if attempt % 10 == 1:  # Log every 10th check
+            print(f"  Polling status ({task_id}, attempt {attempt}, {int(elapsed_s)}s): state={state}")
+        
+        if state == "success":
+            result_str = inner_data.get("resultJson", "{}")
             try:
-                resp = requests.get(url, params={"taskId": task_id}, headers=headers, timeout=10)
-                resp.raise_for_status()
-                res_data = resp.json()
-            except Exception as e:
-                print(f"Polling warning (attempt {attempt}): {e}")
-                time.sleep(2)
-                continue
-            
-            # According to docs: data.state
-            inner_data = res_data.get("data", {})
-            state = inner_data.get("state")
-            
-            if attempt % 10 == 0:  # Log every 20 seconds
-                print(f"  Polling status (attempt {attempt}/90): state={state}")
-            
-            if state == "success":
-                result_str = inner_data.get("resultJson", "{}")
-                try:
-                    result_json = json.loads(result_str)
-                    urls = result_json.get("resultUrls", [])
-                    if urls:
-                        print(f"✓ Generation complete: {urls[0]}")
-                        return urls[0] # Return first image
-                except:
-                    print(f"Error parsing resultJson: {result_str}")
-                    pass
-                raise ValueError("Job succeeded but found no image URL")
-            
-            elif state == "fail":
-                fail_msg = inner_data.get("failMsg", "Unknown error")
-                raise RuntimeError(f"Nanobanana Generation Failed: {fail_msg}")
-            
-            else:
-                # waiting, queuing, generating
-                time.sleep(2)
+                result_json = json.loads(result_str)
+                urls = result_json.get("resultUrls", [])
+                if urls:
+                    print(f"✓ Generation complete: {urls[0]}")
+                    return urls[0] # Return first image
+            except:
+                print(f"Error parsing resultJson: {result_str}")
+                pass
+            raise ValueError("Job succeeded but found no image URL")
+        
+        elif state == "fail":
+            fail_msg = inner_data.get("failMsg", "Unknown error")
+            raise RuntimeError(f"Nanobanana Generation Failed: {fail_msg}")
         
-        raise TimeoutError(f"Nanobanana task {task_id} timed out after {max_retries * 2}s. Last state: {state if 'state' in locals() else 'unknown'}")
+        # waiting, queuing, generating
+        return None
 
-    def _download_image(self, url: str) -> bytes:
+    def _download_image(self, url: str, dest_path: str) -> DownloadResult:
         print(f"Downloading Asset: {url}")
-        r = requests.get(url, timeout=30)
-        r.raise_for_status()
-        return r.content
+        return stream_download(url, dest_path, timeout=30, session=self.http)
@@ -0,0 +1,199 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+# check(task_id, attempt, elapsed_s) -> result when done, None while pending.
+# Raising marks the task as failed (terminal). Transient network errors should
+# be handled inside check (log + return None) so the task is polled again.
+CheckFn = Callable[[str, int, float], Optional[Any]]
+
+@dataclass(frozen=True)
+class PollPolicy:
+    """
+    Adaptive polling schedule for one kind of job.
+    Young jobs are polled every `interval_s`; past `backoff_after_s` the interval
+    grows by `backoff_factor` up to `max_interval_s`.
+    """
+    name: str
+    initial_delay_s: float
+    interval_s: float
+    max_interval_s: float
+    backoff_after_s: float
+    timeout_s: float
+    backoff_factor: float = 1.5
+
+    def next_interval(self, elapsed_s: float, current_s: float) -> float:
+        if elapsed_s < self.backoff_after_s:
+            return self.interval_s
+        return min(self.max_interval_s, current_s * self.backoff_factor)
+
+# Stills usually land in 10-40s; Veo clips take minutes, so the first check waits
+IMAGE_POLL_POLICY = PollPolicy(
+    name="Nanobanana", initial_delay_s=2.0, interval_s=2.0,
+    max_interval_s=8.0, backoff_after_s=30.0, timeout_s=180.0
+)
+VIDEO_POLL_POLICY = PollPolicy(
+    name="Veo", initial_delay_s=20.0, interval_s=10.0,
+    max_interval_s=30.0, backoff_after_s=120.0, timeout_s=20 * 60
+)
+
+@dataclass
+class _TrackedTask:
+    task_id: str
+    check: CheckFn
+    policy: PollPolicy
+    future: Future
+    started_at: float
+    interval_s: float
+    attempt: int = 0
+
+@dataclass(order=True)
+class _Scheduled:
+    due_at: float
+    seq: int
+    task: _TrackedTask = field(compare=False)
+
+class TaskPoller:
+    """
+    Single multiplexed poller for async provider jobs.
+    One scheduler thread keeps every outstanding task in a due-time heap and
+    hands due checks to a small worker pool, so hundreds of jobs cost a handful
+    of threads instead of one sleeping thread per job.
+    Each tracked task resolves a Future (result or exception).
+    """
+    def __init__(self, workers: int = 4):
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._in_check = 0
+        self._workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kie-poll")
+        self._thread = None
+
+    def track(self, task_id: str, check: CheckFn, policy: PollPolicy) -> Future:
+        """Starts tracking a task. Returns a Future resolved with check()'s result."""
+        now = time.monotonic()
+        task = _TrackedTask(
+            task_id=task_id, check=check, policy=policy, future=Future(),
+            started_at=now, interval_s=policy.interval_s
+        )
+        with self._cond:
+            self._schedule(task, now + policy.initial_delay_s)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="kie-poller", daemon=True)
+                self._thread.start()
+        return task.future
+
+    def pending(self) -> int:
+        """Number of tasks still being tracked."""
+        with self._cond:
+            return len(self._heap) + self._in_check
+
+    def _schedule(self, task: _TrackedTask, due_at: float):
+        # Caller holds self._cond
+        heapq.heappush(self._heap, _Scheduled(due_at, next(self._seq), task))
+        self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                delay = self._heap[0].due_at - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(timeout=delay)
+                    continue
+                task = heapq.heappop(self._heap).task
+                self._in_check += 1
+            self._workers.submit(self._check, task)
+
+    def _check(self, task: _TrackedTask):
+        try:
+            if task.future.cancelled():
+                return
+            task.attempt += 1
+            elapsed = time.monotonic() - task.started_at
+            try:
+                result = task.check(task.task_id, task.attempt, elapsed)
+            except Exception as e:
+                task.future.set_exception(e)
+                return
+
+            if result is not None:
+                task.future.set_result(result)
+                return
+
+            if elapsed > task.policy.timeout_s:
+                task.future.set_exception(TimeoutError(
+                    f"{task.policy.name} task {task.task_id} timed out after {int(elapsed)}s."
+                ))
+                return
+
+            task.interval_s = task.policy.next_interval(elapsed, task.interval_s)
+            with self._cond:
+                self._schedule(task, time.monotonic() + task.interval_s)
+        finally:
+            with self._cond:
+                self._in_check -= 1
+
+_poller: Optional[TaskPoller] = None
+_poller_lock = threading.Lock()
+
+def get_poller() -> TaskPoller:
+    """Process-wide poller shared by the Kie.ai clients."""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = TaskPoller(workers=int(os.environ.get("KIE_POLL_WORKERS", "4")))
+        return _poller
+
+_downloads: Optional[ThreadPoolExecutor] = None
+_downloads_lock = threading.Lock()
+
+def get_download_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide pool for downloading finished results, next to the shared
+    poller. Clients hand downloads here instead of owning a pool each, so
+    creating clients never leaks threads.
+    """
+    global _downloads
+    with _downloads_lock:
+        if _downloads is None:
+            _downloads = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("KIE_DOWNLOAD_WORKERS", "4")),
+                thread_name_prefix="kie-dl"
+            )
+        return _downloads
+
+def chain(future: Future, fn: Callable[[Any], Any], executor: Optional[ThreadPoolExecutor] = None) -> Future:
+    """
+    Returns a Future for fn(future.result()).
+    fn runs on `executor` if given, otherwise on the thread that resolved `future`.
+    Exceptions from either step propagate to the returned Future.
+    """
+    out = Future()
+
+    def run(result):
+        try:
+            out.set_result(fn(result))
+        except Exception as e:
+            out.set_exception(e)
+
+    def relay(done: Future):
+        if done.cancelled():
+            out.cancel()
+            return
+        error = done.exception()
+        if error is not None:
+            out.set_exception(error)
+        elif executor is not None:
+            executor.submit(run, done.result())
+        else:
+            run(done.result())
+
+    future.add_done_callback(relay)
+    return out
@@ -1,12 +1,17 @@
 import os
 import requests
-import time
 import json
 import base64
 import subprocess
 import tempfile
+from concurrent.futures import Future
 from typing import Dict, Optional, Union
 from ..models import VeoRequest
+from .poller import get_poller, get_download_executor, chain, VIDEO_POLL_POLICY
+from .download import DownloadResult, stream_download, write_atomic
+from .http import get_session
+
+MOCK_TASK_PREFIX = "mock_"
 
 class VeoClient:
     """
@@ -16,6 +21,7 @@ class VeoClient:
         # Prefer KIE_API_KEY
         self.api_key = api_key or os.environ.get("KIE_API_KEY") or os.environ.get("VEO_API_KEY")
         self.base_url = os.environ.get("KIE_API_BASE", "https://api.kie.ai")
+        self.http = get_session()
         self.model_id = os.environ.get("KIE_VEO_MODEL", "veo3_fast")
         
         # Mock mode environment check
@@ -24,22 +30,51 @@ class VeoClient:
         if not self.api_key and not self.mock_mode:
              print("WARNING: KIE_API_KEY not set. Real generation will fail.")
 
-    def generate_clip(self, req: VeoRequest) -> tuple[bytes, str]:
+    def generate_clip(self, req: VeoRequest, dest_path: str) -> tuple[DownloadResult, str]:
+        """
+        Generates a video clip via Kie.ai async job and streams it to dest_path.
+        Returns: (DownloadResult, public_url)
+        """
+        task_id = self.submit_clip(req)
+        return self.collect_clip(task_id, dest_path)
+
+    def submit_clip(self, req: VeoRequest) -> str:
         """
-        Generates a video clip via Kie.ai async job.
-        Returns: (bytes, public_url)
+        Creates the Veo task and returns its task_id without waiting.
+        Use collect_clip(task_id, dest_path) to wait for and download the result.
         """
         if self.mock_mode:
             print(f"VEO (MOCK): Generating dummy clip for {req.shot_id} (Duration: {req.duration_s}s)")
-            return self._generate_mock_mp4(), "http://mock.url/dummy.mp4"
+            return f"{MOCK_TASK_PREFIX}{req.shot_id}"
 
         if not self.api_key:
             raise ValueError("VEO_API_KEY or KIE_API_KEY is not set.")
 
-        task_id = self._create_task(req)
-        video_url = self._poll_result(task_id)
-        video_bytes = self._download_video(video_url)
-        return video_bytes, video_url
+        return self._create_task(req)
+
+    def collect_clip(self, task_id: str, dest_path: str) -> tuple[DownloadResult, str]:
+        """
+        Waits for a submitted task to finish and downloads the clip to dest_path.
+        Returns: (DownloadResult, public_url)
+        """
+        return self.collect_clip_async(task_id, dest_path).result()
+
+    def collect_clip_async(self, task_id: str, dest_path: str) -> Future:
+        """
+        Non-blocking collect: the shared poller waits for the task and the
+        download runs on the shared download pool.
+        Future resolves to (DownloadResult, public_url).
+        """
+        if task_id.startswith(MOCK_TASK_PREFIX):
+            done = Future()
+            done.set_result((write_atomic(dest_path, self._generate_mock_mp4()), "http://mock.url/dummy.mp4"))
+            return done
+
+        return chain(
+            self.poll_async(task_id),
+            lambda video_url: (self._download_video(video_url, dest_path), video_url),
+            executor=get_download_executor()
+        )
 
     def _create_task(self, req: VeoRequest) -> str:
         url = f"{self.base_url}/api/v1/veo/generate"
@@ -91,7 +126,7 @@ class VeoClient:
         
         print(f"VEO CREATE: {req.shot_id} -> {url}")
         # UPDATE: Increase timeout to 120s to avoid creation failures
-        resp = requests.post(url, json=payload, headers=headers, timeout=120)
+        resp = self.http.post(url, json=payload, headers=headers, timeout=120)
         resp.raise_for_status()
         data = resp.json()
         
@@ -104,85 +139,80 @@ class VeoClient:
         return task_id
 
     def _poll_result(self, task_id: str) -> str:
+        return self.poll_async(task_id).result()
+
+    def poll_async(self, task_id: str) -> Future:
+        """Tracks the task on the shared poller. Future resolves to the video URL."""
+        print(f"VEO POLLING: {task_id}...")
+        return get_poller().track(task_id, self._check_task, VIDEO_POLL_POLICY)
+
+    def _check_task(self, task_id: str, attempt: int, elapsed_s: float) -> Optional[str]:
+        """Single status check. Returns the video URL when done, None while pending."""
         url = f"{self.base_url}/api/v1/veo/record-info"
         headers = {"Authorization": f"Bearer {self.api_key}"}
+        elapsed = int(elapsed_s)
 
-        max_total_seconds = 20 * 60  # 20 min real (wall clock)
-        poll_interval = 10
-        start = time.time()
+        try:
+            # UPDATE: Increase timeout to 60s; transient failures are retried on the next check
+            resp = self.http.get(url, params={"taskId": task_id}, headers=headers, timeout=60)
+            resp.raise_for_status()
+            res_data = resp.json()
+        except requests.exceptions.ReadTimeout:
+            print(f"VEO POLL TIMEOUT ({task_id}, attempt {attempt}): Request timed out. Retrying...")
+            return None
+        except requests.exceptions.RequestException as e:
+            print(f"VEO POLL NETWORK ERROR ({task_id}, attempt {attempt}): {e}. Retrying...")
+            return None
+
+        # Validate code/msg
+        if res_data.get("code") != 200:
+            print(f"VEO POLL non-200 code payload: {res_data}")
+            return None
+
+        data = res_data.get("data") or {}
+        if attempt == 1:
+            print(f"VEO RESPONSE STRUCTURE (first poll): {json.dumps(res_data, indent=2)[:800]}")
+
+        # Official fields: data.successFlag, data.response.resultUrls
+        success_flag = data.get("successFlag")
+        error_code = data.get("errorCode")
+        error_msg = data.get("errorMessage", "")
+
+        # Normalize flag (handle "1" vs 1)
+        try:
+            success_flag_norm = int(success_flag) if success_flag is not None else None
+        except (ValueError, TypeError):
+            success_flag_norm = None
 
-        print(f"VEO POLLING: {task_id}...")
+        response_obj = data.get("response") or {}
+        result_urls = response_obj.get("resultUrls") or []
 
-        attempt = 0
-        while True:
-            attempt += 1
-            elapsed = int(time.time() - start)
-            if elapsed > max_total_seconds:
-                raise TimeoutError(f"Veo task {task_id} timed out after {elapsed}s.")
-            
-            try:
-                # UPDATE: Increase timeout to 60s and add retry logic
-                resp = requests.get(url, params={"taskId": task_id}, headers=headers, timeout=60)
-                resp.raise_for_status()
-                res_data = resp.json()
-            except requests.exceptions.ReadTimeout:
-                print(f"VEO POLL TIMEOUT (Attempt {attempt}): Request timed out. Retrying...")
-                time.sleep(poll_interval)
-                continue
-            except requests.exceptions.RequestException as e:
-                print(f"VEO POLL NETWORK ERROR (Attempt {attempt}): {e}. Retrying...")
-                time.sleep(poll_interval)
-                continue
-
-            # Validate code/msg
-            if res_data.get("code") != 200:
-                print(f"VEO POLL non-200 code payload: {res_data}")
-                time.sleep(poll_interval)
-                continue
-
-            data = res_data.get("data") or {}
-            if attempt == 1:
-                print(f"VEO RESPONSE STRUCTURE (first poll): {json.dumps(res_data, indent=2)[:800]}")
-
-            # Official fields: data.successFlag, data.response.resultUrls
-            success_flag = data.get("successFlag")
-            error_code = data.get("errorCode")
-            error_msg = data.get("errorMessage", "")
-
-            # Normalize flag (handle "1" vs 1)
-            try:
-                success_flag_norm = int(success_flag) if success_flag is not None else None
-            except (ValueError, TypeError):
-                success_flag_norm = None
-
-            response_obj = data.get("response") or {}
-            result_urls = response_obj.get("resultUrls") or []
-
-            print(
-                f"Poll {attempt}: elapsed={elapsed}s successFlag={success_flag} "
-                f"errorCode={error_code} errorMessage={str(error_msg)[:120]} "
-                f"resultUrls={len(result_urls)}"
-            )
-
-            # Success conditions
-            if result_urls:
-                return result_urls[0]
-
-            if success_flag_norm == 1:
-                raise ValueError("Veo job successFlag=1 but found no resultUrls in data.response.resultUrls")
-
-            # Fail conditions
-            if success_flag_norm in (2, 3):
-                raise RuntimeError(f"Veo Generation Failed (Flag {success_flag_norm}) - {error_code}: {error_msg}")
-
-            # Still running/queued
-            time.sleep(poll_interval)
-
-    def _download_video(self, url: str) -> bytes:
+        print(
+            f"Poll {attempt} [{task_id}]: elapsed={elapsed}s successFlag={success_flag} "
+            f"errorCode={error_code} errorMessage={str(error_msg)[:120]} "
+            f"resultUrls={len(result_urls)}"
+        )
+
+        # Success conditions
+        if result_urls:
+            return result_urls[0]
+
+        if success_flag_norm == 1:
+            raise ValueError("Veo job successFlag=1 but found no resultUrls in data.response.resultUrls")
+
+        # Fail conditions
+        if success_flag_norm in (2, 3):
+            raise RuntimeError(f"Veo Generation Failed (Flag {success_flag_norm}) - {error_code}: {error_msg}")
+
+        # Still running/queued
+        return None
+
+    def _download_video(self, url: str, dest_path: str) -> DownloadResult:
         print(f"Downloading Video Asset: {url}")
-        r = requests.get(url, timeout=600) # Videos can be large
-        r.raise_for_status()
-        return r.content
+        # Streamed to disk in chunks; videos can be large
+        result = stream_download(url, dest_path, timeout=120, session=self.http)
+        print(f"Saved {os.path.basename(dest_path)} ({result.size_bytes} bytes, sha256={result.sha256[:12]})")
+        return result
 
     def _generate_mock_mp4(self) -> bytes:
         # Generate valid MP4 using ffmpeg locally
@@ -3,8 +3,11 @@ import sqlite3
 import json
 import os
 import uuid
-from typing import Dict, List, Optional, Any
+import base64
+import threading
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+from .foundation.event_bus import EventBus, get_event_bus
 
 class DatabaseManager:
     """
@@ -12,12 +15,68 @@ class DatabaseManager:
     Stores 'Cold Data' (Artifacts) and 'Hot Data' (Decisions).
     """
     
-    def __init__(self, db_path: str = "pipeline.db"):
+    # sqlite3 keeps compiled statements per connection; long-lived connections reuse them
+    STATEMENT_CACHE_SIZE = 256
+    BUSY_TIMEOUT_MS = 10000
+
+    def __init__(self, db_path: str = "pipeline.db", events: Optional[EventBus] = None):
         self.db_path = db_path
+        # Committed status/progress/asset writes are published here (SSE stream)
+        self.events = events or get_event_bus()
+        # One long-lived connection per thread (API worker threads, stage threads)
+        self._local = threading.local()
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
         self._init_db()
 
-    def _get_connection(self):
-        return sqlite3.connect(self.db_path)
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Returns this thread's connection, opening it on first use.
+        Connections are not closed per call; use `with conn:` for a transaction
+        (commit on success, rollback on error).
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            ident = threading.get_ident()
+            with self._connections_lock:
+                self._prune_dead_connections()
+                stale = self._connections.pop(ident, None)
+                if stale is not None:
+                    stale.close()
+                self._connections[ident] = conn
+        return conn
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.BUSY_TIMEOUT_MS / 1000,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+            check_same_thread=False,  # only close() touches another thread's connection
+        )
+        conn.row_factory = sqlite3.Row
+        # WAL: readers (API) no longer block the writer (stages) and vice versa.
+        # synchronous=NORMAL is durable across app crashes in WAL mode and skips
+        # the per-commit fsync of the main database file.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+        return conn
+
+    def _prune_dead_connections(self):
+        # Caller holds self._connections_lock
+        alive = {t.ident for t in threading.enumerate()}
+        for ident in [i for i in self._connections if i not in alive]:
+            self._connections.pop(ident).close()
+
+    def close(self):
+        """Closes every connection opened by this manager (all threads)."""
+        with self._connections_lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
 
     def _init_db(self):
         """Initializes the database schema if not exists."""
@@ -100,27 +159,21 @@ class DatabaseManager:
             )
         ''')
 
-        # Migrations for run_status
+        # Migrations for assets
         try:
             cursor.execute("ALTER TABLE assets ADD COLUMN cache_key TEXT")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_assets_cache_key ON assets(cache_key)")
         except sqlite3.OperationalError:
             pass # Already exists
 
-        conn.commit()
-        cursor.close()
+        # Indexes for the UI read paths (shot tree, runs list, sibling deselect, cache lookups)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_assets_shot_id ON assets(shot_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_assets_shot_type_role ON assets(shot_id, type, role)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_assets_cache_key ON assets(cache_key)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_shots_run_version ON shots(run_id, version)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at DESC, run_id DESC, version DESC)")
 
-    def find_asset_by_cache_key(self, cache_key: str):
-        """Returns the first asset matching the cache key."""
-        conn = self._get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM assets WHERE cache_key = ? LIMIT 1", (cache_key,))
-        row = cursor.fetchone()
-        
-        conn.close()
-        return dict(row) if row else None
+        # Migrations for run_status
         try:
             cursor.execute("ALTER TABLE run_status ADD COLUMN progress_current INTEGER DEFAULT 0")
         except sqlite3.OperationalError: pass
@@ -132,177 +185,273 @@ class DatabaseManager:
         try:
             cursor.execute("ALTER TABLE run_status ADD COLUMN progress_message TEXT")
         except sqlite3.OperationalError: pass
-        
+
         conn.commit()
-        conn.close()
+        cursor.close()
+
+    def find_asset_by_cache_key(self, cache_key: str):
+        """Returns the first asset matching the cache key."""
+        conn = self._get_connection()
+        row = conn.execute("SELECT * FROM assets WHERE cache_key = ? LIMIT 1", (cache_key,)).fetchone()
+        return dict(row) if row else None
+
+    def find_assets_by_cache_key(self, cache_key: str) -> List[Dict]:
+        """All assets generated from the same inputs, newest first."""
+        conn = self._get_connection()
+        rows = conn.execute(
+            "SELECT * FROM assets WHERE cache_key = ? ORDER BY created_at DESC, rowid DESC", (cache_key,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def find_latest_asset_by_path(self, path: str) -> Optional[Dict]:
+        """The most recently registered asset stored at `path`."""
+        conn = self._get_connection()
+        row = conn.execute(
+            "SELECT * FROM assets WHERE path = ? ORDER BY created_at DESC, rowid DESC LIMIT 1", (path,)
+        ).fetchone()
+        return dict(row) if row else None
 
     def register_run(self, run_id: str, version: int, video_id: str):
         """Registers a new pipeline run."""
         conn = self._get_connection()
-        try:
+        with conn:
             conn.execute(
                 "INSERT OR IGNORE INTO runs (run_id, version, video_id) VALUES (?, ?, ?)",
                 (run_id, version, video_id)
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def register_shot(self, shot_spec: Dict):
         """Registers or updates a Shot plan."""
+        self.register_shots_bulk([shot_spec])
+
+    def register_shots_bulk(self, shot_specs: List[Dict]):
+        """Registers or updates many Shot plans in a single transaction."""
+        rows = [self._shot_row(spec) for spec in shot_specs]
+        if not rows:
+            return
         conn = self._get_connection()
-        try:
-            # Serialize camera config if present
-            camera_config = None
-            if 'camera' in shot_spec:
-                 camera_config = json.dumps(shot_spec['camera']) if isinstance(shot_spec['camera'], dict) else str(shot_spec['camera'])
-            
-            conn.execute('''
+        with conn:
+            conn.executemany('''
                 INSERT OR REPLACE INTO shots 
                 (shot_id, run_id, version, script_text, intent, metaphor, camera_config, duration_s, beat_start_s, beat_end_s, alignment_source, alignment_confidence, status)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                shot_spec.get('id'),
-                shot_spec.get('run_id'),
-                shot_spec.get('version', 1), # Default if missing
-                shot_spec.get('script_text'),
-                shot_spec.get('intent'),
-                shot_spec.get('metaphor'),
-                camera_config,
-                shot_spec.get('duration_s'),
-                shot_spec.get('beat_start_s'),
-                shot_spec.get('beat_end_s'),
-                shot_spec.get('alignment_source'),
-                shot_spec.get('alignment_confidence'),
-                'PLANNED'
-            ))
-            conn.commit()
-        finally:
-            conn.close()
-
-    def register_asset(self, shot_id: str, asset_type: str, path: str, role: str = None, url: str = None, meta: Dict = None):
+            ''', rows)
+
+    @staticmethod
+    def _shot_row(shot_spec: Dict) -> tuple:
+        # Serialize camera config if present
+        camera_config = None
+        if 'camera' in shot_spec:
+             camera_config = json.dumps(shot_spec['camera']) if isinstance(shot_spec['camera'], dict) else str(shot_spec['camera'])
+        
+        return (
+            shot_spec.get('id'),
+            shot_spec.get('run_id'),
+            shot_spec.get('version', 1), # Default if missing
+            shot_spec.get('script_text'),
+            shot_spec.get('intent'),
+            shot_spec.get('metaphor'),
+            camera_config,
+            shot_spec.get('duration_s'),
+            shot_spec.get('beat_start_s'),
+            shot_spec.get('beat_end_s'),
+            shot_spec.get('alignment_source'),
+            shot_spec.get('alignment_confidence'),
+            'PLANNED'
+        )
+
+    def register_asset(self, shot_id: str, asset_type: str, path: str, role: str = None, url: str = None, meta: Dict = None,
+                       cache_key: str = None):
         """
         Registers a generated asset.
         Auto-selects the new asset as the active one for this type/shot.
         """
+        return self.register_assets_bulk([{
+            "shot_id": shot_id, "asset_type": asset_type, "path": path,
+            "role": role, "url": url, "meta": meta, "cache_key": cache_key
+        }])[0]
+
+    def register_assets_bulk(self, assets: List[Dict]) -> List[str]:
+        """
+        Registers many assets in a single transaction.
+        Each item takes the register_asset arguments as keys
+        (shot_id, asset_type, path, role, url, meta, cache_key).
+        The new assets become the selected ones for their shot/type/role; if the
+        batch holds several for the same slot, the last one wins.
+        Returns the new asset_ids in input order.
+        """
+        if not assets:
+            return []
+
+        rows = []
+        last_in_slot = {}
+        for index, asset in enumerate(assets):
+            role = asset.get("role")
+            meta = asset.get("meta")
+            rows.append([
+                str(uuid.uuid4()), asset["shot_id"], asset["asset_type"], role,
+                asset["path"], asset.get("url"), json.dumps(meta) if meta else "{}", 1,
+                asset.get("cache_key")
+            ])
+            last_in_slot[(asset["shot_id"], asset["asset_type"], role)] = index
+        winners = set(last_in_slot.values())
+        for index, row in enumerate(rows):
+            if index not in winners:
+                row[7] = 0
+
         conn = self._get_connection()
-        asset_id = str(uuid.uuid4())
-        meta_json = json.dumps(meta) if meta else "{}"
-        
-        try:
-            # 1. Insert new asset
-            conn.execute('''
-                INSERT INTO assets (asset_id, shot_id, type, role, path, url, metadata, is_selected)
-                VALUES (?, ?, ?, ?, ?, ?, ?, 1)
-            ''', (asset_id, shot_id, asset_type, role, path, url, meta_json))
-            
+        with conn:
+            # 1. Insert new assets
+            conn.executemany('''
+                INSERT INTO assets (asset_id, shot_id, type, role, path, url, metadata, is_selected, cache_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+
             # 2. Deselect siblings (Previous versions of same type/role for this shot)
             # Logic: If I insert a new CLIP, I want it selected. Old clips become unselected.
-            if role:
-                conn.execute('''
-                    UPDATE assets SET is_selected = 0 
-                    WHERE shot_id = ? AND type = ? AND role = ? AND asset_id != ?
-                ''', (shot_id, asset_type, role, asset_id))
-            else:
-                conn.execute('''
-                    UPDATE assets SET is_selected = 0 
-                    WHERE shot_id = ? AND type = ? AND role IS NULL AND asset_id != ?
-                ''', (shot_id, asset_type, asset_id))
-
-            conn.commit()
-            return asset_id
-        finally:
-            conn.close()
+            # One UPDATE per slot (shot_id/type/role) keeps each on idx_assets_shot_type_role;
+            # `role IS ?` matches NULL roles too. Batch losers were inserted unselected.
+            conn.executemany('''
+                UPDATE assets SET is_selected = 0
+                WHERE shot_id = ? AND type = ? AND role IS ? AND is_selected = 1 AND asset_id != ?
+            ''', [(*slot, rows[index][0]) for slot, index in last_in_slot.items()])
+
+        self._publish_assets(rows)
+        return [row[0] for row in rows]
+
+    def set_asset_selected(self, asset_id: str, selected: bool) -> bool:
+        """
+        Selects (deselecting its shot/type/role siblings) or deselects an asset,
+        in one transaction, and publishes the changed assets.
+        Returns False if the asset doesn't exist.
+        """
+        conn = self._get_connection()
+        with conn:
+            row = conn.execute("SELECT shot_id, type, role FROM assets WHERE asset_id = ?", (asset_id,)).fetchone()
+            if not row:
+                return False
+            shot_id, asset_type, role = row
+            changed = [asset_id]
+            if selected:
+                changed += [r[0] for r in conn.execute(
+                    "SELECT asset_id FROM assets WHERE shot_id = ? AND type = ? AND role IS ? AND is_selected = 1 AND asset_id != ?",
+                    (shot_id, asset_type, role, asset_id)
+                )]
+                conn.execute(
+                    "UPDATE assets SET is_selected = 0 WHERE shot_id = ? AND type = ? AND role IS ? AND asset_id != ?",
+                    (shot_id, asset_type, role, asset_id)
+                )
+            conn.execute("UPDATE assets SET is_selected = ? WHERE asset_id = ?", (int(selected), asset_id))
+
+        if self.events.has_subscribers():
+            rows = conn.execute(
+                f"SELECT asset_id, shot_id, type, role, path, url, metadata, is_selected, cache_key FROM assets "
+                f"WHERE asset_id IN ({','.join('?' * len(changed))})", changed
+            ).fetchall()
+            self._publish_assets([list(r) for r in rows])
+        return True
+
+    def _publish_assets(self, rows: List[list]):
+        if not self.events.has_subscribers():
+            return
+        # Assets only carry shot_id; resolve their runs in one query
+        shot_ids = list({row[1] for row in rows})
+        conn = self._get_connection()
+        runs = {
+            shot_id: (run_id, version)
+            for shot_id, run_id, version in conn.execute(
+                f"SELECT shot_id, run_id, version FROM shots WHERE shot_id IN ({','.join('?' * len(shot_ids))})", shot_ids
+            )
+        }
+        for asset_id, shot_id, asset_type, role, path, url, _meta, is_selected, _cache_key in rows:
+            if shot_id not in runs:
+                continue
+            run_id, version = runs[shot_id]
+            self.events.publish("asset", run_id, version, {
+                "asset_id": asset_id, "shot_id": shot_id, "type": asset_type, "role": role,
+                "path": path, "url": url, "is_selected": bool(is_selected)
+            })
+
+    # Prompt text is pulled out of the metadata JSON by SQLite, so the API
+    # never json-decodes asset metadata in Python just to build `prompts`.
+    _ASSET_COLUMNS = '''
+        a.*,
+        CASE WHEN a.type = 'PROMPT' AND json_valid(a.metadata)
+             THEN COALESCE(json_extract(a.metadata, '$.text'), '') END AS _prompt_text
+    '''
 
     def get_shot_tree(self, run_id: str, version: int):
         """Retrieves full tree for UI."""
         conn = self._get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
         
-        # Get Shots
         # Get Shots with video_id
-        cursor.execute('''
+        shots = [dict(row) for row in conn.execute('''
             SELECT s.*, r.video_id 
             FROM shots s
             JOIN runs r ON s.run_id = r.run_id AND s.version = r.version
             WHERE s.run_id = ? AND s.version = ?
-        ''', (run_id, version))
-        shots = [dict(row) for row in cursor.fetchall()]
+        ''', (run_id, version))]
         
-        for shot in shots:
-            cursor.execute("SELECT * FROM assets WHERE shot_id = ?", (shot['shot_id'],))
-            assets = [dict(row) for row in cursor.fetchall()]
-            shot['assets'] = assets
-            
-            # Populate 'prompts' field for GUI
-            prompts = {}
-            for asset in assets:
-                if asset['type'] == 'PROMPT':
-                    try:
-                        meta = json.loads(asset['metadata'])
-                        text = meta.get('text', '')
-                        
-                        if asset['role'] == 'image_prompt':
-                            prompts['image_a'] = text
-                        elif asset['role'] == 'video_prompt':
-                            prompts['video'] = text
-                    except:
-                        pass
-            shot['prompts'] = prompts
-            
-        conn.close()
+        # All assets of the run in one query, grouped in memory
+        asset_rows = conn.execute(f'''
+            SELECT {self._ASSET_COLUMNS}
+            FROM assets a
+            JOIN shots s ON s.shot_id = a.shot_id
+            WHERE s.run_id = ? AND s.version = ?
+            ORDER BY a.rowid
+        ''', (run_id, version))
+        self._attach_assets(shots, asset_rows)
         return shots
     
     def get_single_shot(self, run_id: str, shot_id: str, version: int):
         """Retrieves a single shot with its assets."""
         conn = self._get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
         
         # Get the shot with video_id
-        cursor.execute('''
+        shot_row = conn.execute('''
             SELECT s.*, r.video_id 
             FROM shots s
             JOIN runs r ON s.run_id = r.run_id AND s.version = r.version
             WHERE s.shot_id = ? AND s.run_id = ? AND s.version = ?
-        ''', (shot_id, run_id, version))
-        
-        shot_row = cursor.fetchone()
+        ''', (shot_id, run_id, version)).fetchone()
         if not shot_row:
-            conn.close()
             return None
         
         shot = dict(shot_row)
         
         # Get assets for this shot
-        cursor.execute("SELECT * FROM assets WHERE shot_id = ?", (shot_id,))
-        assets = [dict(row) for row in cursor.fetchall()]
-        shot['assets'] = assets
-        
-        # Populate 'prompts' field for GUI
-        prompts = {}
-        for asset in assets:
-            if asset['type'] == 'PROMPT':
-                try:
-                    meta = json.loads(asset['metadata'])
-                    text = meta.get('text', '')
-                    
-                    if asset['role'] == 'image_prompt':
-                        prompts['image_a'] = text
-                    elif asset['role'] == 'video_prompt':
-                        prompts['video'] = text
-                except:
-                    pass
-        shot['prompts'] = prompts
-        
-        conn.close()
+        asset_rows = conn.execute(
+            f"SELECT {self._ASSET_COLUMNS} FROM assets a WHERE a.shot_id = ? ORDER BY a.rowid", (shot_id,)
+        )
+        self._attach_assets([shot], asset_rows)
         return shot
 
+    @staticmethod
+    def _attach_assets(shots: List[Dict], asset_rows):
+        """Groups asset rows onto their shots and fills the 'prompts' field for the GUI."""
+        by_shot = {shot['shot_id']: shot for shot in shots}
+        for shot in shots:
+            shot['assets'] = []
+            shot['prompts'] = {}
+
+        for row in asset_rows:
+            asset = dict(row)
+            prompt_text = asset.pop('_prompt_text')
+            shot = by_shot.get(asset['shot_id'])
+            if shot is None:
+                continue
+            shot['assets'].append(asset)
+            
+            if prompt_text is not None:
+                if asset['role'] == 'image_prompt':
+                    shot['prompts']['image_a'] = prompt_text
+                elif asset['role'] == 'video_prompt':
+                    shot['prompts']['video'] = prompt_text
+
     def update_run_status(self, run_id: str, version: int, stage: str, status: str):
         """Updates the current status of a run's stage."""
         conn = self._get_connection()
-        try:
+        with conn:
             conn.execute('''
                 INSERT INTO run_status (run_id, version, current_stage, stage_status, updated_at)
                 VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
@@ -311,32 +460,103 @@ class DatabaseManager:
                     stage_status = excluded.stage_status,
                     updated_at = excluded.updated_at
             ''', (run_id, version, stage, status))
-            conn.commit()
-        finally:
-            conn.close()
+        self.events.publish("status", run_id, version, {"current_stage": stage, "stage_status": status})
+
+    _RUN_STATUS_FIELDS = (
+        "current_stage", "stage_status", "progress_current",
+        "progress_total", "progress_message", "updated_at"
+    )
+
+    def list_runs(self, limit: Optional[int] = None, cursor: Optional[str] = None, video_id: Optional[str] = None,
+                  stage: Optional[str] = None, status: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Lists runs newest first with their status joined in (one query).
+        Without a limit every (remaining) run is returned. With one, keyset
+        pagination: pass the returned cursor to get the next page (None when
+        there are no more rows).
+        `status` matches 'error' against the 'error: <msg>' values as well.
+        """
+        where, params = [], []
+        if video_id:
+            where.append("r.video_id = ?")
+            params.append(video_id)
+        if stage:
+            where.append("rs.current_stage = ?")
+            params.append(stage.upper())
+        if status:
+            where.append("(rs.stage_status = ? OR rs.stage_status LIKE ? ESCAPE '\\')")
+            params.extend([status, self._escape_like(status) + ":%"])
+        if cursor:
+            created_at, cursor_run_id, cursor_version = self._decode_cursor(cursor)
+            where.append("(r.created_at, r.run_id, r.version) < (?, ?, ?)")
+            params.extend([created_at, cursor_run_id, cursor_version])
+
+        query = f'''
+            SELECT r.run_id, r.version, r.video_id, r.created_at,
+                   rs.run_id IS NOT NULL AS has_status,
+                   {", ".join("rs." + field for field in self._RUN_STATUS_FIELDS)}
+            FROM runs r
+            LEFT JOIN run_status rs ON rs.run_id = r.run_id AND rs.version = r.version
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY r.created_at DESC, r.run_id DESC, r.version DESC
+            {"LIMIT ?" if limit is not None else ""}
+        '''
+        if limit is not None:
+            # One extra row tells whether another page exists
+            params.append(limit + 1)
+        rows = self._get_connection().execute(query, params).fetchall()
+
+        runs = []
+        for row in rows[:limit] if limit is not None else rows:
+            run = {key: row[key] for key in ("run_id", "version", "video_id", "created_at")}
+            # Same shape as get_run_status() so the GUI keeps working
+            run['status'] = {
+                "run_id": row["run_id"], "version": row["version"],
+                **{field: row[field] for field in self._RUN_STATUS_FIELDS}
+            } if row["has_status"] else None
+            runs.append(run)
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            last = runs[-1]
+            next_cursor = self._encode_cursor(last["created_at"], last["run_id"], last["version"])
+        return runs, next_cursor
+
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @staticmethod
+    def _encode_cursor(created_at: str, run_id: str, version: int) -> str:
+        raw = json.dumps([created_at, run_id, version]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, str, int]:
+        """Raises ValueError for a malformed cursor."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, run_id, version = json.loads(raw)
+            return str(created_at), str(run_id), int(version)
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
 
     def get_run_status(self, run_id: str, version: int) -> Optional[Dict]:
         """Retrieves the current status of a run."""
         conn = self._get_connection()
-        conn.row_factory = sqlite3.Row
-        try:
-            row = conn.execute(
-                "SELECT * FROM run_status WHERE run_id = ? AND version = ?",
-                (run_id, version)
-            ).fetchone()
-            return dict(row) if row else None
-        finally:
-            conn.close()
+        row = conn.execute(
+            "SELECT * FROM run_status WHERE run_id = ? AND version = ?",
+            (run_id, version)
+        ).fetchone()
+        return dict(row) if row else None
 
     def update_stage_progress(self, run_id: str, version: int, current: int, total: int, message: str = ""):
         """Updates the progress of the current stage."""
         conn = self._get_connection()
-        try:
+        with conn:
             conn.execute('''
                 UPDATE run_status 
                 SET progress_current = ?, progress_total = ?, progress_message = ?, updated_at = CURRENT_TIMESTAMP
                 WHERE run_id = ? AND version = ?
             ''', (current, total, message, run_id, version))
-            conn.commit()
-        finally:
-            conn.close()
+        self.events.publish("progress", run_id, version, {"current": current, "total": total, "message": message})
@@ -0,0 +1,263 @@
+import os
+import stat
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional
+from .paths import project_path
+
+try:
+    import fcntl  # reflinks (Linux only)
+except ImportError:
+    fcntl = None
+
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+CHUNK_SIZE = 1024 * 1024
+
+@dataclass
+class GCReport:
+    stale_refs: int = 0
+    blobs_removed: int = 0
+    bytes_freed: int = 0
+    dry_run: bool = False
+    removed: List[str] = field(default_factory=list)
+
+def _reflink(src_path: str, dest_path: str):
+    """Copy-on-write clone (btrfs, XFS, ...). Raises OSError where unsupported."""
+    if fcntl is None:
+        raise OSError("reflink not supported on this platform")
+    with open(src_path, "rb") as src, open(dest_path, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(dest_path)
+            raise
+
+class BlobStore:
+    """
+    Content-addressed store for run artifacts.
+    Blobs live at <root>/sha256/ab/cdef... (read-only, written once) and run
+    directories get hardlinks to them (reflink or plain copy when the
+    filesystem can't link). Every placement is recorded in <root>/refs.db so
+    `gc()` can drop blobs nothing points at anymore.
+    """
+    def __init__(self, root: str = "store"):
+        self.root = root
+        os.makedirs(os.path.join(root, "sha256"), exist_ok=True)
+        self.db_path = os.path.join(root, "refs.db")
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS refs (
+                    path TEXT PRIMARY KEY, -- absolute path of the placed file
+                    digest TEXT NOT NULL,
+                    mode TEXT NOT NULL, -- 'hardlink' | 'reflink' | 'copy'
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_refs_digest ON refs(digest)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "sha256", digest[:2], digest[2:])
+
+    def has(self, digest: str) -> bool:
+        return os.path.exists(self.blob_path(digest))
+
+    def put(self, src_path: str, digest: Optional[str] = None) -> str:
+        """
+        Adds `src_path` to the store (no-op if the content is already there).
+        A known `digest` (e.g. from hash_file_sha256) skips re-hashing; otherwise
+        the file is hashed and copied in one read. Returns the digest.
+        """
+        if digest and self.has(digest):
+            return digest
+
+        tmp_path = self.incoming_path()
+        if digest:
+            # Never hardlink an outside file: chmod-ing the blob would make the user's original read-only
+            self._place(src_path, tmp_path, allow_hardlink=False)
+        else:
+            sha256 = hashlib.sha256()
+            with open(src_path, "rb") as src, open(tmp_path, "wb") as dst:
+                for block in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    sha256.update(block)
+                    dst.write(block)
+            digest = sha256.hexdigest()
+        self.commit(tmp_path, digest)
+        return digest
+
+    def incoming_path(self) -> str:
+        """Scratch file inside the store (same filesystem as the blobs) for streamed writes."""
+        return os.path.join(self.root, f".incoming.{os.getpid()}.{threading.get_ident()}")
+
+    def commit(self, tmp_path: str, digest: str) -> str:
+        """Turns a fully written incoming file into blob `digest` (dropped if the blob already exists)."""
+        if self.has(digest):
+            os.remove(tmp_path)
+        else:
+            self._commit_blob(tmp_path, digest)
+        return digest
+
+    def adopt(self, path: str, digest: Optional[str] = None) -> str:
+        """
+        Moves an existing file (e.g. a freshly downloaded asset) under the store's
+        management: the file becomes a link to its blob. If the blob is new,
+        the file itself is linked into the store, so no bytes are copied.
+        """
+        path = os.path.abspath(path)
+        if not digest:
+            sha256 = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    sha256.update(block)
+            digest = sha256.hexdigest()
+
+        if not self.has(digest):
+            tmp_path = self.incoming_path()
+            self._place(path, tmp_path)
+            self._commit_blob(tmp_path, digest)
+        return self.link(digest, path)
+
+    def link(self, digest: str, dest_path: str) -> str:
+        """
+        Places blob `digest` at `dest_path` (hardlink > reflink > copy) and records
+        the reference. An existing file at `dest_path` is replaced atomically.
+        """
+        blob = self.blob_path(digest)
+        if not os.path.exists(blob):
+            raise FileNotFoundError(f"Blob not in store: {digest}")
+        dest_path = os.path.abspath(dest_path)
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+
+        if os.path.exists(dest_path) and os.path.samefile(blob, dest_path):
+            mode = "hardlink"
+        else:
+            part_path = dest_path + ".part"
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            mode = self._place(blob, part_path)
+            os.replace(part_path, dest_path)
+
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO refs (path, digest, mode) VALUES (?, ?, ?)", (dest_path, digest, mode)
+            )
+        return digest
+
+    def ingest(self, src_path: str, dest_path: str, digest: Optional[str] = None) -> str:
+        """put() + link(): stores `src_path` and places it at `dest_path`. Returns the digest."""
+        digest = self.put(src_path, digest)
+        self.link(digest, dest_path)
+        return digest
+
+    def refcount(self, digest: str) -> int:
+        row = self._connect().execute("SELECT COUNT(*) FROM refs WHERE digest = ?", (digest,)).fetchone()
+        return row[0]
+
+    def gc(self, dry_run: bool = False, grace_s: float = 3600) -> GCReport:
+        """
+        1. Drops references whose file is gone or no longer holds the blob
+           (deleted run, regenerated asset).
+        2. Deletes blobs with no references left. Blobs touched in the last
+           `grace_s` seconds are kept so a put() racing with gc survives.
+        """
+        report = GCReport(dry_run=dry_run)
+        conn = self._connect()
+
+        stale = []
+        for path, digest, mode in conn.execute("SELECT path, digest, mode FROM refs").fetchall():
+            if not self._ref_is_live(path, digest, mode):
+                stale.append((path,))
+        report.stale_refs = len(stale)
+        if stale and not dry_run:
+            with conn:
+                conn.executemany("DELETE FROM refs WHERE path = ?", stale)
+
+        stale_paths = {path for (path,) in stale}
+        referenced = {digest for path, digest in conn.execute("SELECT path, digest FROM refs") if path not in stale_paths}
+
+        now = time.time()
+        blobs_root = os.path.join(self.root, "sha256")
+        for prefix in os.listdir(blobs_root):
+            prefix_dir = os.path.join(blobs_root, prefix)
+            for name in os.listdir(prefix_dir):
+                digest = prefix + name
+                if digest in referenced:
+                    continue
+                blob = os.path.join(prefix_dir, name)
+                st = os.stat(blob)
+                if now - st.st_ctime < grace_s:
+                    continue
+                report.blobs_removed += 1
+                report.bytes_freed += st.st_size
+                report.removed.append(digest)
+                if not dry_run:
+                    os.chmod(blob, stat.S_IWUSR | stat.S_IRUSR)
+                    os.remove(blob)
+        return report
+
+    def _ref_is_live(self, path: str, digest: str, mode: str) -> bool:
+        if not os.path.exists(path):
+            return False
+        blob = self.blob_path(digest)
+        if not os.path.exists(blob):
+            return False
+        if mode == "hardlink":
+            return os.path.samefile(path, blob)
+        # Reflinks/copies have their own inode; a size change means the file was replaced
+        return os.path.getsize(path) == os.path.getsize(blob)
+
+    def _place(self, src_path: str, dest_path: str, allow_hardlink: bool = True) -> str:
+        """Hardlink, else reflink, else copy. Returns the mode used."""
+        if allow_hardlink:
+            try:
+                os.link(src_path, dest_path)
+                return "hardlink"
+            except OSError:
+                pass
+        try:
+            _reflink(src_path, dest_path)
+            shutil.copymode(src_path, dest_path)
+            return "reflink"
+        except OSError:
+            pass
+        shutil.copy2(src_path, dest_path)
+        return "copy"
+
+    def _commit_blob(self, tmp_path: str, digest: str):
+        blob = self.blob_path(digest)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        # Blobs are immutable: read-only for everyone, including hardlinked copies in runs
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp_path, blob)
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+def get_blob_store(root: Optional[str] = None) -> BlobStore:
+    """
+    Process-wide BlobStore. Without `root`, uses the same override as
+    paths.blob_store_root in the app config (APP__PATHS__BLOB_STORE_ROOT), else store/.
+    A relative root is taken from the project root, so the API server and the
+    CLI share one store whatever their working directory.
+    """
+    global _store
+    root = project_path(root or os.environ.get("APP__PATHS__BLOB_STORE_ROOT", "store"))
+    with _store_lock:
+        if _store is None or os.path.abspath(_store.root) != os.path.abspath(root):
+            _store = BlobStore(root)
+        return _store
@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 class PathsConfig(BaseModel):
     artifacts_root: str = "artifacts"
     logs_root: str = "logs"
+    blob_store_root: str = "store"  # content-addressed copies of inputs/assets (hardlinked into runs)
 
 class ParamsConfig(BaseModel):
     max_rerenders: int = 3
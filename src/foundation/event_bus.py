@@ -0,0 +1,119 @@
+import asyncio
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+# Events buffered per subscriber before it is marked overflowed
+DEFAULT_MAX_QUEUE = 1000
+
+@dataclass
+class RunEvent:
+    type: str           # "status" | "progress" | "asset"
+    run_id: str
+    version: int
+    data: Dict[str, Any] = field(default_factory=dict)
+    id: int = 0         # process-wide sequence number
+
+class Subscription:
+    """
+    Events for one run, delivered to an asyncio consumer.
+    Must be created on the consumer's event loop; publishers may be any thread.
+    A consumer that falls more than `max_queue` events behind is marked
+    `overflowed` and newer events are dropped until it resyncs (see take_overflow).
+    """
+
+    def __init__(self, bus: "EventBus", run_id: str, version: Optional[int], max_queue: int):
+        self.bus = bus
+        self.run_id = run_id
+        self.version = version
+        self.overflowed = False
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+
+    def matches(self, event: RunEvent) -> bool:
+        return event.run_id == self.run_id and (self.version is None or event.version == self.version)
+
+    def _deliver(self, event: RunEvent):
+        # Runs on the consumer's loop
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def push(self, event: RunEvent):
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:
+            # Loop closed under us: the consumer is gone
+            self.close()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[RunEvent]:
+        """Next event, or None after `timeout` seconds without one."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def take_overflow(self) -> bool:
+        """True (once) if events were dropped; the consumer should resend a snapshot."""
+        if not self.overflowed:
+            return False
+        self.overflowed = False
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        return True
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+class EventBus:
+    """
+    In-process pub/sub for run changes. DatabaseManager publishes after each
+    committed write; the API streams them to clients (SSE). Only writes made
+    by this process are seen.
+    """
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, run_id: str, version: Optional[int] = None, max_queue: int = DEFAULT_MAX_QUEUE) -> Subscription:
+        subscription = Subscription(self, run_id, version, max_queue)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def has_subscribers(self, run_id: Optional[str] = None) -> bool:
+        with self._lock:
+            return any(run_id is None or s.run_id == run_id for s in self._subscriptions)
+
+    def publish(self, event_type: str, run_id: str, version: int, data: Optional[Dict[str, Any]] = None) -> Optional[RunEvent]:
+        """Fans the event out to matching subscribers. Never blocks the writer."""
+        with self._lock:
+            targets = [s for s in self._subscriptions if s.run_id == run_id]
+            if not targets:
+                return None
+            event = RunEvent(type=event_type, run_id=run_id, version=version, data=data or {}, id=next(self._ids))
+        for subscription in targets:
+            if subscription.matches(event):
+                subscription.push(event)
+        return event
+
+_event_bus: Optional[EventBus] = None
+_event_bus_lock = threading.Lock()
+
+def get_event_bus() -> EventBus:
+    """Process-wide bus shared by every DatabaseManager and the API."""
+    global _event_bus
+    with _event_bus_lock:
+        if _event_bus is None:
+            _event_bus = EventBus()
+        return _event_bus
@@ -0,0 +1,83 @@
+import os
+import struct
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional
+from .blob_store import BlobStore, CHUNK_SIZE
+
+# Bytes kept from the start of each input for metadata sniffing (WAV header, LOCKED marker)
+HEAD_BYTES = 64 * 1024
+
+@dataclass
+class IngestedFile:
+    source_path: str
+    sha256: str
+    size_bytes: int
+    head: bytes
+
+    @property
+    def locked(self) -> bool:
+        """Style bible convention: a LOCKED marker in the first 4KB."""
+        return "LOCKED" in self.head[:4096].decode("utf-8", errors="ignore")
+
+    @property
+    def wav_duration_s(self) -> Optional[float]:
+        return _wav_duration(self.head)
+
+def _wav_duration(head: bytes) -> Optional[float]:
+    """
+    Duration of a PCM WAV from its header (fmt byte rate + data chunk size).
+    None if this isn't a WAV or the data chunk header lies beyond `head`.
+    """
+    if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        return None
+    byte_rate = None
+    pos = 12
+    while pos + 8 <= len(head):
+        chunk_id, chunk_size = head[pos:pos + 4], struct.unpack("<I", head[pos + 4:pos + 8])[0]
+        if chunk_id == b"fmt " and pos + 16 <= len(head):
+            byte_rate = struct.unpack("<I", head[pos + 16:pos + 20])[0]
+        elif chunk_id == b"data":
+            return chunk_size / byte_rate if byte_rate else None
+        pos += 8 + chunk_size + (chunk_size & 1)  # chunks are word aligned
+    return None
+
+def ingest_file(src_path: str, blob_store: BlobStore) -> IngestedFile:
+    """
+    Reads `src_path` exactly once: the stream is hashed, written into the blob
+    store and its first HEAD_BYTES kept for sniffing, all in the same loop.
+    Link the result into a run with blob_store.link(result.sha256, dest).
+    """
+    sha256 = hashlib.sha256()
+    head = bytearray()
+    size = 0
+    tmp_path = blob_store.incoming_path() + f".{os.path.basename(src_path)}"
+    try:
+        with open(src_path, "rb") as src, open(tmp_path, "wb") as dst:
+            for block in iter(lambda: src.read(CHUNK_SIZE), b""):
+                sha256.update(block)
+                dst.write(block)
+                if len(head) < HEAD_BYTES:
+                    head.extend(block[:HEAD_BYTES - len(head)])
+                size += len(block)
+        digest = blob_store.commit(tmp_path, sha256.hexdigest())
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return IngestedFile(source_path=src_path, sha256=digest, size_bytes=size, head=bytes(head))
+
+def ingest_files(paths: Dict[str, str], blob_store: BlobStore) -> Dict[str, Optional[IngestedFile]]:
+    """
+    Ingests several inputs concurrently (hashlib releases the GIL on large
+    blocks). Missing files map to None; preflight reports them.
+    """
+    existing = {name: path for name, path in paths.items() if path and os.path.exists(path)}
+    results: Dict[str, Optional[IngestedFile]] = {name: None for name in paths}
+    if existing:
+        with ThreadPoolExecutor(max_workers=len(existing), thread_name_prefix="ingest") as executor:
+            futures = {name: executor.submit(ingest_file, path, blob_store) for name, path in existing.items()}
+            for name, future in futures.items():
+                results[name] = future.result()
+    return results
@@ -0,0 +1,264 @@
+import os
+import json
+import shutil
+import hashlib
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+from .paths import project_path
+
+# Bump when MediaInfo's shape changes so stale cache entries are ignored
+PROBE_CACHE_VERSION = 2
+
+class MediaProbeError(RuntimeError):
+    """ffprobe failed or returned something unusable."""
+
+class FFprobeNotFound(MediaProbeError):
+    """No ffprobe binary available on this machine."""
+
+def find_ffprobe() -> Optional[str]:
+    """ffprobe from PATH, then common install locations."""
+    ffprobe_cmd = shutil.which("ffprobe")
+    if ffprobe_cmd:
+        return ffprobe_cmd
+    for path in ["/usr/bin/ffprobe", "/usr/local/bin/ffprobe", "/bin/ffprobe", "/opt/homebrew/bin/ffprobe"]:
+        if os.path.exists(path):
+            return path
+    return None
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    # "30/1", "30000/1001", "0/0"
+    if not rate:
+        return None
+    try:
+        num, _, den = rate.partition("/")
+        value = float(num) / float(den or 1)
+        return value or None
+    except (ValueError, ZeroDivisionError):
+        return None
+
+@dataclass
+class StreamInfo:
+    index: int
+    codec_type: str  # 'video' | 'audio' | 'subtitle' | 'data'
+    codec_name: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    pix_fmt: Optional[str] = None
+    r_frame_rate: Optional[str] = None
+    fps: Optional[float] = None
+    sample_aspect_ratio: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    duration_s: Optional[float] = None
+    # H.264 profile/level and a hash of the decoder config (SPS/PPS); clips with
+    # different values can't share one stream-copied concat
+    profile: Optional[str] = None
+    level: Optional[int] = None
+    extradata_hash: Optional[str] = None
+
+@dataclass
+class MediaInfo:
+    path: str
+    size_bytes: int
+    duration_s: float
+    format_name: Optional[str] = None
+    streams: List[StreamInfo] = field(default_factory=list)
+
+    @property
+    def video(self) -> Optional[StreamInfo]:
+        return next((s for s in self.streams if s.codec_type == "video"), None)
+
+    @property
+    def audio(self) -> Optional[StreamInfo]:
+        return next((s for s in self.streams if s.codec_type == "audio"), None)
+
+    @property
+    def width(self) -> Optional[int]:
+        return self.video.width if self.video else None
+
+    @property
+    def height(self) -> Optional[int]:
+        return self.video.height if self.video else None
+
+    @property
+    def fps(self) -> Optional[float]:
+        return self.video.fps if self.video else None
+
+    @property
+    def codec(self) -> Optional[str]:
+        stream = self.video or self.audio
+        return stream.codec_name if stream else None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "MediaInfo":
+        data = dict(data)
+        data["streams"] = [StreamInfo(**s) for s in data.get("streams", [])]
+        return cls(**data)
+
+    @classmethod
+    def from_ffprobe(cls, path: str, size_bytes: int, payload: Dict) -> "MediaInfo":
+        fmt = payload.get("format") or {}
+        streams = []
+        for raw in payload.get("streams") or []:
+            streams.append(StreamInfo(
+                index=int(raw.get("index", len(streams))),
+                codec_type=raw.get("codec_type", "unknown"),
+                codec_name=raw.get("codec_name"),
+                width=raw.get("width"),
+                height=raw.get("height"),
+                pix_fmt=raw.get("pix_fmt"),
+                r_frame_rate=raw.get("r_frame_rate"),
+                fps=_parse_rate(raw.get("avg_frame_rate")) or _parse_rate(raw.get("r_frame_rate")),
+                sample_aspect_ratio=raw.get("sample_aspect_ratio"),
+                sample_rate=int(raw["sample_rate"]) if raw.get("sample_rate") else None,
+                channels=raw.get("channels"),
+                duration_s=float(raw["duration"]) if raw.get("duration") else None,
+                profile=raw.get("profile"),
+                level=raw.get("level"),
+                extradata_hash=raw.get("extradata_hash"),
+            ))
+        duration = fmt.get("duration")
+        if duration is None:
+            duration = max((s.duration_s or 0.0 for s in streams), default=0.0)
+        return cls(
+            path=path,
+            size_bytes=size_bytes,
+            duration_s=float(duration),
+            format_name=fmt.get("format_name"),
+            streams=streams,
+        )
+
+class MediaProbe:
+    """
+    Cached ffprobe wrapper shared by the aligner, the assembler and QA.
+    Results are kept in memory and on disk (`cache_dir`, one JSON per entry)
+    keyed by (absolute path, size, mtime), so a file is probed once per version
+    no matter how many stages ask about it.
+    """
+    def __init__(self, cache_dir: Optional[str] = None, ffprobe_cmd: Optional[str] = None):
+        self.cache_dir = cache_dir or project_path(os.environ.get("MEDIA_PROBE_CACHE_DIR") or ".cache/probe")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._ffprobe_cmd = ffprobe_cmd
+        self._memory: Dict[str, MediaInfo] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ffprobe_cmd(self) -> str:
+        if not self._ffprobe_cmd:
+            self._ffprobe_cmd = find_ffprobe()
+            if not self._ffprobe_cmd:
+                raise FFprobeNotFound("ffprobe not found in PATH or common locations.")
+        return self._ffprobe_cmd
+
+    def probe(self, path: str) -> MediaInfo:
+        """Returns MediaInfo for `path`. Raises FileNotFoundError or MediaProbeError."""
+        abs_path = os.path.abspath(path)
+        st = os.stat(abs_path)  # FileNotFoundError for missing files
+        key = self._cache_key(abs_path, st)
+
+        with self._lock:
+            cached = self._memory.get(key)
+        if cached:
+            return cached
+
+        info = self._read_disk(key)
+        if info is None:
+            info = self._run_ffprobe(abs_path, st.st_size)
+            self._write_disk(key, info)
+
+        with self._lock:
+            self._memory[key] = info
+        return info
+
+    def probe_many(self, paths: List[str], max_workers: int = 8) -> Dict[str, Optional[MediaInfo]]:
+        """
+        Probes many files concurrently (cache hits cost no process).
+        Returns {path: MediaInfo or None if it could not be probed}.
+        """
+        def safe_probe(path: str) -> Optional[MediaInfo]:
+            try:
+                return self.probe(path)
+            except FFprobeNotFound:
+                raise
+            except (OSError, MediaProbeError) as e:
+                print(f"Warning: Could not probe {path}: {e}")
+                return None
+
+        unique = list(dict.fromkeys(paths))
+        if len(unique) <= 1:
+            return {path: safe_probe(path) for path in unique}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique)), thread_name_prefix="probe") as executor:
+            return dict(zip(unique, executor.map(safe_probe, unique)))
+
+    @staticmethod
+    def _cache_key(abs_path: str, st: os.stat_result) -> str:
+        raw = f"{PROBE_CACHE_VERSION}|{abs_path}|{st.st_size}|{st.st_mtime_ns}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _run_ffprobe(self, abs_path: str, size_bytes: int) -> MediaInfo:
+        cmd = [
+            self.ffprobe_cmd,
+            "-v", "error",
+            "-show_entries",
+            "format=duration,format_name:stream=index,codec_type,codec_name,width,height,pix_fmt,"
+            "r_frame_rate,avg_frame_rate,sample_aspect_ratio,sample_rate,channels,duration,"
+            "profile,level,extradata_hash",
+            "-show_data_hash", "sha256",
+            "-of", "json",
+            abs_path
+        ]
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
+            payload = json.loads(result.stdout)
+        except subprocess.CalledProcessError as e:
+            raise MediaProbeError(f"ffprobe failed for {abs_path}: {e.stderr.strip()}") from e
+        except json.JSONDecodeError as e:
+            raise MediaProbeError(f"ffprobe returned invalid JSON for {abs_path}") from e
+        return MediaInfo.from_ffprobe(abs_path, size_bytes, payload)
+
+    def _read_disk(self, key: str) -> Optional[MediaInfo]:
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                return MediaInfo.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Warning: Corrupt probe cache file {path}: {e}")
+            return None
+
+    def _write_disk(self, key: str, info: MediaInfo):
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(info.to_dict(), f)
+        os.replace(tmp_path, path)
+
+_probe: Optional[MediaProbe] = None
+_probe_lock = threading.Lock()
+
+def get_media_probe() -> MediaProbe:
+    """Process-wide MediaProbe (cache dir: MEDIA_PROBE_CACHE_DIR or .cache/probe)."""
+    global _probe
+    with _probe_lock:
+        if _probe is None:
+            _probe = MediaProbe()
+        return _probe
+
+def probe_audio_duration(audio_path: str) -> float:
+    """
+    Audio duration via the shared probe. Machines without ffprobe fall back to
+    mutagen for MP3 so preflight still works there.
+    """
+    try:
+        return get_media_probe().probe(audio_path).duration_s
+    except FFprobeNotFound:
+        from mutagen.mp3 import MP3
+        return MP3(audio_path).info.length
@@ -0,0 +1,8 @@
+import os
+
+# Project root (root/src/foundation -> root), same as BASE_DIR in the API server
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def project_path(path: str) -> str:
+    """Absolute paths pass through; relative ones resolve against BASE_DIR, not the cwd."""
+    return path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
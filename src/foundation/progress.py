@@ -0,0 +1,120 @@
+import os
+import time
+import threading
+from typing import Any, Callable, Optional
+
+# (current, total, message)
+ProgressSink = Callable[[int, int, str], None]
+
+class ProgressReporter:
+    """
+    Coalesces progress updates in memory so stages can report on every item.
+    The sink is written at most every `min_interval_ms`, or sooner when progress
+    advanced by `min_step_pct` of the total; reaching the total and flush()/close()
+    always write the latest state. Updates held back by the interval are written
+    by a timer once it elapses, so a burst followed by a long wait is not left
+    stale. Without a sink it only keeps the counters.
+    Thread-safe: worker pools can call advance() concurrently.
+    """
+
+    def __init__(self, sink: Optional[ProgressSink] = None, min_interval_ms: Optional[float] = None,
+                 min_step_pct: Optional[float] = None, clock: Callable[[], float] = time.monotonic,
+                 timer: Callable[[float, Callable[[], None]], Any] = threading.Timer):
+        self.sink = sink
+        self.min_interval_s = (min_interval_ms if min_interval_ms is not None
+                               else float(os.environ.get("PROGRESS_FLUSH_MS", "1000"))) / 1000
+        self.min_step_pct = min_step_pct if min_step_pct is not None else float(os.environ.get("PROGRESS_FLUSH_PCT", "5"))
+        self._clock = clock
+        self._timer_factory = timer
+        self._timer = None
+        self._lock = threading.Lock()
+        self.current = 0
+        self.total = 0
+        self.message = ""
+        self._dirty = False
+        self._flushed_at = None
+        self._flushed_current = 0
+
+    @classmethod
+    def for_run(cls, db, run_id: str, version: int, **kwargs) -> "ProgressReporter":
+        """Reporter writing to run_status through DatabaseManager.update_stage_progress."""
+        return cls(lambda current, total, message: db.update_stage_progress(run_id, version, current, total, message), **kwargs)
+
+    def start(self, total: int, message: str = ""):
+        """Begins a new batch of `total` items (written immediately)."""
+        with self._lock:
+            self.current, self.total, self.message = 0, total, message
+            self._dirty = True
+            self._flush_locked()
+
+    def update(self, current: int, total: Optional[int] = None, message: Optional[str] = None):
+        with self._lock:
+            self.current = current
+            if total is not None:
+                self.total = total
+            if message is not None:
+                self.message = message
+            self._dirty = True
+            self._maybe_flush_locked()
+
+    def advance(self, n: int = 1, message: Optional[str] = None):
+        """Counts `n` more items done."""
+        with self._lock:
+            self.current += n
+            if message is not None:
+                self.message = message
+            self._dirty = True
+            self._maybe_flush_locked()
+
+    def flush(self):
+        """Writes the latest state if anything changed since the last write."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _maybe_flush_locked(self):
+        if self._flushed_at is None or (self.total and self.current >= self.total):
+            self._flush_locked()
+            return
+        if self._clock() - self._flushed_at >= self.min_interval_s:
+            self._flush_locked()
+            return
+        if self.total and (self.current - self._flushed_current) * 100.0 / self.total >= self.min_step_pct:
+            self._flush_locked()
+            return
+        self._arm_timer_locked()
+
+    def _arm_timer_locked(self):
+        # One pending timer at most; it writes whatever is latest when it fires
+        if self.sink is None or self._timer is not None:
+            return
+        delay = max(0.0, self.min_interval_s - (self._clock() - self._flushed_at))
+        self._timer = self._timer_factory(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._flushed_at = self._clock()
+        self._flushed_current = self.current
+        if self.sink is None:
+            return
+        try:
+            self.sink(self.current, self.total, self.message)
+        except Exception as e:
+            # Progress is advisory; never fail a stage over it
+            print(f"Warning: Could not write progress ({self.current}/{self.total}): {e}")
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel
 from src.foundation.manifest import State
+from src.foundation.progress import ProgressReporter
 
 class StepResult(BaseModel):
     status: State
@@ -16,6 +17,15 @@ class StepContext(BaseModel):
     services: Dict[str, Any] = {}
     artifacts_root: str = "artifacts"
 
+    @property
+    def progress(self) -> ProgressReporter:
+        """The run's reporter (services["progress"]); pass it to every component a step drives."""
+        reporter = self.services.get("progress")
+        if reporter is None:
+            # Counters only: nothing is written
+            reporter = self.services["progress"] = ProgressReporter()
+        return reporter
+
 class Step(ABC):
     @property
     @abstractmethod
@@ -1,6 +1,6 @@
 import os
-from mutagen.mp3 import MP3
 from mutagen import MutagenError
+from .media_probe import probe_audio_duration, MediaProbeError
 
 def validate_input_files(script_path: str, audio_path: str, style_bible_path: str) -> dict:
     """
@@ -33,14 +33,14 @@ def validate_input_files(script_path: str, audio_path: str, style_bible_path: st
         check_audio["detail"] = "Invalid extension"
     else:
         try:
-            audio = MP3(audio_path)
-            if audio.info.length > 0:
+            duration_s = probe_audio_duration(audio_path)
+            if duration_s > 0:
                 check_audio["passed"] = True
-                check_audio["detail"] = f"duration_s={audio.info.length:.2f}"
+                check_audio["detail"] = f"duration_s={duration_s:.2f}"
             else:
                  check_audio["detail"] = "Audio duration is 0"
-        except MutagenError:
-            check_audio["detail"] = "Invalid or Corrupted MP3 file"
+        except (MutagenError, MediaProbeError):
+            check_audio["detail"] = "Invalid or Corrupted audio file"
         except Exception as e:
             check_audio["detail"] = f"Error reading audio: {str(e)}"
     
@@ -2,17 +2,46 @@ import os
 import shutil
 import time
 import json
+import threading
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional, Tuple
 from .models import NanobananaRequest, ImageRole, GenerationMode, VeoRequest, PairRole
 from .clients.nanobanana import NanobananaClient
 from .clients.veo import VeoClient
+from .clients.download import write_atomic
+from .cache.cache_manager import CacheManager
+from .cache.generation_cache import GenerationCache, default_generation_cache, init_image_fingerprint
+from .foundation.progress import ProgressReporter
+
+def _load_json_map(path: str) -> Dict[str, str]:
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return {}
+
+def _write_json_map(path: str, url_map: Dict[str, str]):
+    """Atomic write (tmp + rename) so readers never see a half-written map."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(url_map, f, indent=2)
+    os.replace(tmp_path, path)
 
 class ImageGenerator:
-    def __init__(self, output_dir: str):
+    def __init__(self, output_dir: str, max_workers: Optional[int] = None, cache: Optional[GenerationCache] = None,
+                 progress: Optional[ProgressReporter] = None):
         self.output_dir = output_dir
         self.assets_dir = os.path.join(output_dir, "assets")
         os.makedirs(self.assets_dir, exist_ok=True)
         self.client = NanobananaClient()
+        # Renders are reused across runs/versions when their inputs match
+        self.cache = cache if cache is not None else default_generation_cache()
+        # Per-shot progress (StepContext.services["progress"]); counters only when not given
+        self.progress = progress or ProgressReporter()
+        
+        # Shots generated in parallel; A->B stays sequential inside each shot
+        self.max_workers = max(1, max_workers or int(os.environ.get("KIE_IMAGE_CONCURRENCY", "4")))
+        self._url_lock = threading.Lock()
 
     def generate_images(self, requests: List[NanobananaRequest], mode: GenerationMode) -> List[str]:
         """
@@ -35,75 +64,136 @@ class ImageGenerator:
             role = req.pair_role or PairRole.START_REF
             shot_map[req.shot_id][role] = req
             
-        print(f"Generating Images for {len(shot_map)} shots [Mode: {mode.value}]...")
+        workers = min(self.max_workers, len(shot_map)) or 1
+        print(f"Generating Images for {len(shot_map)} shots [Mode: {mode.value}, Workers: {workers}]...")
         
         sorted_shots = sorted(shot_map.keys())
         
         url_map_path = os.path.join(self.output_dir, "image_urls.json")
-        url_map = {}
-        if os.path.exists(url_map_path):
-             with open(url_map_path, 'r') as f:
-                 url_map = json.load(f)
+        url_map = _load_json_map(url_map_path)
+
+        results = {}
+        self.progress.start(len(sorted_shots), "Generating images")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="img-gen") as executor:
+            futures = {
+                executor.submit(self._generate_pair, shot_id, shot_map[shot_id], url_map, url_map_path): shot_id
+                for shot_id in sorted_shots
+            }
+            try:
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    self.progress.advance(message=f"Images for {futures[future]} done")
+            except Exception:
+                # Stop scheduling new shots; in-flight ones finish and keep their URLs
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            finally:
+                self.progress.flush()
 
+        # Save URL Map (already persisted per result; final write keeps the file present)
+        with self._url_lock:
+            _write_json_map(url_map_path, url_map)
+
+        # Stable output order regardless of completion order
         for shot_id in sorted_shots:
-            roles = shot_map[shot_id]
-            start_req = roles.get(PairRole.START_REF) # Correct enum usage
-            end_req = roles.get(PairRole.END_REF)
+            new_files.extend(results[shot_id])
+
+        return new_files
+
+    def _generate_pair(self, shot_id: str, roles: Dict[PairRole, NanobananaRequest], url_map: Dict[str, str], url_map_path: str) -> List[str]:
+        """Generates START (A) then END (B) for one shot. Runs on a worker thread."""
+        new_files = []
+        start_req = roles.get(PairRole.START_REF) # Correct enum usage
+        end_req = roles.get(PairRole.END_REF)
+        
+        # 1. Generate START (A)
+        start_path = None
+        start_url = None
+        if start_req:
+            start_path, start_url = self._generate_single(self.client, start_req, start_req.image_input_path)
+            if start_path:
+                 new_files.append(start_path)
+                 start_filename = os.path.basename(start_path)
+                 if start_url:
+                     self._record_url(url_map, url_map_path, start_filename, start_url)
+                 else:
+                     # Skipped (exists): reuse URL from a previous run of this stage
+                     with self._url_lock:
+                         start_url = url_map.get(start_filename)
+
+        # 2. Generate END (B)
+        if end_req:
+            # BINDING LOGIC (Clean Score Jump)
+            # Puede deshabilitarse con DISABLE_IMG2IMG=1 para pruebas comparativas
+            disable_binding = os.environ.get("DISABLE_IMG2IMG") == "1"
             
-            # 1. Generate START (A)
-            start_path = None
-            start_url = None
-            if start_req:
-                start_path, start_url = self._generate_single(self.client, start_req)
-                if start_path:
-                     new_files.append(start_path)
-                     start_filename = os.path.basename(start_path)
-                     if start_url:
-                         url_map[start_filename] = start_url
-
-            # 2. Generate END (B)
-            if end_req:
-                # BINDING LOGIC (Clean Score Jump)
-                # Puede deshabilitarse con DISABLE_IMG2IMG=1 para pruebas comparativas
-                disable_binding = os.environ.get("DISABLE_IMG2IMG") == "1"
-                
-                if os.environ.get("ALIGNMENT_MODE") == "CLEAN_SCORE" and start_url and not disable_binding:
-                     print(f"Binding A->B for {shot_id}: Using URL {start_url} as init_image")
-                     end_req.image_input_path = start_url
-                     # Potentially adjust strength if needed, or stick to model default
-                elif disable_binding:
-                     print(f"⚠️  BINDING DISABLED for {shot_id} (DISABLE_IMG2IMG=1)")
-                
-                # Check if we have end_url in map (if skipped)
-                # But here we are generating...
-                end_path, end_url = self._generate_single(self.client, end_req)
-                if end_path:
-                     new_files.append(end_path)
-                     if end_url:
-                          url_map[os.path.basename(end_path)] = end_url
-
-        # Save URL Map
-        with open(url_map_path, 'w') as f:
-            json.dump(url_map, f, indent=2)
+            if os.environ.get("ALIGNMENT_MODE") == "CLEAN_SCORE" and start_url and not disable_binding:
+                 print(f"Binding A->B for {shot_id}: Using URL {start_url} as init_image")
+                 end_req.image_input_path = start_url
+                 # Potentially adjust strength if needed, or stick to model default
+            elif disable_binding:
+                 print(f"⚠️  BINDING DISABLED for {shot_id} (DISABLE_IMG2IMG=1)")
+            
+            # A is hashed from disk: its URL differs per upload even when the image is identical
+            init_image_path = start_path if end_req.image_input_path == start_url else end_req.image_input_path
+            end_path, end_url = self._generate_single(self.client, end_req, init_image_path)
+            if end_path:
+                 new_files.append(end_path)
+                 if end_url:
+                      self._record_url(url_map, url_map_path, os.path.basename(end_path), end_url)
 
         return new_files
 
-    def _generate_single(self, client: NanobananaClient, req: NanobananaRequest) -> Tuple[Optional[str], Optional[str]]:
+    def _record_url(self, url_map: Dict[str, str], url_map_path: str, filename: str, url: str):
+        """Adds a result to the shared URL map and persists it as soon as it lands."""
+        with self._url_lock:
+            url_map[filename] = url
+            _write_json_map(url_map_path, url_map)
+
+    @staticmethod
+    def _image_cache_key(client: NanobananaClient, req: NanobananaRequest, init_image_path: Optional[str]) -> str:
+        init_image = None
+        if req.image_input_path:
+            init_image = init_image_fingerprint(init_image_path, req.image_input_path)
+        config = {
+            "model": client.model_id,
+            "seed": req.seed,
+            "aspect_ratio": req.aspect_ratio,
+            "resolution": req.resolution,
+            "init_image": init_image,
+        }
+        if os.environ.get("KIE_MOCK_MODE") == "1" or os.environ.get("NANOBANANA_MOCK_MODE") == "1":
+            config["mock"] = True  # dummy bytes must never satisfy a real render
+        return CacheManager.compute_image_key(req.prompt, req.negative_prompt, config)
+
+    def _generate_single(self, client: NanobananaClient, req: NanobananaRequest,
+                         init_image_path: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
         role_suffix = req.pair_role.value if req.pair_role else "ref"
         filename = f"{req.shot_id}_{role_suffix}.png"
         out_path = os.path.join(self.assets_dir, filename)
+        asset_type = "IMAGE_END" if req.pair_role == PairRole.END_REF else "IMAGE_START"
+        cache_key = self._image_cache_key(client, req, init_image_path) if self.cache else None
         
-        if os.path.exists(out_path):
+        if os.path.exists(out_path) and (cache_key is None or self.cache.is_current(out_path, cache_key)):
             print(f"Skipping {filename} (Exists)")
             return out_path, None
+
+        if cache_key:
+            cached = self.cache.lookup(cache_key)
+            if cached:
+                self.cache.materialize(cached, out_path)
+                self.cache.store(cache_key, req.shot_id, asset_type, out_path, role=role_suffix, url=cached.get("url"),
+                                 meta={"cache_hit": cached["asset_id"], "request_id": req.request_id})
+                print(f"Cache hit for {filename} (asset {cached['asset_id']})")
+                return out_path, cached.get("url")
             
         print(f"Generating {filename}...")
         try:
-            # Call Client
-            img_bytes, img_url = client.generate_image(req)
-            
-            with open(out_path, "wb") as f:
-                f.write(img_bytes)
+            # Call Client (streams straight into assets/, renamed into place when complete)
+            download, img_url = client.generate_image(req, out_path)
+            if cache_key:
+                self.cache.store(cache_key, req.shot_id, asset_type, out_path, role=role_suffix, url=img_url,
+                                 meta={"sha256": download.sha256, "size_bytes": download.size_bytes, "request_id": req.request_id})
             
             return out_path, img_url
         except Exception as e:
@@ -112,11 +202,23 @@ class ImageGenerator:
         return None, None
 
 class ClipGenerator:
-    def __init__(self, output_dir: str):
+    def __init__(self, output_dir: str, max_in_flight: Optional[int] = None, submit_interval_s: Optional[float] = None,
+                 cache: Optional[GenerationCache] = None, progress: Optional[ProgressReporter] = None):
         self.output_dir = output_dir
         self.assets_dir = os.path.join(output_dir, "assets")
         os.makedirs(self.assets_dir, exist_ok=True)
         self.client = VeoClient()
+        self.cache = cache if cache is not None else default_generation_cache()
+        self.progress = progress or ProgressReporter()
+        
+        # Submit/poll budget: jobs in flight at once (1 = legacy one-by-one loop)
+        # and minimum spacing between task creations
+        self.max_in_flight = max(1, max_in_flight or int(os.environ.get("KIE_VEO_MAX_IN_FLIGHT", "4")))
+        if submit_interval_s is None:
+            submit_interval_s = float(os.environ.get("KIE_VEO_SUBMIT_INTERVAL_S", "2.0"))
+        self.submit_interval_s = submit_interval_s
+        self._state_lock = threading.Lock()
+        self._last_submit = None
 
     def generate_clips(self, requests: List[VeoRequest], mode: GenerationMode) -> List[str]:
         if mode == GenerationMode.SIMULATION:
@@ -127,59 +229,236 @@ class ClipGenerator:
             raise ValueError(f"Unsupported generation mode: {mode}")
 
     def _generate_real(self, requests: List[VeoRequest]) -> List[str]:
-        generated_files = []
         print(f"Starting REAL CLIP generation for {len(requests)} shots...")
         
         url_map_path = os.path.join(self.output_dir, "image_urls.json")
-        url_map = {}
-        if os.path.exists(url_map_path):
-             with open(url_map_path, 'r') as f:
-                 url_map = json.load(f)
+        url_map = _load_json_map(url_map_path)
 
-        for req in requests:
-            filename = f"{req.shot_id}.mp4"
-            filepath = os.path.join(self.assets_dir, filename)
-
-            # Resolve Image Paths/URLs to pass to Client
-            start_filename = f"{req.shot_id}_start_ref.png"
-            end_filename = f"{req.shot_id}_end_ref.png"
-            
-            if start_filename in url_map:
-                req.image_ref_start = url_map[start_filename]
-                print(f"Attached Start Image (URL): {req.image_ref_start}")
-            
-            if end_filename in url_map:
-                req.image_ref_end = url_map[end_filename]
-                print(f"Attached End Image (URL): {req.image_ref_end}")
-            
-            if not req.image_ref_start and not req.image_ref_end:
-                print(f"WARNING: No image URLs found for {req.shot_id}. Video will be text-only.")
-            
-            try:
-                print(f"Generating Real Clip: {filename}")
-                # Tuple return: (video_bytes, video_url)
-                video_bytes, video_url = self.client.generate_clip(req)
-                
-                with open(filepath, 'wb') as f:
-                    f.write(video_bytes)
+        self.progress.start(len(requests), "Generating clips")
+        try:
+            if self.max_in_flight <= 1:
+                generated_files = self._generate_sequential(requests, url_map, url_map_path)
+            else:
+                generated_files = self._generate_fanout(requests, url_map, url_map_path)
+        finally:
+            self.progress.flush()
+        
+        # Save updated URL Map (Critical for Airtable Sync)
+        with self._state_lock:
+            _write_json_map(url_map_path, url_map)
 
-                generated_files.append(filename)
+        return generated_files
 
-                if video_url:
-                     url_map[filename] = video_url
-                     print(f"Captured Video URL: {video_url}")
+    def _generate_sequential(self, requests: List[VeoRequest], url_map: Dict[str, str], url_map_path: str) -> List[str]:
+        """Legacy mode: submit, poll, download, then move on to the next clip."""
+        generated_files = []
+        for req in requests:
+            self._attach_image_urls(req, url_map)
+            cache_key = self._clip_cache_key(req)
+            cached = self._reuse_cached_clip(req, cache_key, url_map, url_map_path)
+            if cached:
+                generated_files.append(cached)
+                self.progress.advance(message=f"Clip {req.shot_id} reused")
+                continue
+            try:
+                print(f"Generating Real Clip: {req.shot_id}.mp4")
+                # Tuple return: (DownloadResult, video_url)
+                download, video_url = self.client.generate_clip(req, self._clip_path(req))
+                generated_files.append(self._store_clip(req, video_url, url_map, url_map_path, cache_key, download))
+                self.progress.advance(message=f"Clip {req.shot_id} done")
                 
                 time.sleep(2.0) 
                 
             except Exception as e:
                 print(f"FAILED to generate clip {req.shot_id}: {e}")
                 raise e
+        return generated_files
+
+    def _generate_fanout(self, requests: List[VeoRequest], url_map: Dict[str, str], url_map_path: str) -> List[str]:
+        """
+        Submit-all-then-poll mode.
+        Tasks are created up front as the budget allows (max_in_flight jobs, one
+        creation every submit_interval_s); each slot is freed when its clip lands.
+        Task IDs are tracked in veo_tasks.json so an interrupted stage resumes
+        polling instead of paying for the same job twice.
+        """
+        tasks_path = os.path.join(self.output_dir, "veo_tasks.json")
+        tasks = _load_json_map(tasks_path)
         
-        # Save updated URL Map (Critical for Airtable Sync)
-        with open(url_map_path, 'w') as f:
-            json.dump(url_map, f, indent=2)
+        budget = threading.BoundedSemaphore(self.max_in_flight)
+        abort = threading.Event()
+        
+        def on_done(future):
+            budget.release()
+            if future.cancelled() or future.exception() is not None:
+                abort.set()
 
-        return generated_files
+        print(f"Fan-out: up to {self.max_in_flight} Veo jobs in flight, {self.submit_interval_s}s between submissions")
+        
+        results = {}
+        errors = []
+        futures = {}
+        for index, req in enumerate(requests):
+            self._attach_image_urls(req, url_map)
+            cache_key = self._clip_cache_key(req)
+            cached = self._reuse_cached_clip(req, cache_key, url_map, url_map_path)
+            if cached:
+                results[index] = cached
+                self.progress.advance(message=f"Clip {req.shot_id} reused")
+                continue
+            if not self._acquire_slot(budget, abort):
+                print("Aborting remaining submissions after a failed clip.")
+                break
+            try:
+                task_id = self._submit_or_resume(req, tasks, tasks_path)
+            except Exception as e:
+                budget.release()
+                print(f"FAILED to submit clip {req.shot_id}: {e}")
+                errors.append(e)
+                break
+            # No thread waits on the job: the shared poller resolves it and the
+            # clip is stored from the download callback
+            future = Future()
+            self.client.collect_clip_async(task_id, self._clip_path(req)).add_done_callback(
+                lambda job, req=req, task_id=task_id, future=future, cache_key=cache_key: self._settle_clip(
+                    job, future, req, task_id, tasks, tasks_path, url_map, url_map_path, cache_key
+                )
+            )
+            future.add_done_callback(on_done)
+            futures[future] = index
+
+        # Completions are collected as they finish; in-flight jobs always land
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+                self.progress.advance(message=f"Clip {requests[futures[future]].shot_id} done")
+            except Exception as e:
+                errors.append(e)
+
+        if errors:
+            raise errors[0]
+
+        return [results[i] for i in sorted(results)]
+
+    @staticmethod
+    def _acquire_slot(budget: threading.BoundedSemaphore, abort: threading.Event) -> bool:
+        """Blocks until a job slot is free. Returns False if a job failed meanwhile."""
+        while not budget.acquire(timeout=1.0):
+            if abort.is_set():
+                return False
+        if abort.is_set():
+            budget.release()
+            return False
+        return True
+
+    def _submit_or_resume(self, req: VeoRequest, tasks: Dict[str, Dict], tasks_path: str) -> str:
+        record = tasks.get(req.shot_id)
+        if record and record.get("status") == "submitted" and record.get("request_id") == req.request_id:
+            print(f"Resuming Veo task {record['task_id']} for {req.shot_id}")
+            return record["task_id"]
+
+        # Rate budget: space task creations
+        if self._last_submit is not None:
+            wait_s = self.submit_interval_s - (time.monotonic() - self._last_submit)
+            if wait_s > 0:
+                time.sleep(wait_s)
+        self._last_submit = time.monotonic()
+
+        print(f"Submitting Real Clip: {req.shot_id}.mp4")
+        task_id = self.client.submit_clip(req)
+        self._record_task(tasks, tasks_path, req, task_id, "submitted")
+        return task_id
+
+    def _settle_clip(self, job: Future, future: Future, req: VeoRequest, task_id: str, tasks: Dict[str, Dict], tasks_path: str, url_map: Dict[str, str], url_map_path: str,
+                     cache_key: Optional[str] = None):
+        """Done-callback of a collect job: stores the clip and records the task outcome."""
+        try:
+            download, video_url = job.result()
+            filename = self._store_clip(req, video_url, url_map, url_map_path, cache_key, download)
+        except BaseException as e:
+            print(f"FAILED to generate clip {req.shot_id} (task {task_id}): {e}")
+            self._record_task(tasks, tasks_path, req, task_id, "failed")
+            future.set_exception(e)
+            return
+        self._record_task(tasks, tasks_path, req, task_id, "done")
+        future.set_result(filename)
+
+    def _record_task(self, tasks: Dict[str, Dict], tasks_path: str, req: VeoRequest, task_id: str, status: str):
+        with self._state_lock:
+            tasks[req.shot_id] = {
+                "task_id": task_id,
+                "request_id": req.request_id,
+                "status": status,
+                "updated_at": datetime.utcnow().isoformat() + "Z"
+            }
+            _write_json_map(tasks_path, tasks)
+
+    def _attach_image_urls(self, req: VeoRequest, url_map: Dict[str, str]):
+        # Resolve Image Paths/URLs to pass to Client
+        start_filename = f"{req.shot_id}_start_ref.png"
+        end_filename = f"{req.shot_id}_end_ref.png"
+        
+        if start_filename in url_map:
+            req.image_ref_start = url_map[start_filename]
+            print(f"Attached Start Image (URL): {req.image_ref_start}")
+        
+        if end_filename in url_map:
+            req.image_ref_end = url_map[end_filename]
+            print(f"Attached End Image (URL): {req.image_ref_end}")
+        
+        if not req.image_ref_start and not req.image_ref_end:
+            print(f"WARNING: No image URLs found for {req.shot_id}. Video will be text-only.")
+
+    def _clip_path(self, req: VeoRequest) -> str:
+        return os.path.join(self.assets_dir, f"{req.shot_id}.mp4")
+
+    def _clip_cache_key(self, req: VeoRequest) -> Optional[str]:
+        """Key over everything Veo renders from; reference frames count by content, not URL."""
+        if not self.cache:
+            return None
+        start_image = init_image_fingerprint(os.path.join(self.assets_dir, f"{req.shot_id}_start_ref.png"), req.image_ref_start)
+        end_image = init_image_fingerprint(os.path.join(self.assets_dir, f"{req.shot_id}_end_ref.png"), req.image_ref_end)
+        config = {
+            "model": self.client.model_id,
+            "seed": req.seeds,
+            "aspect_ratio": req.aspect_ratio,
+            "duration_s": req.duration_s,
+            "fps": req.fps,
+            "negative_profile_id": req.negative_profile_id,
+            "end_image": end_image,
+        }
+        if self.client.mock_mode:
+            config["mock"] = True
+        return CacheManager.compute_video_key(start_image, req.prompt, config)
+
+    def _reuse_cached_clip(self, req: VeoRequest, cache_key: Optional[str], url_map: Dict[str, str], url_map_path: str) -> Optional[str]:
+        """Places a previous render of the same inputs at the clip path. Returns the filename on a hit."""
+        if not cache_key:
+            return None
+        cached = self.cache.lookup(cache_key)
+        if not cached:
+            return None
+        clip_path = self._clip_path(req)
+        self.cache.materialize(cached, clip_path)
+        self.cache.store(cache_key, req.shot_id, "CLIP", clip_path, url=cached.get("url"),
+                         meta={"cache_hit": cached["asset_id"], "request_id": req.request_id})
+        print(f"Cache hit for {req.shot_id}.mp4 (asset {cached['asset_id']})")
+        return self._store_clip(req, cached.get("url"), url_map, url_map_path)
+
+    def _store_clip(self, req: VeoRequest, video_url: Optional[str], url_map: Dict[str, str], url_map_path: str,
+                    cache_key: Optional[str] = None, download=None) -> str:
+        """The clip is already on disk (streamed by the client); records its URL and cache entry."""
+        filename = f"{req.shot_id}.mp4"
+
+        if video_url:
+            with self._state_lock:
+                url_map[filename] = video_url
+                _write_json_map(url_map_path, url_map)
+            print(f"Captured Video URL: {video_url}")
+        if cache_key and download is not None:
+            self.cache.store(cache_key, req.shot_id, "CLIP", self._clip_path(req), url=video_url,
+                             meta={"sha256": download.sha256, "size_bytes": download.size_bytes, "request_id": req.request_id})
+        return filename
 
     def _generate_placeholders(self, requests: List[VeoRequest]) -> List[str]:
         generated_files = []
@@ -187,9 +466,9 @@ class ClipGenerator:
         for req in requests:
             filename = f"{req.shot_id}.mp4"
             filepath = os.path.join(self.assets_dir, filename)
-            
-            with open(filepath, 'wb') as f:
-                 f.write(b'\x00\x00\x00\x20ftypmp42\x00\x00\x00\x00mp42mp41\x00\x00\x00\x00')
+
+            # Replaced, never written in place: the old clip may be a hardlink to a read-only blob
+            write_atomic(filepath, b'\x00\x00\x00\x20ftypmp42\x00\x00\x00\x00mp42mp41\x00\x00\x00\x00')
             
             generated_files.append(filename)
             print(f"Generated Clip: {filename}")
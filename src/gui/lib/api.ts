@@ -46,9 +46,17 @@ export interface Asset {
 
 export const api = {
     async getRuns(): Promise<Run[]> {
-        const response = await fetch(`${API_BASE}/runs`);
-        if (!response.ok) throw new Error('Failed to fetch runs');
-        return response.json();
+        // Paginated endpoint: follow X-Next-Cursor until the last page
+        const runs: Run[] = [];
+        let cursor: string | null = null;
+        do {
+            const query: string = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+            const response: Response = await fetch(`${API_BASE}/runs${query}`);
+            if (!response.ok) throw new Error('Failed to fetch runs');
+            runs.push(...(await response.json()));
+            cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor);
+        return runs;
     },
 
     async getRunStatus(runId: string, version: number = 1): Promise<Run['status']> {
@@ -9,12 +9,16 @@ from .client import (
     LLMTimeoutError,
     LLMRateLimitError,
     LLMProviderError,
+    LLMTransientError,
     LLMInvalidSchemaError,
     LLMJsonParseError,
     LLMJsonSchemaViolationError
 )
 from .openai_client import OpenAIClient
 from .mock_client import MockLLMClient, MissingFixtureError
+from .cache import CachingLLMClient, LLMResponseCache
+from .concurrency import generate_many, agenerate_many
+from .rate_limit import RateGovernor, get_rate_governor
 from .factory import build_llm_client, build_llm_client_from_config
 
 __all__ = [
@@ -33,6 +37,7 @@ __all__ = [
     "LLMTimeoutError",
     "LLMRateLimitError",
     "LLMProviderError",
+    "LLMTransientError",
     "LLMInvalidSchemaError",
     "LLMJsonParseError",
     "LLMJsonSchemaViolationError",
@@ -41,8 +46,18 @@ __all__ = [
     # Implementations
     "OpenAIClient",
     "MockLLMClient",
+    "CachingLLMClient",
+    "LLMResponseCache",
     
     # Factory
     "build_llm_client",
-    "build_llm_client_from_config"
+    "build_llm_client_from_config",
+    
+    # Concurrency
+    "generate_many",
+    "agenerate_many",
+    
+    # Rate limiting
+    "RateGovernor",
+    "get_rate_governor"
 ]
@@ -0,0 +1,236 @@
+"""
+Persistent LLM response cache (decorator over any LLMClient)
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from dataclasses import asdict
+from typing import Optional, Iterable
+
+from .client import LLMClient
+from ..foundation.paths import project_path
+from .models import LLMRequest, LLMJsonRequest, LLMResponse, LLMUsage
+
+logger = logging.getLogger(__name__)
+
+# Relative to the project root (see project_path), like pipeline.db and the blob store
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm_responses.db")
+DEFAULT_TTL_S = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def compute_cache_key(req: LLMRequest, kind: str) -> str:
+    """
+    Stable hash of everything that shapes the completion.
+    Same approach as MockLLMClient (model + messages + schema, sorted-key JSON),
+    plus the sampling parameters; tracing metadata (run_id, step_name...) is
+    excluded so identical prompts hit across runs.
+    """
+    hash_data = {
+        "kind": kind,
+        "model": req.model,
+        "messages": [{"role": m.role, "content": m.content} for m in req.messages],
+        "temperature": req.temperature,
+        "max_tokens": req.max_tokens,
+        "top_p": req.top_p,
+        "seed": req.seed,
+    }
+    if isinstance(req, LLMJsonRequest) and req.json_schema:
+        hash_data["json_schema"] = req.json_schema
+
+    hash_str = json.dumps(hash_data, sort_keys=True)
+    return hashlib.sha256(hash_str.encode()).hexdigest()
+
+class LLMResponseCache:
+    """
+    SQLite store of LLM responses with TTL expiry and size-based LRU eviction.
+    Safe to share across threads (one connection per thread, WAL).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_s: Optional[float] = None,
+        max_bytes: Optional[int] = None
+    ):
+        self.path = project_path(path or os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.ttl_s = ttl_s if ttl_s is not None else float(os.getenv("LLM_CACHE_TTL_S", DEFAULT_TTL_S))
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            float(os.getenv("LLM_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024
+        )
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,      -- JSON-encoded LLMResponse (without raw)
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    step_name TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_lru ON llm_responses(last_accessed)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, cache_key: str) -> Optional[LLMResponse]:
+        """Cached response, or None if missing/expired. Refreshes the LRU timestamp on hit."""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT response, created_at FROM llm_responses WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if self.ttl_s and now - row[1] > self.ttl_s:
+            with conn:
+                conn.execute("DELETE FROM llm_responses WHERE cache_key = ?", (cache_key,))
+            return None
+
+        with conn:
+            conn.execute("UPDATE llm_responses SET last_accessed = ? WHERE cache_key = ?", (now, cache_key))
+
+        data = json.loads(row[0])
+        usage = data.pop("usage", None)
+        return LLMResponse(**data, usage=LLMUsage(**usage) if usage else None)
+
+    def put(self, cache_key: str, response: LLMResponse, step_name: Optional[str] = None):
+        data = asdict(response)
+        data.pop("raw", None)  # provider payloads are large and not needed to replay
+        payload = json.dumps(data)
+        now = time.time()
+
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(cache_key, response, size_bytes, created_at, last_accessed, step_name) VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key, payload, len(payload), now, now, step_name)
+            )
+        self.evict()
+
+    def delete(self, cache_key: str):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM llm_responses WHERE cache_key = ?", (cache_key,))
+
+    def evict(self):
+        """Drops expired entries, then least recently used ones until under max_bytes."""
+        conn = self._connect()
+        with conn:
+            if self.ttl_s:
+                conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_s,))
+
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM llm_responses").fetchone()[0]
+            if not self.max_bytes or total <= self.max_bytes:
+                return
+
+            # Evict down to 90% so we don't churn on every put
+            target = int(self.max_bytes * 0.9)
+            doomed = []
+            for cache_key, size_bytes in conn.execute(
+                "SELECT cache_key, size_bytes FROM llm_responses ORDER BY last_accessed ASC"
+            ):
+                if total <= target:
+                    break
+                doomed.append((cache_key,))
+                total -= size_bytes
+            conn.executemany("DELETE FROM llm_responses WHERE cache_key = ?", doomed)
+            logger.info(f"LLM cache evicted {len(doomed)} entries (LRU)")
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM llm_responses")
+
+class CachingLLMClient(LLMClient):
+    """
+    LLMClient decorator that answers byte-identical requests from a persistent cache.
+    Only generate_json responses are stored by default: they are already
+    schema-validated by the inner client, so a malformed completion is never
+    replayed. Free text can't be checked here; it is cached only when the
+    request opts in with tags={"cache": "on"}. A caller that still rejects a
+    response must call invalidate(req) so the next attempt hits the provider.
+
+    Opt-out:
+      - per step: pass its name in `skip_steps` (or LLM_CACHE_SKIP_STEPS=STEP_A,STEP_B)
+      - per request: tags={"cache": "off"}
+    """
+
+    def __init__(self, inner: LLMClient, cache: Optional[LLMResponseCache] = None, skip_steps: Optional[Iterable[str]] = None):
+        self.inner = inner
+        self.cache = cache or LLMResponseCache()
+        if skip_steps is None:
+            skip_steps = [s.strip() for s in os.getenv("LLM_CACHE_SKIP_STEPS", "").split(",") if s.strip()]
+        self.skip_steps = set(skip_steps)
+
+    def _enabled_for(self, req: LLMRequest, kind: str) -> bool:
+        if req.step_name and req.step_name in self.skip_steps:
+            return False
+        mode = (req.tags or {}).get("cache")
+        if kind == "text":
+            return mode == "on"
+        return mode != "off"
+
+    def invalidate(self, req: LLMRequest):
+        kind = "json" if isinstance(req, LLMJsonRequest) else "text"
+        self.cache.delete(compute_cache_key(req, kind))
+
+    def _cached_call(self, req: LLMRequest, kind: str, call) -> LLMResponse:
+        if not self._enabled_for(req, kind):
+            return call(req)
+
+        cache_key = compute_cache_key(req, kind)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"LLM cache hit | run_id={req.run_id} step={req.step_name} beat={req.beat_id} key={cache_key[:12]}")
+            cached.latency_ms = 0
+            return cached
+
+        response = call(req)
+        self.cache.put(cache_key, response, step_name=req.step_name)
+        return response
+
+    async def _acached_call(self, req: LLMRequest, kind: str, acall) -> LLMResponse:
+        # SQLite lookups are sub-millisecond; only the provider call is awaited
+        if not self._enabled_for(req, kind):
+            return await acall(req)
+
+        cache_key = compute_cache_key(req, kind)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"LLM cache hit | run_id={req.run_id} step={req.step_name} beat={req.beat_id} key={cache_key[:12]}")
+            cached.latency_ms = 0
+            return cached
+
+        response = await acall(req)
+        self.cache.put(cache_key, response, step_name=req.step_name)
+        return response
+
+    def generate_text(self, req: LLMRequest) -> LLMResponse:
+        return self._cached_call(req, "text", self.inner.generate_text)
+
+    def generate_json(self, req: LLMJsonRequest) -> LLMResponse:
+        return self._cached_call(req, "json", self.inner.generate_json)
+
+    async def agenerate_text(self, req: LLMRequest) -> LLMResponse:
+        return await self._acached_call(req, "text", self.inner.agenerate_text)
+
+    async def agenerate_json(self, req: LLMJsonRequest) -> LLMResponse:
+        return await self._acached_call(req, "json", self.inner.agenerate_json)
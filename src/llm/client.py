@@ -1,6 +1,7 @@
 """
 T-102: LLM Client base interface and exceptions
 """
+import asyncio
 from abc import ABC, abstractmethod
 from .models import LLMRequest, LLMJsonRequest, LLMResponse
 
@@ -22,6 +23,10 @@ class LLMProviderError(LLMError):
     """Provider returned an error"""
     pass
 
+class LLMTransientError(LLMProviderError):
+    """Provider failure worth retrying (5xx, dropped connection)"""
+    pass
+
 class LLMInvalidSchemaError(LLMError):
     """JSON schema is invalid or missing"""
     pass
@@ -76,3 +81,22 @@ class LLMClient(ABC):
             Other LLMError subclasses on provider/network failures
         """
         ...
+    
+    # --- Async interface ---
+    # Default: run the sync call in a worker thread so every client can be
+    # awaited. Providers with a native async SDK override these.
+    
+    async def agenerate_text(self, req: LLMRequest) -> LLMResponse:
+        """Async generate_text (same contract)."""
+        return await asyncio.to_thread(self.generate_text, req)
+    
+    async def agenerate_json(self, req: LLMJsonRequest) -> LLMResponse:
+        """Async generate_json (same contract)."""
+        return await asyncio.to_thread(self.generate_json, req)
+
+    def invalidate(self, req: LLMRequest) -> None:
+        """
+        Called when the caller rejects a response (e.g. it fails the agent's own
+        parsing), so a cached copy isn't replayed. No-op for uncached clients.
+        """
+        pass
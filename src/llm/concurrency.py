@@ -0,0 +1,56 @@
+"""
+Bounded-concurrency fan-out over the async LLMClient interface
+"""
+import asyncio
+import logging
+from typing import Callable, List, Optional, Sequence
+
+from .client import LLMClient, LLMError
+from .models import LLMRequest, LLMJsonRequest, LLMResponse
+
+logger = logging.getLogger(__name__)
+
+async def agenerate_many(client: LLMClient, requests: Sequence[LLMRequest], max_concurrency: int = 4,
+                         on_done: Optional[Callable[[int], None]] = None) -> List[LLMResponse]:
+    """
+    Runs every request with at most `max_concurrency` in flight.
+    LLMJsonRequest goes through agenerate_json, anything else through agenerate_text.
+    Responses come back in request order. The first failure cancels the
+    requests still waiting for a slot and is re-raised.
+    `on_done(1)` is called as each request completes (e.g. ProgressReporter.advance).
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_one(req: LLMRequest) -> LLMResponse:
+        async with semaphore:
+            if isinstance(req, LLMJsonRequest):
+                response = await client.agenerate_json(req)
+            else:
+                response = await client.agenerate_text(req)
+        if on_done:
+            on_done(1)
+        return response
+
+    tasks = [asyncio.create_task(run_one(req)) for req in requests]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+def generate_many(client: LLMClient, requests: Sequence[LLMRequest], max_concurrency: int = 4,
+                  on_done: Optional[Callable[[int], None]] = None) -> List[LLMResponse]:
+    """
+    Synchronous entry point for agents: runs agenerate_many on a private event loop.
+    Inside async code, await agenerate_many() instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        if not requests:
+            return []
+        logger.info(f"LLM fan-out: {len(requests)} requests, up to {max_concurrency} in flight")
+        return asyncio.run(agenerate_many(client, requests, max_concurrency, on_done))
+    raise LLMError("generate_many() called from a running event loop; await agenerate_many() instead")
@@ -7,6 +7,7 @@ from typing import Dict, Any, Optional
 from .client import LLMClient, LLMError
 from .openai_client import OpenAIClient
 from .mock_client import MockLLMClient
+from .cache import CachingLLMClient, LLMResponseCache
 
 def build_llm_client(
     provider: str,
@@ -54,9 +55,14 @@ def build_llm_client_from_config(config_dict: Dict[str, Any]) -> LLMClient:
         "provider": "openai",
         "model": "gpt-4o-mini",
         "temperature": 0.2,
-        "max_tokens": 1200
+        "max_tokens": 1200,
+        "cache": true       # optional; false disables the response cache for this agent
     }
     
+    Real providers are wrapped in CachingLLMClient unless the agent sets
+    `cache: false` or LLM_CACHE=0, so re-runs with unchanged inputs don't
+    pay for the same completions again.
+    
     Args:
         config_dict: Agent settings from system rules
         
@@ -71,4 +77,9 @@ def build_llm_client_from_config(config_dict: Dict[str, Any]) -> LLMClient:
         "max_retries": config_dict.get("max_retries", 3)
     }
     
-    return build_llm_client(provider, settings)
+    client = build_llm_client(provider, settings)
+    
+    if provider != "mock" and config_dict.get("cache", True) and os.getenv("LLM_CACHE", "1") != "0":
+        client = CachingLLMClient(client, LLMResponseCache())
+    
+    return client
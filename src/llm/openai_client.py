@@ -5,10 +5,15 @@ import os
 import json
 import logging
 import time
+import asyncio
+import weakref
 from typing import Optional
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
-from openai import OpenAI, APIError, APITimeoutError, RateLimitError as OpenAIRateLimitError
+from openai import (
+    OpenAI, AsyncOpenAI, APIError, APIConnectionError, APIStatusError, APITimeoutError,
+    RateLimitError as OpenAIRateLimitError
+)
 
 from .client import (
     LLMClient,
@@ -16,14 +21,19 @@ from .client import (
     LLMTimeoutError,
     LLMRateLimitError,
     LLMProviderError,
+    LLMTransientError,
     LLMInvalidSchemaError,
     LLMJsonParseError,
     LLMJsonSchemaViolationError
 )
 from .models import LLMRequest, LLMJsonRequest, LLMResponse, LLMUsage, LLMMessage
+from .rate_limit import RateGovernor, get_rate_governor, estimate_tokens, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+# Rate limits, timeouts, 5xx and dropped connections; other provider errors are final
+RETRYABLE_ERRORS = (LLMRateLimitError, LLMTimeoutError, LLMTransientError)
+
 # --- JSON Schema Validation (T-102.3) ---
 
 try:
@@ -66,7 +76,8 @@ class OpenAIClient(LLMClient):
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
         default_timeout_s: float = 60.0,
-        max_retries: int = 3
+        max_retries: int = 3,
+        governor: Optional[RateGovernor] = None
     ):
         """
         Initialize OpenAI client.
@@ -76,6 +87,7 @@ class OpenAIClient(LLMClient):
             base_url: Custom base URL (optional)
             default_timeout_s: Default timeout for requests
             max_retries: Max retry attempts for rate limits/transient errors
+            governor: RPM/TPM admission control (defaults to the process-wide one)
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -84,20 +96,35 @@ class OpenAIClient(LLMClient):
         self.base_url = base_url or os.getenv("OPENAI_BASE_URL")
         self.default_timeout_s = default_timeout_s
         self.max_retries = max_retries
+        self.governor = governor or get_rate_governor()
         
         # Initialize OpenAI SDK client
         client_kwargs = {"api_key": self.api_key}
         if self.base_url:
             client_kwargs["base_url"] = self.base_url
         
+        self._client_kwargs = client_kwargs
         self.client = OpenAI(**client_kwargs)
+        # AsyncOpenAI keeps an httpx pool bound to the loop that used it: one per event loop
+        self._async_clients = weakref.WeakKeyDictionary()
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(**self._client_kwargs)
+            self._async_clients[loop] = client
+        return client
     
     def _build_messages(self, messages: list[LLMMessage]) -> list[dict]:
         """Convert LLMMessage to OpenAI format"""
         return [{"role": msg.role, "content": msg.content} for msg in messages]
     
     @retry(
-        retry=retry_if_exception_type((OpenAIRateLimitError, APIError)),
+        # SDK errors are translated before they leave the call, so retry on ours
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
         reraise=True
@@ -116,6 +143,50 @@ class OpenAIClient(LLMClient):
         Raises:
             LLMTimeoutError, LLMRateLimitError, LLMProviderError
         """
+        kwargs = self._build_kwargs(req, response_format)
+        lease = self.governor.acquire("openai", req.model, self._estimate_tokens(req))
+        
+        try:
+            start_time = time.time()
+            response = self.client.chat.completions.create(**kwargs)
+            latency_ms = int((time.time() - start_time) * 1000)
+        except Exception as e:
+            raise self._translate_error(e, req)
+        
+        lease.record(response.usage.total_tokens if response.usage else None)
+        self._log_call(req, response, latency_ms)
+        return {
+            "response": response,
+            "latency_ms": latency_ms
+        }
+    
+    @retry(
+        # SDK errors are translated before they leave the call, so retry on ours
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        reraise=True
+    )
+    async def _acall_openai(self, req: LLMRequest, response_format: Optional[dict] = None) -> dict:
+        """Async twin of _call_openai (AsyncOpenAI, same retries and error translation)."""
+        kwargs = self._build_kwargs(req, response_format)
+        lease = await self.governor.aacquire("openai", req.model, self._estimate_tokens(req))
+        
+        try:
+            start_time = time.time()
+            response = await self.async_client.chat.completions.create(**kwargs)
+            latency_ms = int((time.time() - start_time) * 1000)
+        except Exception as e:
+            raise self._translate_error(e, req)
+        
+        lease.record(response.usage.total_tokens if response.usage else None)
+        self._log_call(req, response, latency_ms)
+        return {
+            "response": response,
+            "latency_ms": latency_ms
+        }
+    
+    def _build_kwargs(self, req: LLMRequest, response_format: Optional[dict] = None) -> dict:
         messages = self._build_messages(req.messages)
         
         kwargs = {
@@ -132,39 +203,48 @@ class OpenAIClient(LLMClient):
             kwargs["seed"] = req.seed
         if response_format:
             kwargs["response_format"] = response_format
-        
-        try:
-            start_time = time.time()
-            response = self.client.chat.completions.create(**kwargs)
-            latency_ms = int((time.time() - start_time) * 1000)
-            
-            # Log trace info (T-102.5)
-            logger.info(
-                f"LLM Request | run_id={req.run_id} step={req.step_name} beat={req.beat_id} "
-                f"model={req.model} latency={latency_ms}ms tokens={response.usage.total_tokens if response.usage else 0}"
-            )
-            
-            return {
-                "response": response,
-                "latency_ms": latency_ms
-            }
-            
-        except APITimeoutError as e:
+        return kwargs
+    
+    @staticmethod
+    def _estimate_tokens(req: LLMRequest) -> int:
+        return estimate_tokens(sum(len(m.content) for m in req.messages), req.max_tokens)
+    
+    def _log_call(self, req: LLMRequest, response, latency_ms: int):
+        # Log trace info (T-102.5)
+        logger.info(
+            f"LLM Request | run_id={req.run_id} step={req.step_name} beat={req.beat_id} "
+            f"model={req.model} latency={latency_ms}ms tokens={response.usage.total_tokens if response.usage else 0}"
+        )
+    
+    def _translate_error(self, e: Exception, req: LLMRequest) -> LLMError:
+        """Maps SDK exceptions to typed LLM errors."""
+        if isinstance(e, APITimeoutError):
             logger.error(f"LLM Timeout: {e}")
-            raise LLMTimeoutError(f"Request timed out: {e}")
-        except OpenAIRateLimitError as e:
+            return LLMTimeoutError(f"Request timed out: {e}")
+        if isinstance(e, OpenAIRateLimitError):
             logger.warning(f"LLM Rate Limit: {e}")
-            raise LLMRateLimitError(f"Rate limit hit: {e}")
-        except APIError as e:
+            # Hold every caller of this model, not just the retry of this one
+            self.governor.penalize("openai", req.model, parse_retry_after(e.response.headers))
+            return LLMRateLimitError(f"Rate limit hit: {e}")
+        if isinstance(e, APIConnectionError) or (isinstance(e, APIStatusError) and e.status_code >= 500):
+            logger.warning(f"LLM Transient Provider Error: {e}")
+            return LLMTransientError(f"OpenAI API error: {e}")
+        if isinstance(e, APIError):
+            # 400/401/404...: the same request would fail again
             logger.error(f"LLM Provider Error: {e}")
-            raise LLMProviderError(f"OpenAI API error: {e}")
-        except Exception as e:
-            logger.error(f"LLM Unexpected Error: {e}")
-            raise LLMError(f"Unexpected error: {e}")
+            return LLMProviderError(f"OpenAI API error: {e}")
+        logger.error(f"LLM Unexpected Error: {e}")
+        return LLMError(f"Unexpected error: {e}")
     
     def generate_text(self, req: LLMRequest) -> LLMResponse:
         """Generate free-form text response"""
-        result = self._call_openai(req)
+        return self._text_response(self._call_openai(req))
+    
+    async def agenerate_text(self, req: LLMRequest) -> LLMResponse:
+        """Generate free-form text response (native async)"""
+        return self._text_response(await self._acall_openai(req))
+    
+    def _text_response(self, result: dict) -> LLMResponse:
         response = result["response"]
         choice = response.choices[0]
         
@@ -200,9 +280,19 @@ class OpenAIClient(LLMClient):
             raise LLMInvalidSchemaError("json_schema is required for generate_json")
         
         # Request JSON mode from OpenAI
-        response_format = {"type": "json_object"}
+        result = self._call_openai(req, response_format={"type": "json_object"})
+        return self._json_response(req, result)
+    
+    async def agenerate_json(self, req: LLMJsonRequest) -> LLMResponse:
+        """generate_json over AsyncOpenAI (same validation and errors)"""
+        if not req.json_schema:
+            raise LLMInvalidSchemaError("json_schema is required for generate_json")
         
-        result = self._call_openai(req, response_format=response_format)
+        result = await self._acall_openai(req, response_format={"type": "json_object"})
+        return self._json_response(req, result)
+    
+    def _json_response(self, req: LLMJsonRequest, result: dict) -> LLMResponse:
+        """Parses and schema-validates a JSON-mode completion."""
         response = result["response"]
         choice = response.choices[0]
         
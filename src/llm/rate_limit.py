@@ -0,0 +1,203 @@
+"""
+Process-wide rate governor for LLM providers (requests/min and tokens/min)
+"""
+import os
+import math
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple, Mapping
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RPM = 500
+DEFAULT_TPM = 200_000
+# Completion budget assumed when the caller doesn't cap max_tokens
+DEFAULT_COMPLETION_ESTIMATE = 1024
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(prompt_chars: int, max_tokens: Optional[int] = None) -> int:
+    """Worst-case tokens for a call: prompt (~4 chars/token) plus the full completion budget."""
+    return math.ceil(prompt_chars / CHARS_PER_TOKEN) + (max_tokens or DEFAULT_COMPLETION_ESTIMATE)
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Seconds to wait from a 429 response's headers.
+    Understands retry-after-ms (OpenAI), retry-after as seconds or as an HTTP date.
+    """
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """
+    Continuously refilling bucket: `capacity` units per minute.
+    The level may go negative when a call turns out bigger than estimated;
+    that debt is paid back before anyone else is admitted.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.rate_s = self.capacity / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate_s)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (0 if it is now)."""
+        self._refill(now)
+        # A single call bigger than the whole bucket waits for a full bucket instead of forever
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate_s
+
+    def take(self, amount: float):
+        self.level -= amount
+
+    def give(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+class RateLease:
+    """Capacity reserved for one call. Report actual usage with record() once known."""
+
+    def __init__(self, governor: "RateGovernor", key: Tuple[str, str], estimated_tokens: int):
+        self.governor = governor
+        self.key = key
+        self.estimated_tokens = estimated_tokens
+        self.recorded = False
+
+    def record(self, total_tokens: Optional[int]):
+        """Corrects the TPM bucket by the difference between estimate and real usage."""
+        if self.recorded or total_tokens is None:
+            return
+        self.recorded = True
+        self.governor._correct(self.key, self.estimated_tokens - total_tokens)
+
+class _Limiter:
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.blocked_until = 0.0
+
+class RateGovernor:
+    """
+    Admission control for LLM calls, keyed by (provider, model).
+    Callers acquire capacity before sending; a 429 with Retry-After pauses
+    every caller of that key until the provider says to come back.
+
+    Limits: LLM_RPM / LLM_TPM apply to every key (0 disables one);
+    configure() overrides them per provider/model.
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.default_rpm = rpm if rpm is not None else int(os.getenv("LLM_RPM", DEFAULT_RPM))
+        self.default_tpm = tpm if tpm is not None else int(os.getenv("LLM_TPM", DEFAULT_TPM))
+        self._overrides: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._limiters: Dict[Tuple[str, str], _Limiter] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, provider: str, model: str, rpm: int, tpm: int):
+        with self._lock:
+            self._overrides[(provider, model)] = (rpm, tpm)
+            self._limiters.pop((provider, model), None)
+
+    def _limiter(self, key: Tuple[str, str]) -> _Limiter:
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            rpm, tpm = self._overrides.get(key, (self.default_rpm, self.default_tpm))
+            limiter = self._limiters[key] = _Limiter(rpm, tpm)
+        return limiter
+
+    def _try_acquire(self, key: Tuple[str, str], tokens: int) -> float:
+        """Takes capacity and returns 0, or returns how long to wait before trying again."""
+        with self._lock:
+            limiter = self._limiter(key)
+            now = time.monotonic()
+            wait = max(0.0, limiter.blocked_until - now)
+            if limiter.requests:
+                wait = max(wait, limiter.requests.wait_time(1, now))
+            if limiter.tokens:
+                wait = max(wait, limiter.tokens.wait_time(tokens, now))
+            if wait > 0:
+                return wait
+            if limiter.requests:
+                limiter.requests.take(1)
+            if limiter.tokens:
+                limiter.tokens.take(tokens)
+            return 0.0
+
+    def acquire(self, provider: str, model: str, estimated_tokens: int) -> RateLease:
+        """Blocks until the call fits within the key's RPM/TPM budget."""
+        key = (provider, model)
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(key, estimated_tokens)
+            if wait <= 0:
+                break
+            waited += wait
+            time.sleep(wait)
+        if waited >= 1:
+            logger.info(f"Rate governor held {provider}/{model} call for {waited:.1f}s")
+        return RateLease(self, key, estimated_tokens)
+
+    async def aacquire(self, provider: str, model: str, estimated_tokens: int) -> RateLease:
+        """acquire() for async callers (sleeps without blocking the event loop)."""
+        key = (provider, model)
+        while True:
+            wait = self._try_acquire(key, estimated_tokens)
+            if wait <= 0:
+                return RateLease(self, key, estimated_tokens)
+            await asyncio.sleep(wait)
+
+    def penalize(self, provider: str, model: str, retry_after_s: Optional[float]):
+        """Pauses the key after a 429 for `retry_after_s` (no-op without a header value)."""
+        if not retry_after_s or retry_after_s <= 0:
+            return
+        with self._lock:
+            limiter = self._limiter((provider, model))
+            limiter.blocked_until = max(limiter.blocked_until, time.monotonic() + retry_after_s)
+        logger.warning(f"Rate limited by {provider}/{model}: pausing calls for {retry_after_s:.1f}s")
+
+    def _correct(self, key: Tuple[str, str], surplus_tokens: int):
+        with self._lock:
+            limiter = self._limiter(key)
+            if not limiter.tokens:
+                return
+            if surplus_tokens >= 0:
+                limiter.tokens.give(surplus_tokens)
+            else:
+                limiter.tokens.take(-surplus_tokens)
+
+_governor: Optional[RateGovernor] = None
+_governor_lock = threading.Lock()
+
+def get_rate_governor() -> RateGovernor:
+    """Process-wide governor shared by every LLM client, so parallel stages share one budget."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = RateGovernor()
+        return _governor
@@ -1,7 +1,6 @@
 import os
 import sys
 import uuid
-import shutil
 import subprocess
 import json
 import logging
@@ -13,6 +12,9 @@ logger = logging.getLogger(__name__)
 from src.foundation.config_loader import AppConfig
 from src.foundation.validators import validate_input_files
 from src.foundation.hashing import hash_file_sha256
+from src.foundation.blob_store import get_blob_store
+from src.foundation.ingest import ingest_files
+from src.foundation.media_probe import probe_audio_duration
 from src.foundation.manifest import (
     RunManifest, 
     ManifestApp,
@@ -30,6 +32,7 @@ from src.foundation.manifest import (
     validate_consistency
 )
 from src.database_manager import DatabaseManager
+from src.foundation.progress import ProgressReporter
 from src.planning.models import BeatSheetRow, ClipPlanRow
 
 # Order of execution
@@ -90,14 +93,14 @@ class RunOrchestrator:
         report = validate_input_files(script_path, audio_path, bible_path)
         is_valid = report["passed"]
         
-        # 2. Hash Inputs (Required for ID generation)
-        script_hash = "00000000"
-        audio_hash = "00000000"
-        bible_hash = "00000000"
+        # 2. Ingest Inputs (Required for ID generation)
+        # Single read per file: SHA256, copy into the blob store, size and header sniff
+        blob_store = get_blob_store(self.config.paths.blob_store_root)
+        ingested = ingest_files({"script": script_path, "audio": audio_path, "style_bible": bible_path}, blob_store)
         
-        if os.path.exists(script_path): script_hash = hash_file_sha256(script_path)
-        if os.path.exists(audio_path): audio_hash = hash_file_sha256(audio_path)
-        if os.path.exists(bible_path): bible_hash = hash_file_sha256(bible_path)
+        script_hash = ingested["script"].sha256 if ingested["script"] else "00000000"
+        audio_hash = ingested["audio"].sha256 if ingested["audio"] else "00000000"
+        bible_hash = ingested["style_bible"].sha256 if ingested["style_bible"] else "00000000"
         
         # 3. Generate Deterministic RUN ID
         combined_hash = hash_file_sha256(None, data=(script_hash + audio_hash + bible_hash).encode('utf-8'))
@@ -156,14 +159,11 @@ class RunOrchestrator:
             logger.warning(f"System Rules not found at {system_rules_source}, skipping config freeze.")
             config_meta = None
         else:
-            shutil.copy(shot_menu_source, shot_menu_dest)
-            shutil.copy(system_rules_source, system_rules_dest)
-            
-            # Hash frozen configs (hash_file_sha256 already imported at top)
+            # Frozen via the blob store: hashed while stored, hardlinked into the run
             from src.config.loader import load_shot_menu
             
-            shot_menu_hash = hash_file_sha256(shot_menu_dest)
-            system_rules_hash = hash_file_sha256(system_rules_dest)
+            shot_menu_hash = blob_store.ingest(shot_menu_source, shot_menu_dest)
+            system_rules_hash = blob_store.ingest(system_rules_source, system_rules_dest)
             
             # Load to extract menu_id
             try:
@@ -184,25 +184,22 @@ class RunOrchestrator:
             )
 
         # 5. Populate Manifest Data (Metadata Extraction)
-        # We need size, duration, locked status
-        script_size = os.path.getsize(script_path) if os.path.exists(script_path) else 0
-        audio_size = os.path.getsize(audio_path) if os.path.exists(audio_path) else 0
-        bible_size = os.path.getsize(bible_path) if os.path.exists(bible_path) else 0
+        # We need size, duration, locked status (all captured during ingest)
+        script_size = ingested["script"].size_bytes if ingested["script"] else 0
+        audio_size = ingested["audio"].size_bytes if ingested["audio"] else 0
+        bible_size = ingested["style_bible"].size_bytes if ingested["style_bible"] else 0
         
-        # Audio Duration
+        # Audio Duration: WAV header sniffed during ingest; otherwise the cached probe from preflight
         audio_duration = 0.0
-        if os.path.exists(audio_path):
-            try:
-                from mutagen.mp3 import MP3
-                audio = MP3(audio_path)
-                audio_duration = audio.info.length
-            except: pass
+        if ingested["audio"]:
+            audio_duration = ingested["audio"].wav_duration_s or 0.0
+            if not audio_duration:
+                try:
+                    audio_duration = probe_audio_duration(audio_path)
+                except: pass
             
         # Bible Locked
-        bible_locked = False
-        if os.path.exists(bible_path):
-             with open(bible_path, 'r', encoding='utf-8') as f:
-                  if "LOCKED" in f.read(4096): bible_locked = True
+        bible_locked = bool(ingested["style_bible"] and ingested["style_bible"].locked)
 
         # Frozen paths
         frozen_paths = {
@@ -287,10 +284,11 @@ class RunOrchestrator:
             logger.error(f"Report written to {report_path}")
             return
 
-        # 6. Copy Inputs (Frozen Paths)
-        shutil.copy(script_path, frozen_paths["script"])
-        shutil.copy(audio_path, frozen_paths["audio"])
-        shutil.copy(bible_path, frozen_paths["style_bible"])
+        # 6. Freeze Inputs: link the blobs stored during ingest into the run (no second read).
+        # Re-runs of the same video share the bytes instead of copying them again.
+        blob_store.link(script_hash, frozen_paths["script"])
+        blob_store.link(audio_hash, frozen_paths["audio"])
+        blob_store.link(bible_hash, frozen_paths["style_bible"])
         
         # Write Checkpoint for INGEST (Preflight Done)
         write_phase_checkpoint(self.run_id, Phase.INGEST.value, self.config.paths.artifacts_root, report)
@@ -402,10 +400,12 @@ class RunOrchestrator:
         from src.foundation.step_runner import StepContext
         from src.steps.definitions import IngestStep, PlanningStep, PromptsStep, PlaceholderStep
         
+        # Stages report progress per item; the reporter coalesces the run_status writes
+        progress = ProgressReporter.for_run(self.db_manager, self.run_id, 1)
         context = StepContext(
             run_id=self.run_id,
             run_dir=self.run_dir,
-            services={"db": self.db_manager},
+            services={"db": self.db_manager, "progress": progress},
             artifacts_root=self.config.paths.artifacts_root
         )
         
@@ -442,6 +442,8 @@ class RunOrchestrator:
                     break
             write_run_manifest(self.run_id, self.manifest, self.config.paths.artifacts_root)
             raise e
+        finally:
+            progress.close()
 
     def _mark_phase_complete(self, phase: Phase):
         # 1. Write Checkpoint (Legacy compatibility if needed, keeping it for robustness)
@@ -537,6 +539,7 @@ class RunOrchestrator:
     def _sync_planning_to_db(self, beats, clip_plans, align_stats):
         logger.info("Syncing Planning to DB...")
         beat_map = {b.beat_id: b for b in beats}
+        shot_specs = []
         for clip in clip_plans:
             beat = beat_map.get(clip.beat_id)
             if beat:
@@ -556,31 +559,34 @@ class RunOrchestrator:
                     "beat_end_s": timing['end'],
                     "alignment_source": align_stats.source
                 }
-                self.db_manager.register_shot(shot_spec)
+                shot_specs.append(shot_spec)
+        self.db_manager.register_shots_bulk(shot_specs)
         self.db_manager.update_run_status(self.run_id, 1, "PLANNING", "done")
 
     def _sync_prompts_to_db(self, prompts, prompts_path):
         logger.info("Syncing Prompts to DB...")
+        assets = []
         for p in prompts:
             shot_id = f"{self.run_id}_{p.beat_id}"
             # Register Init Prompt (Role: image_prompt)
-            self.db_manager.register_asset(
+            assets.append(dict(
                 shot_id=shot_id,
                 asset_type="PROMPT",
                 role="image_prompt",
                 path=prompts_path,
                 url=None,
                 meta={"text": p.prompt_init_frame, "sanitized": p.sanitizer_report.rewrites_applied}
-            )
+            ))
             # Register Clip Prompt (Role: video_prompt)
-            self.db_manager.register_asset(
+            assets.append(dict(
                 shot_id=shot_id,
                 asset_type="PROMPT",
                 role="video_prompt",
                 path=prompts_path,
                 url=None,
                 meta={"text": p.prompt_clip, "sanitized": p.sanitizer_report.rewrites_applied}
-            )
+            ))
+        self.db_manager.register_assets_bulk(assets)
         self.db_manager.update_run_status(self.run_id, 1, "PROMPTS", "done")
 
 # Legacy Pipeline wrapper is removed as per cleanup logic, 
@@ -1,4 +1,6 @@
+import os
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import List, Optional, Callable, Dict, Any
 
@@ -63,3 +65,24 @@ class QARulesEngine:
              return QAResult(QAStatus.WARNING, f"Warnings: {'; '.join(warnings)}")
              
         return QAResult(QAStatus.PASS, "All checks passed")
+
+    def validate_clips(self, clip_paths: List[str], max_workers: Optional[int] = None) -> Dict[str, QAResult]:
+        """
+        Runs validate_clip over many clips concurrently.
+        The validators mostly wait on ffprobe/ffmpeg subprocesses, so a thread
+        pool is enough. Returns {clip_path: QAResult} in input order; a validator
+        that raises yields a FAIL for that clip instead of aborting the batch.
+        """
+        unique = list(dict.fromkeys(clip_paths))
+        if not unique:
+            return {}
+        max_workers = max_workers or int(os.environ.get("QA_WORKERS", "0")) or min(8, os.cpu_count() or 1)
+
+        def safe_validate(clip_path: str) -> QAResult:
+            try:
+                return self.validate_clip(clip_path)
+            except Exception as e:
+                return QAResult(QAStatus.FAIL, f"Validator error: {e}", retry_suggested=True)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique)), thread_name_prefix="qa") as executor:
+            return dict(zip(unique, executor.map(safe_validate, unique)))
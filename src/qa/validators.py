@@ -1,5 +1,25 @@
 import os
+import re
+import shutil
+import threading
+import subprocess
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
 from .engine import QAStatus, QAResult
+from ..foundation.media_probe import get_media_probe, MediaInfo, MediaProbeError, FFprobeNotFound
+
+# Veo renders fixed-length clips
+EXPECTED_CLIP_DURATION_S = 8.0
+CLIP_DURATION_TOLERANCE_S = 1.0
+# Veo output: 720p @ 24fps
+EXPECTED_CLIP_FPS = 24.0
+EXPECTED_CLIP_RESOLUTIONS = ((1280, 720), (720, 1280), (1920, 1080), (1080, 1920))
+
+# blackdetect / freezedetect thresholds
+BLACK_MIN_DURATION_S = 0.5
+BLACK_PIXEL_THRESHOLD = 0.10
+FREEZE_MIN_DURATION_S = 2.0
+FREEZE_NOISE_DB = -60
 
 def validate_image_file(path: str) -> QAResult:
     """
@@ -20,18 +40,213 @@ def validate_image_file(path: str) -> QAResult:
 def validate_clip_duration(path: str) -> QAResult:
     """
     Checks if clip exists and has acceptable duration (approx 8s).
-    NOTE: Requires ffprobe or moviepy. For MVP we check file existence/extension only
-    mocking the duration check to avoid heavy dependencies on this iteration.
+    Duration comes from the shared MediaProbe (ffprobe, cached per file version).
+    Without ffprobe on the machine it degrades to the old size heuristic.
     """
     if not os.path.exists(path):
         return QAResult(QAStatus.FAIL, f"Clip file not found: {path}", retry_suggested=True)
 
     if not path.endswith('.mp4'):
         return QAResult(QAStatus.FAIL, "Clip must be MP4", retry_suggested=True)
-        
-    # TODO: Implement actual `ffprobe` duration check here.
-    # For now, we assume if it exists and is > 100KB, it's likely okay.
-    if os.path.getsize(path) < 100 * 1024: # < 100KB
-        return QAResult(QAStatus.FAIL, "Clip file too small (<100KB)", retry_suggested=True)
 
-    return QAResult(QAStatus.PASS, "Clip check passed (Mock Duration)")
+    try:
+        info = get_media_probe().probe(path)
+    except FFprobeNotFound:
+        # Assume if it exists and is > 100KB, it's likely okay.
+        if os.path.getsize(path) < 100 * 1024: # < 100KB
+            return QAResult(QAStatus.FAIL, "Clip file too small (<100KB)", retry_suggested=True)
+        return QAResult(QAStatus.PASS, "Clip check passed (Mock Duration: ffprobe unavailable)")
+    except MediaProbeError as e:
+        return QAResult(QAStatus.FAIL, f"Clip is not readable: {e}", retry_suggested=True)
+
+    details = {"duration_s": info.duration_s, "width": info.width, "height": info.height, "fps": info.fps}
+    if info.video is None:
+        return QAResult(QAStatus.FAIL, "Clip has no video stream", retry_suggested=True, details=details)
+
+    if abs(info.duration_s - EXPECTED_CLIP_DURATION_S) > CLIP_DURATION_TOLERANCE_S:
+        return QAResult(
+            QAStatus.FAIL,
+            f"Clip duration {info.duration_s:.2f}s outside {EXPECTED_CLIP_DURATION_S}s ± {CLIP_DURATION_TOLERANCE_S}s",
+            retry_suggested=True,
+            details=details
+        )
+
+    return QAResult(QAStatus.PASS, f"Clip check passed ({info.duration_s:.2f}s)", details=details)
+
+def _probe_clip(path: str) -> Tuple[Optional[MediaInfo], Optional[QAResult]]:
+    """
+    (MediaInfo, None) or (None, result) when the clip can't be probed.
+    The result is a skip (PASS) when ffprobe is unavailable, a FAIL otherwise.
+    """
+    if not os.path.exists(path):
+        return None, QAResult(QAStatus.FAIL, f"Clip file not found: {path}", retry_suggested=True)
+    try:
+        return get_media_probe().probe(path), None
+    except FFprobeNotFound:
+        return None, QAResult(QAStatus.PASS, "Skipped: ffprobe unavailable")
+    except MediaProbeError as e:
+        return None, QAResult(QAStatus.FAIL, f"Clip is not readable: {e}", retry_suggested=True)
+
+def make_duration_validator(expected_s: float = EXPECTED_CLIP_DURATION_S,
+                            tolerance_s: float = 0.1) -> Callable[[str], QAResult]:
+    """Clip duration must be within `tolerance_s` of `expected_s` (container duration)."""
+    def validate_exact_duration(path: str) -> QAResult:
+        info, skipped = _probe_clip(path)
+        if skipped:
+            return skipped
+        details = {"duration_s": info.duration_s, "expected_s": expected_s}
+        if abs(info.duration_s - expected_s) > tolerance_s:
+            return QAResult(QAStatus.FAIL, f"Clip duration {info.duration_s:.3f}s != {expected_s}s (± {tolerance_s}s)",
+                            retry_suggested=True, details=details)
+        return QAResult(QAStatus.PASS, f"Duration {info.duration_s:.3f}s", details=details)
+    return validate_exact_duration
+
+def make_fps_validator(expected_fps: float = EXPECTED_CLIP_FPS, tolerance: float = 0.05) -> Callable[[str], QAResult]:
+    """Average frame rate must match `expected_fps` (29.97 vs 30 style drift is a FAIL at default tolerance)."""
+    def validate_fps(path: str) -> QAResult:
+        info, skipped = _probe_clip(path)
+        if skipped:
+            return skipped
+        if info.video is None:
+            return QAResult(QAStatus.FAIL, "Clip has no video stream", retry_suggested=True)
+        details = {"fps": info.fps, "expected_fps": expected_fps}
+        if info.fps is None or abs(info.fps - expected_fps) > tolerance:
+            return QAResult(QAStatus.FAIL, f"Clip frame rate {info.fps} != {expected_fps}", retry_suggested=True, details=details)
+        return QAResult(QAStatus.PASS, f"Frame rate {info.fps:g}", details=details)
+    return validate_fps
+
+def make_resolution_validator(allowed: Tuple[Tuple[int, int], ...] = EXPECTED_CLIP_RESOLUTIONS) -> Callable[[str], QAResult]:
+    """Video stream dimensions must be one of `allowed` (width, height) pairs."""
+    def validate_resolution(path: str) -> QAResult:
+        info, skipped = _probe_clip(path)
+        if skipped:
+            return skipped
+        if info.video is None:
+            return QAResult(QAStatus.FAIL, "Clip has no video stream", retry_suggested=True)
+        details = {"width": info.width, "height": info.height}
+        if (info.width, info.height) not in allowed:
+            return QAResult(QAStatus.FAIL, f"Unexpected resolution {info.width}x{info.height}", retry_suggested=True, details=details)
+        return QAResult(QAStatus.PASS, f"Resolution {info.width}x{info.height}", details=details)
+    return validate_resolution
+
+def validate_audio_stream(path: str) -> QAResult:
+    """
+    Veo clips are expected to carry an audio track. Missing audio is a WARNING:
+    assembly maps the narration track anyway, so the clip is still usable.
+    """
+    info, skipped = _probe_clip(path)
+    if skipped:
+        return skipped
+    if info.audio is None:
+        return QAResult(QAStatus.WARNING, "Clip has no audio stream")
+    details = {"audio_codec": info.audio.codec_name, "sample_rate": info.audio.sample_rate, "channels": info.audio.channels}
+    return QAResult(QAStatus.PASS, "Audio stream present", details=details)
+
+# --- Black / frozen frame detection ---
+
+_BLACK_RE = re.compile(r"black_start:(?P<start>[\d.]+)\s+black_end:(?P<end>[\d.]+)\s+black_duration:(?P<duration>[\d.]+)")
+_FREEZE_RE = re.compile(r"lavfi\.freezedetect\.freeze_(?P<key>start|duration|end):\s*(?P<value>[\d.]+)")
+
+# {(abs_path, size, mtime_ns): {"black": [...], "freeze": [...]}}, least recently used first
+_frame_analysis_cache: "OrderedDict[Tuple[str, int, int], Dict[str, List[Dict[str, float]]]]" = OrderedDict()
+# Every reroll is a new file version; keep the long-lived API process from growing forever
+FRAME_ANALYSIS_CACHE_MAX = int(os.environ.get("QA_FRAME_CACHE_MAX", "1024"))
+_frame_analysis_lock = threading.Lock()
+
+def _parse_frame_analysis(stderr: str) -> Dict[str, List[Dict[str, float]]]:
+    black = [{k: float(v) for k, v in m.groupdict().items()} for m in _BLACK_RE.finditer(stderr)]
+    freeze: List[Dict[str, float]] = []
+    for m in _FREEZE_RE.finditer(stderr):
+        key, value = m.group("key"), float(m.group("value"))
+        if key == "start" or not freeze:
+            freeze.append({})
+        freeze[-1][key] = value
+    return {"black": black, "freeze": freeze}
+
+def analyze_frames(path: str) -> Optional[Dict[str, List[Dict[str, float]]]]:
+    """
+    Runs blackdetect and freezedetect in ONE decode of the clip and returns
+    {"black": [{start, end, duration}], "freeze": [{start, duration, end}]}.
+    Results are cached per file version, so the black and freeze validators
+    share a single ffmpeg run. Returns None when ffmpeg is unavailable.
+    """
+    if not shutil.which("ffmpeg"):
+        return None
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    key = (abs_path, st.st_size, st.st_mtime_ns)
+    with _frame_analysis_lock:
+        cached = _frame_analysis_cache.get(key)
+        if cached is not None:
+            _frame_analysis_cache.move_to_end(key)
+    if cached is not None:
+        return cached
+
+    vf = (f"blackdetect=d={BLACK_MIN_DURATION_S}:pix_th={BLACK_PIXEL_THRESHOLD},"
+          f"freezedetect=n={FREEZE_NOISE_DB}dB:d={FREEZE_MIN_DURATION_S}")
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostats",
+        "-threads", "2",  # clips are analysed in parallel; keep each decode small
+        "-i", abs_path,
+        "-an", "-vf", vf,
+        "-f", "null", "-"
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise MediaProbeError(f"ffmpeg frame analysis failed for {abs_path}: {result.stderr.strip()[-500:]}")
+
+    analysis = _parse_frame_analysis(result.stderr)
+    with _frame_analysis_lock:
+        _frame_analysis_cache[key] = analysis
+        _frame_analysis_cache.move_to_end(key)
+        while len(_frame_analysis_cache) > FRAME_ANALYSIS_CACHE_MAX:
+            _frame_analysis_cache.popitem(last=False)
+    return analysis
+
+def _frame_analysis_or_result(path: str) -> Tuple[Optional[Dict], Optional[QAResult]]:
+    if not os.path.exists(path):
+        return None, QAResult(QAStatus.FAIL, f"Clip file not found: {path}", retry_suggested=True)
+    try:
+        analysis = analyze_frames(path)
+    except MediaProbeError as e:
+        return None, QAResult(QAStatus.FAIL, str(e), retry_suggested=True)
+    if analysis is None:
+        return None, QAResult(QAStatus.PASS, "Skipped: ffmpeg unavailable")
+    return analysis, None
+
+def validate_black_frames(path: str) -> QAResult:
+    """FAIL if the clip contains a black segment of BLACK_MIN_DURATION_S or longer."""
+    analysis, skipped = _frame_analysis_or_result(path)
+    if skipped:
+        return skipped
+    segments = analysis["black"]
+    if segments:
+        total = sum(s["duration"] for s in segments)
+        return QAResult(QAStatus.FAIL, f"Black frames detected ({len(segments)} segment(s), {total:.2f}s)",
+                        retry_suggested=True, details={"black_segments": segments})
+    return QAResult(QAStatus.PASS, "No black segments")
+
+def validate_frozen_frames(path: str) -> QAResult:
+    """FAIL if the picture is frozen for FREEZE_MIN_DURATION_S or longer."""
+    analysis, skipped = _frame_analysis_or_result(path)
+    if skipped:
+        return skipped
+    segments = analysis["freeze"]
+    if segments:
+        return QAResult(QAStatus.FAIL, f"Frozen frames detected ({len(segments)} segment(s))",
+                        retry_suggested=True, details={"freeze_segments": segments})
+    return QAResult(QAStatus.PASS, "No frozen segments")
+
+def register_clip_validators(engine, expected_duration_s: float = EXPECTED_CLIP_DURATION_S,
+                             expected_fps: float = EXPECTED_CLIP_FPS):
+    """
+    Registers the standard clip checks on a QARulesEngine. Cheap probe-based
+    checks come first so a failing clip never pays for the frame analysis decode.
+    """
+    engine.register_clip_validator(make_duration_validator(expected_duration_s))
+    engine.register_clip_validator(make_fps_validator(expected_fps))
+    engine.register_clip_validator(make_resolution_validator())
+    engine.register_clip_validator(validate_audio_stream)
+    engine.register_clip_validator(validate_black_frames)
+    engine.register_clip_validator(validate_frozen_frames)
+    return engine
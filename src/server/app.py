@@ -1,17 +1,22 @@
 
 import os
-import sqlite3
+import json
+import asyncio
 import shutil
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from typing import List, Dict, Optional
 from pydantic import BaseModel
-from fastapi import FastAPI, HTTPException, Body, UploadFile, File, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Body, UploadFile, File, BackgroundTasks, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 from src.database_manager import DatabaseManager
 from src.orchestrator import RunOrchestrator
 from src.models import GenerationMode
+from src.foundation.event_bus import get_event_bus
 
 # Config
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # root/src/server -> root
@@ -26,12 +31,20 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "Link", "X-Next-Cursor"],
 )
 
 # Config
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # root/src/server -> root
 DB_PATH = os.path.join(BASE_DIR, "pipeline.db")
 db = DatabaseManager(DB_PATH)
+event_bus = get_event_bus()
+# Idle SSE streams send a comment this often so proxies keep them open
+SSE_KEEPALIVE_S = float(os.environ.get("SSE_KEEPALIVE_S", "15"))
+
+@app.on_event("shutdown")
+def close_db():
+    db.close()
 
 # Models
 class AssetUpdate(BaseModel):
@@ -44,22 +57,63 @@ def health_check():
     return {"status": "ok", "service": "FinanceVideoPlatform API"}
 
 @app.get("/api/runs")
-def list_runs():
-    """List all pipeline runs."""
-    conn = db._get_connection()
-    conn.row_factory = sqlite3.Row
+def list_runs(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    video_id: Optional[str] = None,
+    stage: Optional[str] = None,
+    status: Optional[str] = None
+):
+    """
+    List pipeline runs (newest first) with their status.
+    All runs by default. With `limit`, paginated: the next page's cursor is in
+    the X-Next-Cursor header (and Link).
+    Supports conditional requests (ETag / If-Modified-Since) for cheap polling.
+    """
     try:
-        cursor = conn.execute("SELECT * FROM runs ORDER BY created_at DESC")
-        runs = [dict(row) for row in cursor.fetchall()]
-        
-        # Add status to each run
-        for run in runs:
-            status = db.get_run_status(run['run_id'], run['version'])
-            run['status'] = status
-            
-        return runs
-    finally:
-        conn.close()
+        runs, next_cursor = db.list_runs(limit=limit, cursor=cursor, video_id=video_id, stage=stage, status=status)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    body = json.dumps(runs, default=str)
+    headers = {
+        "ETag": f'"{hashlib.sha1((body + (next_cursor or "")).encode()).hexdigest()}"',
+        "Cache-Control": "no-cache"
+    }
+    last_modified = _runs_last_modified(runs)
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    if _not_modified(request, headers["ETag"], last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _runs_last_modified(runs: List[Dict]) -> Optional[datetime]:
+    """Newest created_at / status updated_at on the page (SQLite UTC timestamps)."""
+    stamps = [run['created_at'] for run in runs]
+    stamps += [run['status']['updated_at'] for run in runs if run['status']]
+    stamps = [s for s in stamps if s]
+    if not stamps:
+        return None
+    return datetime.strptime(max(stamps)[:19], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since
+        return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
 
 @app.post("/api/runs/create")
 async def create_run(
@@ -168,68 +222,85 @@ def get_single_shot(run_id: str, shot_id: str, version: int = 1):
         raise HTTPException(status_code=404, detail="Shot not found")
     return shot
 
+@app.get("/api/runs/{run_id}/events")
+async def stream_run_events(run_id: str, request: Request, version: int = 1):
+    """
+    Server-sent events for a run, replacing status/shots polling.
+    Opens with a `snapshot` (status + shot tree), then pushes `status`,
+    `progress` and `asset` events as they are committed. A client that falls
+    too far behind gets a fresh snapshot instead of the dropped events.
+    """
+    return StreamingResponse(
+        run_event_stream(run_id, version, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def run_event_stream(run_id: str, version: int, is_disconnected, keepalive_s: Optional[float] = None):
+    # Subscribe before reading the snapshot so nothing committed in between is missed
+    subscription = event_bus.subscribe(run_id, version)
+    try:
+        yield await _snapshot_event(run_id, version)
+        while not await is_disconnected():
+            event = await subscription.get(timeout=keepalive_s or SSE_KEEPALIVE_S)
+            if subscription.take_overflow():
+                yield await _snapshot_event(run_id, version)
+            elif event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield _sse(event.type, event.data, event.id)
+    finally:
+        subscription.close()
+
+async def _snapshot_event(run_id: str, version: int) -> str:
+    status = await asyncio.to_thread(db.get_run_status, run_id, version)
+    shots = await asyncio.to_thread(db.get_shot_tree, run_id, version)
+    return _sse("snapshot", {"status": status, "shots": shots})
+
+def _sse(event_type: str, data, event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event_type}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
 @app.get("/api/assets/{asset_id}/file")
 def get_asset_file(asset_id: str):
     """
     Serves the physical file for an asset.
     """
     conn = db._get_connection()
-    conn.row_factory = sqlite3.Row
-    try:
-        row = conn.execute("SELECT path FROM assets WHERE asset_id = ?", (asset_id,)).fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="Asset not found")
-        
-        file_path = row['path']
-        if not os.path.exists(file_path):
-            raise HTTPException(status_code=404, detail="File not found on disk")
-        
-        return FileResponse(file_path)
-    finally:
-        conn.close()
+    row = conn.execute("SELECT path FROM assets WHERE asset_id = ?", (asset_id,)).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    
+    file_path = row['path']
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File not found on disk")
+    
+    return FileResponse(file_path)
 
 @app.patch("/api/assets/{asset_id}")
 def update_asset(asset_id: str, update: AssetUpdate):
     """
     Updates asset state (e.g. selection, QC).
     """
-    conn = db._get_connection()
     try:
         if update.is_selected is not None:
-            # If selecting, deselect siblings first (Business Logic)
-            if update.is_selected:
-                # 1. Get info about this asset
-                row = conn.execute("SELECT shot_id, type, role FROM assets WHERE asset_id = ?", (asset_id,)).fetchone()
-                if not row:
-                    raise HTTPException(404, "Asset not found")
-                
-                shot_id, a_type, role = row
-                
-                # 2. Deselect siblings
-                query = "UPDATE assets SET is_selected = 0 WHERE shot_id = ? AND type = ?"
-                params = [shot_id, a_type]
+            # Selecting deselects the shot's other assets of the same type/role;
+            # the change is published to the run's event stream
+            if not db.set_asset_selected(asset_id, update.is_selected):
+                raise HTTPException(404, "Asset not found")
                 
-                if role:
-                    query += " AND role = ?"
-                    params.append(role)
-                else:
-                    query += " AND role IS NULL"
-                
-                conn.execute(query, tuple(params))
-            
-            # 3. Set new state
-            conn.execute("UPDATE assets SET is_selected = ? WHERE asset_id = ?", (update.is_selected, asset_id))
-            
         if update.qc_notes is not None:
              # TODO: Implement QC notes column if added, or store in metadata JSON
              pass
              
-        conn.commit()
         return {"status": "updated", "asset_id": asset_id}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, str(e))
-    finally:
-        conn.close()
 
 @app.post("/api/runs/{run_id}/shots/{shot_id}/generate-images")
 def generate_shot_images(run_id: str, shot_id: str, version: int = 1, video_id: str = "VID_001"):
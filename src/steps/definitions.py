@@ -24,6 +24,8 @@ class PlaceholderStep(Step):
         logger.info(f"Executing placeholder logic for {self.name}...")
         
         created_artifacts = []
+        progress = context.progress
+        progress.start(len(self.artifacts_to_create), f"{self.name}: creating artifacts")
         for filename in self.artifacts_to_create:
             path = os.path.join(context.run_dir, filename)
             if not os.path.exists(path):
@@ -31,6 +33,7 @@ class PlaceholderStep(Step):
                 with open(path, 'w') as f:
                     f.write(f'{{"step": "{self.name}", "status": "placeholder_artifact"}}\n')
             created_artifacts.append(path)
+            progress.advance()
             
         logger.info(f"Step {self.name} Completed.")
         return StepResult(status=State.DONE, artifacts=created_artifacts)
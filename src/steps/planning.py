@@ -51,9 +51,9 @@ class BeatSegmenterStep(Step):
             script_text = f.read()
             
         # 4. Initialize and Run Agent
-        # Inject min/max beats from system rules if available (could be added to rules)
-        # For now use defaults in agent
-        agent = BeatSegmenterAgent(llm=llm)
+        # agent_settings.beat_segmenter is passed through (e.g. max_concurrent_chunks);
+        # keys not present fall back to agent defaults
+        agent = BeatSegmenterAgent(llm=llm, config=agent_config, progress=context.progress)
         
         try:
             beats, meta = agent.segment_script(context.run_id, script_text)
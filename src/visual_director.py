@@ -1,6 +1,7 @@
 import hashlib
 import os
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional
 from .models import (
     ShotSpec, NanobananaRequest, VeoRequest, 
     AlignmentSource, CameraSpec, ContinuitySpec,
@@ -8,12 +9,15 @@ from .models import (
     AlignmentStats
 )
 from .clients.agent import AgentClient
+from .foundation.progress import ProgressReporter
 
 class VisualDirector:
     def __init__(self, global_config, style_bible_content: str = ""):
         self.config = global_config
         self.style_bible = style_bible_content
         self.agent = AgentClient()
+        # Set by the caller (e.g. StepContext.services["progress"]); else built from db_manager
+        self.progress = None
 
     def _generate_shot_id(self, run_id: str, index: int) -> str:
         return f"{run_id}_s{index:03d}"
@@ -32,12 +36,7 @@ class VisualDirector:
         agent_suggestion = self.agent.suggest_visuals(text)
         if agent_suggestion:
             # Normalize camera string to Enum if possible
-            cam_str = agent_suggestion.get("camera", "STATIC").upper()
-            try:
-                # Validate enum
-                valid_cam = CameraMovement(cam_str)
-            except ValueError:
-                valid_cam = CameraMovement.STATIC
+            valid_cam = self._parse_camera(agent_suggestion.get("camera")) or CameraMovement.STATIC
             
             return {
                 "metaphor": agent_suggestion.get("metaphor", "Abstract finance scene"),
@@ -45,6 +44,79 @@ class VisualDirector:
                 "intent": agent_suggestion.get("intent", f"Visualize: {text[:20]}...")
             }
 
+        return self._heuristic_visual_intent(text)
+
+    def _derive_visual_intents(self, texts: List[str], on_done: Optional[Callable[[int], None]] = None) -> List[Dict[str, str]]:
+        """
+        Visual intents for every segment, in order.
+        Segments are packed VISUAL_INTENT_BATCH_SIZE per agent request and the
+        batches run VISUAL_INTENT_WORKERS at a time. Any index missing from a
+        batch answer, or failing validation, falls back to _derive_visual_intent.
+        A batch size of 1 keeps the old one-call-per-segment behaviour.
+        `on_done(n)` is called (from worker threads) as each batch of n segments finishes.
+        """
+        batch_size = int(os.environ.get("VISUAL_INTENT_BATCH_SIZE", "10"))
+        if batch_size <= 1 or len(texts) <= 1:
+            intents = []
+            for text in texts:
+                intents.append(self._derive_visual_intent(text))
+                if on_done:
+                    on_done(1)
+            return intents
+        
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        workers = min(int(os.environ.get("VISUAL_INTENT_WORKERS", "4")), len(batches))
+        print(f"Deriving visual intents: {len(texts)} segments in {len(batches)} batches ({workers} concurrent)")
+
+        def derive(batch: List[str]) -> List[Dict[str, str]]:
+            intents = self._derive_visual_intent_batch(batch)
+            if on_done:
+                on_done(len(batch))
+            return intents
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="visual-intent") as executor:
+            results = list(executor.map(derive, batches))
+        return [intent for batch in results for intent in batch]
+
+    def _derive_visual_intent_batch(self, texts: List[str]) -> List[Dict[str, str]]:
+        suggestions = self.agent.suggest_visuals_batch(texts) or {}
+        intents = []
+        fallbacks = 0
+        for index, text in enumerate(texts):
+            intent = self._validated_intent(suggestions.get(index), text)
+            if intent is None:
+                fallbacks += 1
+                intent = self._derive_visual_intent(text)
+            intents.append(intent)
+        if suggestions and fallbacks:
+            print(f"WARNING: Visual intent batch: {fallbacks}/{len(texts)} segments re-derived individually")
+        return intents
+
+    def _validated_intent(self, suggestion: Optional[Dict], text: str) -> Optional[Dict[str, str]]:
+        """Batch answer for one segment, or None unless it has a metaphor and a known camera move."""
+        if not isinstance(suggestion, dict):
+            return None
+        metaphor = suggestion.get("metaphor")
+        camera = self._parse_camera(suggestion.get("camera"))
+        if not isinstance(metaphor, str) or not metaphor.strip() or camera is None:
+            return None
+        return {
+            "metaphor": metaphor.strip(),
+            "camera": camera,
+            "intent": suggestion.get("intent") or f"Visualize: {text[:20]}..."
+        }
+
+    @staticmethod
+    def _parse_camera(value) -> Optional[CameraMovement]:
+        # Prompts list the enum names (TILT_UP); the enum values are lower case
+        if not isinstance(value, str):
+            return None
+        try:
+            return CameraMovement(value.strip().lower())
+        except ValueError:
+            return None
+
+    def _heuristic_visual_intent(self, text: str) -> Dict[str, str]:
         # Fallback Heuristic
         text_lower = text.lower()
         metaphor = "Abstract minimal finance shapes"
@@ -115,6 +187,14 @@ class VisualDirector:
             "accent_color": accent_color
         }
 
+    def _progress_reporter(self) -> ProgressReporter:
+        if self.progress is not None:
+            return self.progress
+        db_manager = getattr(self, 'db_manager', None)
+        if db_manager:
+            return ProgressReporter.for_run(db_manager, self.config.run_id, self.config.version)
+        return ProgressReporter()
+
     def _extract_block_id(self, text: str) -> str:
         """Extracts Bxx from text headers if present, else defaults."""
         import re
@@ -135,24 +215,25 @@ class VisualDirector:
         veo_requests: List[VeoRequest] = []
         
         print(f"Creating visual plan for {len(aligned_segments)} segments...")
+        progress = self._progress_reporter()
+        progress.start(len(aligned_segments), "Deriving visual intents")
+        # 1. Visual Intent (batched agent calls up front; progress advances per finished batch)
+        intents = self._derive_visual_intents(
+            [seg['text'] for seg in aligned_segments],
+            on_done=lambda n: progress.advance(n)
+        )
+        progress.start(len(aligned_segments), "Building shots")
+        
         for i, seg in enumerate(aligned_segments):
             print(f"[{i+1}/{len(aligned_segments)}] Processing segment: {seg['text'][:50]}...")
             shot_id = self._generate_shot_id(self.config.run_id, i+1)
             beat_id = self._generate_beat_id(self.config.run_id, i+1)
             
-            # 1. Visual Intent
-            intent_data = self._derive_visual_intent(seg['text'])
+            intent_data = intents[i]
             print(f"[{i+1}/{len(aligned_segments)}] ✓ Generated visual intent for {shot_id}")
             
-            # Update progress in database
-            if hasattr(self, 'db_manager') and self.db_manager:
-                self.db_manager.update_stage_progress(
-                    self.config.run_id, 
-                    self.config.version, 
-                    i + 1, 
-                    len(aligned_segments),
-                    f"Processing segment {i+1}/{len(aligned_segments)}"
-                )
+            # Update progress (coalesced; not one DB write per segment)
+            progress.update(i + 1, message=f"Processing segment {i+1}/{len(aligned_segments)}")
             
             # 2. Build ShotSpec
             camera_spec = CameraSpec(
@@ -275,6 +356,7 @@ class VisualDirector:
             )
             veo_requests.append(veo_req)
 
+        progress.flush()
         return {
             "shots": shots,
             "nano_requests": nano_requests,
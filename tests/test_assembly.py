@@ -0,0 +1,140 @@
+import os
+import random
+import threading
+import time
+from src.assembly import VideoAssembler
+
+def test_render_chunks_parallel_keeps_shot_order(tmp_path):
+    assembler = VideoAssembler(str(tmp_path), workers=4, threads_per_chunk=2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fake_render(source, output, duration, is_video):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(random.uniform(0.01, 0.05))
+        with lock:
+            active[0] -= 1
+
+    assembler._render_chunk = fake_render
+    jobs = [("BLACK", str(tmp_path / f"chunk_{i:04d}.mp4"), 1.0, False, False) for i in range(12)]
+
+    chunks = assembler._render_chunks(jobs)
+
+    assert chunks == [job[1] for job in jobs]
+    assert 1 < peak[0] <= 4
+
+def test_assemble_reuses_unchanged_chunks(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    import src.assembly as assembly
+
+    assembler = VideoAssembler(str(tmp_path), workers=2)
+    (tmp_path / "assets").mkdir()
+    for i in range(3):
+        (tmp_path / "assets" / f"S{i}.mp4").write_bytes(f"clip {i}".encode())
+    shots = [SimpleNamespace(id=f"S{i}", duration_s=2.0) for i in range(3)]
+
+    rendered = []
+    def fake_render(source, output, duration, is_video):
+        rendered.append(source)
+        open(output, "wb").write(b"chunk")
+    assembler._render_chunk = fake_render
+    monkeypatch.setattr(assembly.subprocess, "check_call", lambda *a, **k: 0)
+
+    assembler.assemble(shots, "vo.mp3")
+    assert len(rendered) == 3
+
+    rendered.clear()
+    assembler.assemble(shots, "vo.mp3")
+    assert rendered == []
+
+    # Reroll one shot: only that chunk is re-encoded, concat order unchanged
+    (tmp_path / "assets" / "S1.mp4").write_bytes(b"clip 1 take 2")
+    assembler.assemble(shots, "vo.mp3")
+    assert rendered == [str(tmp_path / "assets" / "S1.mp4")]
+    concat = (tmp_path / "assembly_staging" / "concat_list.txt").read_text().splitlines()
+    assert [line.split("chunk_")[1].split("_")[0] for line in concat] == ["S0", "S1", "S2"]
+
+    # The chunk of S1's previous take was dropped; nothing else was
+    staging = sorted(n for n in os.listdir(tmp_path / "assembly_staging") if n.startswith("chunk_"))
+    assert [n.split("_")[1] for n in staging] == ["S0", "S1", "S2"]
+    assert staging == sorted(os.path.basename(line.split("'")[1]) for line in concat)
+
+def test_filtergraph_engine_builds_one_graph_and_falls_back(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    import subprocess
+    import src.assembly as assembly
+
+    assembler = VideoAssembler(str(tmp_path), engine="filtergraph")
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "S0.mp4").write_bytes(b"clip")
+    (tmp_path / "assets" / "S1_start.png").write_bytes(b"png")
+    shots = [SimpleNamespace(id=f"S{i}", duration_s=1.5) for i in range(3)]
+
+    calls = []
+    monkeypatch.setattr(assembly.subprocess, "check_call", lambda cmd, **k: calls.append(cmd))
+    assembler.assemble(shots, "vo.mp3")
+
+    assert assembler.last_engine == "filtergraph"
+    assert len(calls) == 1
+    cmd = calls[0]
+    assert cmd.count("-i") == 4  # 3 shots + voiceover
+    assert "color=c=black:s=1920x1080:r=30" in cmd
+    graph = (tmp_path / "assembly_staging" / "filtergraph.txt").read_text()
+    assert "[v0][v1][v2]concat=n=3:v=1:a=0[outv]" in graph
+    assert graph.count("trim=duration=1.5") == 3
+
+    # A failing single-pass run falls back to the chunked engine
+    def failing(cmd, **k):
+        if "-filter_complex_script" in cmd:
+            raise subprocess.CalledProcessError(1, cmd)
+    monkeypatch.setattr(assembly.subprocess, "check_call", failing)
+    rendered = []
+    assembler._render_chunk = lambda source, output, duration, is_video: rendered.append(output)
+    assembler.assemble(shots, "vo.mp3")
+    assert len(rendered) == 3
+    assert assembler.last_engine == "chunked"
+
+def test_conformant_clips_take_stream_copy_path(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    import src.assembly as assembly
+
+    assembler = VideoAssembler(str(tmp_path), workers=1)
+    (tmp_path / "assets").mkdir()
+    for i in range(3):
+        (tmp_path / "assets" / f"S{i}.mp4").write_bytes(f"clip {i}".encode())
+    shots = [SimpleNamespace(id=f"S{i}", duration_s=4.0) for i in range(3)]
+
+    from src.foundation.media_probe import MediaInfo, StreamInfo
+    def clip_info(path, **video):
+        stream = dict(index=0, codec_type="video", codec_name="h264", width=1920, height=1080,
+                      pix_fmt="yuv420p", r_frame_rate="30/1", fps=30.0, sample_aspect_ratio="1:1",
+                      profile="Constrained Baseline", level=40, extradata_hash="SHA256:ours")
+        stream.update(video)
+        return MediaInfo(path=path, size_bytes=1, duration_s=8.0, streams=[StreamInfo(**stream)])
+
+    clips = {
+        "S0.mp4": clip_info("S0.mp4"),
+        # Right size and rate but another encoder's SPS/PPS: copying it would break the concat
+        "S1.mp4": clip_info("S1.mp4", profile="High", level=42, extradata_hash="SHA256:veo"),
+        # Raw Veo render: 720p @ 24fps
+        "S2.mp4": clip_info("S2.mp4", width=1280, height=720, r_frame_rate="24/1"),
+    }
+    monkeypatch.setattr(assembler.probe, "probe_many", lambda paths: {p: clips[os.path.basename(p)] for p in paths})
+    monkeypatch.setattr(assembler.probe, "probe", lambda path: clip_info(path))
+    monkeypatch.setattr(assembly.subprocess, "check_call", lambda *a, **k: 0)
+
+    copied, encoded = [], []
+    assembler._copy_chunk = lambda source, output, duration: copied.append(source)
+    assembler._render_chunk = lambda source, output, duration, is_video: encoded.append(os.path.basename(source))
+    assembler.assemble(shots, "vo.mp3")
+
+    assert [os.path.basename(p) for p in copied] == ["S0.mp4"]
+    # The encoder reference (one black frame) is rendered first
+    assert encoded == ["BLACK", "S1.mp4", "S2.mp4"]
+    signature = ("Constrained Baseline", 40, "SHA256:ours")
+    # Too short for the shot: must go through the encoder
+    assert not assembler._is_conformant(clip_info("S0.mp4"), duration=9.0, signature=signature)
+    # No reference signature (ffmpeg missing): nothing is copied
+    assert not assembler._is_conformant(clip_info("S0.mp4"), duration=4.0, signature=None)
@@ -0,0 +1,66 @@
+import os
+import stat
+from src.foundation.blob_store import BlobStore
+from src.foundation.hashing import hash_file_sha256
+
+def test_ingest_dedupes_and_links_into_runs(tmp_path):
+    store = BlobStore(str(tmp_path / "store"))
+    src = tmp_path / "voiceover.mp3"
+    src.write_bytes(b"audio" * 1000)
+
+    run1 = tmp_path / "runs" / "r1" / "inputs" / "voiceover.mp3"
+    run2 = tmp_path / "runs" / "r2" / "inputs" / "voiceover.mp3"
+    digest = store.ingest(str(src), str(run1))
+    assert digest == hash_file_sha256(str(src))
+    assert store.ingest(str(src), str(run2), digest=digest) == digest
+
+    blob = store.blob_path(digest)
+    assert blob.endswith(os.path.join("sha256", digest[:2], digest[2:]))
+    assert os.path.samefile(blob, run1) and os.path.samefile(blob, run2)
+    assert store.refcount(digest) == 2
+    assert not os.stat(blob).st_mode & stat.S_IWUSR
+    # The user's original is never linked, so it stays writable
+    assert os.stat(src).st_mode & stat.S_IWUSR
+
+def test_adopt_moves_existing_file_into_store(tmp_path):
+    store = BlobStore(str(tmp_path / "store"))
+    a = tmp_path / "run1" / "S01.mp4"
+    b = tmp_path / "run2" / "S01.mp4"
+    for path in (a, b):
+        path.parent.mkdir()
+        path.write_bytes(b"clip")
+
+    digest = store.adopt(str(a))
+    assert store.adopt(str(b)) == digest
+    assert os.path.samefile(a, b)
+
+def test_gc_drops_unreferenced_blobs(tmp_path):
+    store = BlobStore(str(tmp_path / "store"))
+    keep, drop = tmp_path / "keep.txt", tmp_path / "drop.txt"
+    keep.write_text("keep")
+    drop.write_text("drop")
+    keep_digest = store.ingest(str(keep), str(tmp_path / "run" / "keep.txt"))
+    drop_digest = store.ingest(str(drop), str(tmp_path / "run" / "drop.txt"))
+
+    os.remove(tmp_path / "run" / "drop.txt")  # run cleaned up
+
+    # Fresh blobs are protected by the grace window
+    assert store.gc(grace_s=3600).blobs_removed == 0
+
+    preview = store.gc(dry_run=True, grace_s=0)
+    assert preview.removed == [drop_digest] and store.has(drop_digest)
+
+    report = store.gc(grace_s=0)
+    assert report.removed == [drop_digest]
+    assert not store.has(drop_digest) and store.has(keep_digest)
+    assert store.refcount(drop_digest) == 0
+
+def test_relative_store_root_is_anchored_to_project_root(monkeypatch):
+    from src.foundation import blob_store
+    from src.foundation.paths import BASE_DIR
+    monkeypatch.setattr(blob_store, "_store", None)
+    monkeypatch.setattr(blob_store, "BlobStore", lambda root: type("Store", (), {"root": root})())
+    monkeypatch.chdir("/")
+
+    assert blob_store.get_blob_store("store").root == os.path.join(BASE_DIR, "store")
+    assert blob_store.get_blob_store("/abs/store").root == "/abs/store"
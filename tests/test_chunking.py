@@ -2,6 +2,8 @@
 import pytest
 import os
 import json
+import threading
+import time
 from unittest.mock import MagicMock
 from src.agents.beat_segmenter import BeatSegmenterAgent
 from src.agents.beat_models import BeatLLMResponse
@@ -113,3 +115,52 @@ def test_segment_script_reassembly(segmenter, tmp_path):
         
     finally:
         os.chdir(original_cwd)
+
+class SlowMockLLM(LLMClient):
+    """Answers each chunk with a 1-line beat; earlier chunks finish last."""
+    def __init__(self, delays):
+        self.delays = delays
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def generate_json(self, request):
+        first_line = request.messages[1].content.split("\n")[1] # "1: Line X ..."
+        chunk_index = int(first_line.split("Line ")[1].split()[0])
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delays[chunk_index])
+        with self.lock:
+            self.in_flight -= 1
+        return LLMResponse(text="Mock", json={
+            "beats": [
+                {"order": 1, "line_start": 1, "line_end": 1, "intent": f"Chunk {chunk_index}", "estimated_seconds": 3.0, "priority": 2}
+            ]
+        })
+
+    def generate_text(self, request):
+        return LLMResponse(text="Mock")
+
+def test_segment_script_concurrent_preserves_chunk_order(tmp_path):
+    """Chunks complete out of order but beats are stitched back in chunk order."""
+    lines = [f"Line {i} " + "word " * 10 for i in range(4)]
+    llm = SlowMockLLM(delays=[0.3, 0.2, 0.1, 0.0])
+    segmenter = BeatSegmenterAgent(llm, config={"min_beats": 1, "max_beats": 100, "max_concurrent_chunks": 2})
+    
+    segmenter._prepare_script = MagicMock(return_value=(lines, []))
+    segmenter._create_chunks = MagicMock(return_value=[
+        {"lines": [line], "offset": i, "global_start_index": i + 1} for i, line in enumerate(lines)
+    ])
+    
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(tmp_path)
+        beats, meta = segmenter.segment_script("test_concurrent_run", "dummy text")
+    finally:
+        os.chdir(original_cwd)
+    
+    assert llm.max_in_flight == 2
+    assert [b.source.line_start for b in beats] == [1, 2, 3, 4]
+    assert [b.intent for b in beats] == ["Chunk 0", "Chunk 1", "Chunk 2", "Chunk 3"]
+    assert [b.order for b in beats] == [1, 2, 3, 4]
@@ -0,0 +1,168 @@
+import sqlite3
+import threading
+import pytest
+from src.database_manager import DatabaseManager
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "pipeline.db"))
+    yield manager
+    manager.close()
+
+def test_connection_is_persistent_per_thread_and_uses_wal(db):
+    conn = db._get_connection()
+    assert db._get_connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(db._get_connection()))
+    t.start(); t.join()
+    assert other[0] is not conn
+
+def test_writes_commit_and_survive_reopen(db, tmp_path):
+    db.register_run("RUN_1", 1, "VID_001")
+    db.register_shot({"id": "S001", "run_id": "RUN_1", "version": 1, "script_text": "hello"})
+    asset_id = db.register_asset("S001", "CLIP", "/tmp/S001.mp4", role="video")
+    db.update_run_status("RUN_1", 1, "CLIPS", "running")
+    db.update_stage_progress("RUN_1", 1, 3, 10, "3/10")
+
+    reopened = DatabaseManager(db.db_path)
+    try:
+        shots = reopened.get_shot_tree("RUN_1", 1)
+        assert shots[0]["assets"][0]["asset_id"] == asset_id
+        status = reopened.get_run_status("RUN_1", 1)
+        assert (status["progress_current"], status["progress_total"]) == (3, 10)
+    finally:
+        reopened.close()
+
+def test_failed_write_rolls_back_and_connection_stays_usable(db):
+    db.register_run("RUN_1", 1, "VID_001")
+    conn = db._get_connection()
+    with pytest.raises(sqlite3.OperationalError):
+        with conn:
+            conn.execute("INSERT INTO runs (run_id, version, video_id) VALUES ('RUN_2', 1, 'V')")
+            conn.execute("INSERT INTO no_such_table VALUES (1)")
+
+    assert not conn.in_transaction
+    runs = [r["run_id"] for r in conn.execute("SELECT run_id FROM runs")]
+    assert runs == ["RUN_1"]
+
+def _selected(db, shot_id):
+    rows = db._get_connection().execute(
+        "SELECT asset_id, type, role FROM assets WHERE shot_id = ? AND is_selected = 1", (shot_id,)
+    ).fetchall()
+    return {(r["type"], r["role"]): r["asset_id"] for r in rows}
+
+def test_register_shots_bulk(db):
+    db.register_run("RUN_1", 1, "VID_001")
+    db.register_shots_bulk([
+        {"id": f"S{i:03d}", "run_id": "RUN_1", "version": 1, "camera": {"move": "dolly"}}
+        for i in range(150)
+    ])
+    shots = db.get_shot_tree("RUN_1", 1)
+    assert len(shots) == 150
+    assert shots[0]["camera_config"] == '{"move": "dolly"}'
+
+def test_register_assets_bulk_selects_newest_per_slot(db):
+    old_clip = db.register_asset("S001", "CLIP", "/old.mp4", role="video")
+    old_untagged = db.register_asset("S001", "IMAGE", "/old.png")
+    other_shot = db.register_asset("S002", "CLIP", "/s2.mp4", role="video")
+
+    ids = db.register_assets_bulk([
+        {"shot_id": "S001", "asset_type": "CLIP", "path": "/a.mp4", "role": "video"},
+        {"shot_id": "S001", "asset_type": "CLIP", "path": "/b.mp4", "role": "video"},
+        {"shot_id": "S001", "asset_type": "IMAGE", "path": "/new.png"},
+        {"shot_id": "S001", "asset_type": "PROMPT", "path": "/p.json", "role": "image_prompt", "meta": {"text": "hi"}},
+    ])
+
+    assert len(ids) == 4
+    assert _selected(db, "S001") == {
+        ("CLIP", "video"): ids[1],
+        ("IMAGE", None): ids[2],
+        ("PROMPT", "image_prompt"): ids[3],
+    }
+    assert _selected(db, "S002") == {("CLIP", "video"): other_shot}
+    assert old_clip not in _selected(db, "S001").values()
+    assert old_untagged not in _selected(db, "S001").values()
+
+def test_register_asset_keeps_empty_role_distinct_from_null(db):
+    untagged = db.register_asset("S001", "IMAGE", "/null.png")
+    empty = db.register_asset("S001", "IMAGE", "/empty.png", role="")
+
+    assert _selected(db, "S001") == {("IMAGE", None): untagged, ("IMAGE", ""): empty}
+
+    newer = db.register_asset("S001", "IMAGE", "/null2.png")
+    assert _selected(db, "S001") == {("IMAGE", None): newer, ("IMAGE", ""): empty}
+
+def test_shot_tree_groups_assets_and_prompts(db):
+    db.register_run("RUN_1", 1, "VID_001")
+    db.register_shots_bulk([{"id": sid, "run_id": "RUN_1", "version": 1} for sid in ("S001", "S002")])
+    db.register_assets_bulk([
+        {"shot_id": "S001", "asset_type": "PROMPT", "path": "/p.json", "role": "image_prompt", "meta": {"text": "a cat"}},
+        {"shot_id": "S001", "asset_type": "PROMPT", "path": "/p.json", "role": "video_prompt", "meta": {"text": "it walks"}},
+        {"shot_id": "S001", "asset_type": "CLIP", "path": "/S001.mp4", "role": "video"},
+        {"shot_id": "S002", "asset_type": "PROMPT", "path": "/p.json", "role": "image_prompt"},
+    ])
+    # Malformed metadata is skipped for prompts, but the asset is still listed
+    db._get_connection().execute(
+        "INSERT INTO assets (asset_id, shot_id, type, role, metadata) VALUES ('bad', 'S002', 'PROMPT', 'video_prompt', '{oops')"
+    )
+
+    shots = {s["shot_id"]: s for s in db.get_shot_tree("RUN_1", 1)}
+    assert shots["S001"]["prompts"] == {"image_a": "a cat", "video": "it walks"}
+    assert [a["type"] for a in shots["S001"]["assets"]] == ["PROMPT", "PROMPT", "CLIP"]
+    assert shots["S002"]["prompts"] == {"image_a": ""}
+    assert len(shots["S002"]["assets"]) == 2
+    assert "_prompt_text" not in shots["S001"]["assets"][0]
+
+    single = db.get_single_shot("RUN_1", "S001", 1)
+    assert single["prompts"] == shots["S001"]["prompts"]
+    assert single["video_id"] == "VID_001"
+
+def test_shot_tree_uses_indexes(db):
+    plan = db._get_connection().execute(
+        "EXPLAIN QUERY PLAN SELECT a.* FROM assets a JOIN shots s ON s.shot_id = a.shot_id WHERE s.run_id = ? AND s.version = ?",
+        ("RUN_1", 1)
+    ).fetchall()
+    details = " ".join(row["detail"] for row in plan)
+    assert "idx_shots_run_version" in details
+    assert "idx_assets_shot" in details
+
+def test_list_runs_joins_status_paginates_and_filters(db):
+    conn = db._get_connection()
+    with conn:
+        for i in range(5):
+            conn.execute(
+                "INSERT INTO runs (run_id, version, video_id, created_at) VALUES (?, 1, ?, ?)",
+                (f"RUN_{i}", "VID_A" if i % 2 == 0 else "VID_B", f"2026-01-0{i + 1} 10:00:00")
+            )
+    db.update_run_status("RUN_4", 1, "CLIPS", "running")
+    db.update_run_status("RUN_3", 1, "INGEST", "error: boom")
+
+    page, cursor = db.list_runs(limit=2)
+    assert [r["run_id"] for r in page] == ["RUN_4", "RUN_3"]
+    assert page[0]["status"]["stage_status"] == "running"
+    assert page[0]["status"] == db.get_run_status("RUN_4", 1)
+
+    page, cursor = db.list_runs(limit=2, cursor=cursor)
+    assert [r["run_id"] for r in page] == ["RUN_2", "RUN_1"]
+    assert page[0]["status"] is None
+
+    page, cursor = db.list_runs(limit=2, cursor=cursor)
+    assert [r["run_id"] for r in page] == ["RUN_0"]
+    assert cursor is None
+
+    assert [r["run_id"] for r in db.list_runs(video_id="VID_A")[0]] == ["RUN_4", "RUN_2", "RUN_0"]
+    assert [r["run_id"] for r in db.list_runs(stage="clips")[0]] == ["RUN_4"]
+    assert [r["run_id"] for r in db.list_runs(status="error")[0]] == ["RUN_3"]
+    # LIKE wildcards in the filter are literal
+    assert db.list_runs(status="err%")[0] == []
+    assert db.list_runs(status="erro_")[0] == []
+
+    # No limit: everything, no cursor
+    runs, cursor = db.list_runs()
+    assert len(runs) == 5 and cursor is None
+
+    with pytest.raises(ValueError):
+        db.list_runs(cursor="not-a-cursor")
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import pytest
+from src.clients.download import stream_download
+
+PAYLOAD = bytes(range(256)) * 1000
+
+class FakeResponse:
+    def __init__(self, body, status_code=200, etag=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {"Content-Length": str(len(body))}
+        if etag:
+            self.headers["ETag"] = etag
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+class FakeSession:
+    """Serves `payload`, honouring Range (and If-Range against `etag`) unless told otherwise."""
+    def __init__(self, honour_range=True, payload=PAYLOAD, etag=None):
+        self.honour_range = honour_range
+        self.payload = payload
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False, timeout=None):
+        self.requests.append(headers or {})
+        rng = (headers or {}).get("Range")
+        if_range = (headers or {}).get("If-Range")
+        if rng and self.honour_range and (if_range is None or if_range == self.etag):
+            start = int(rng.split("=")[1].rstrip("-"))
+            return FakeResponse(self.payload[start:], status_code=206, etag=self.etag)
+        return FakeResponse(self.payload, etag=self.etag)
+
+def write_part(dest, data, url, validator=None):
+    with open(dest + ".part", "wb") as f:
+        f.write(data)
+    with open(dest + ".part.src", "w") as f:
+        json.dump({"url": url, "validator": validator}, f)
+
+def test_stream_download_writes_and_hashes(tmp_path):
+    dest = str(tmp_path / "clip.mp4")
+    result = stream_download("http://x/clip.mp4", dest, session=FakeSession(), chunk_size=4096)
+
+    assert open(dest, "rb").read() == PAYLOAD
+    assert result.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    assert result.size_bytes == len(PAYLOAD)
+    assert not os.path.exists(dest + ".part")
+
+@pytest.mark.parametrize("honour_range", [True, False])
+def test_stream_download_resumes_partial_file(tmp_path, honour_range):
+    dest = str(tmp_path / "clip.mp4")
+    write_part(dest, PAYLOAD[:10000], "http://x/clip.mp4")
+
+    session = FakeSession(honour_range=honour_range)
+    result = stream_download("http://x/clip.mp4", dest, session=session)
+
+    assert session.requests[0] == {"Range": "bytes=10000-"}
+    assert result.resumed_from == (10000 if honour_range else 0)
+    assert open(dest, "rb").read() == PAYLOAD
+    assert result.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    assert not os.path.exists(dest + ".part.src")
+
+def test_partial_from_another_url_is_not_spliced(tmp_path):
+    dest = str(tmp_path / "clip.mp4")
+    # Leftover from the previous render of this shot
+    write_part(dest, b"old clip prefix" * 100, "http://x/old.mp4")
+    new_payload = b"new render" * 5000
+
+    session = FakeSession(payload=new_payload)
+    result = stream_download("http://x/new.mp4", dest, session=session)
+
+    assert session.requests[0] == {}
+    assert open(dest, "rb").read() == new_payload
+    assert result.resumed_from == 0 and result.sha256 == hashlib.sha256(new_payload).hexdigest()
+
+def test_changed_resource_is_refetched_whole_via_if_range(tmp_path):
+    dest = str(tmp_path / "clip.mp4")
+    write_part(dest, b"stale" * 100, "http://x/clip.mp4", validator='"v1"')
+
+    session = FakeSession(etag='"v2"')
+    result = stream_download("http://x/clip.mp4", dest, session=session)
+
+    assert session.requests[0] == {"Range": "bytes=500-", "If-Range": '"v1"'}
+    assert result.resumed_from == 0
+    assert open(dest, "rb").read() == PAYLOAD
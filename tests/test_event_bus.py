@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from src.database_manager import DatabaseManager
+from src.foundation.event_bus import EventBus
+
+def test_database_writes_publish_run_events(tmp_path):
+    bus = EventBus()
+    db = DatabaseManager(str(tmp_path / "pipeline.db"), events=bus)
+    db.register_run("RUN_1", 1, "VID_001")
+    db.register_shot({"id": "S001", "run_id": "RUN_1", "version": 1, "script_text": "hello"})
+    db.register_shot({"id": "T001", "run_id": "RUN_2", "version": 1, "script_text": "other run"})
+
+    async def watch():
+        subscription = bus.subscribe("RUN_1", 1)
+        # Writes come from stage threads, not the event loop
+        def stage():
+            db.update_run_status("RUN_1", 1, "CLIPS", "running")
+            db.update_stage_progress("RUN_1", 1, 1, 4, "Clip S001 done")
+            db.register_asset("T001", "CLIP", "/tmp/T001.mp4", role="video")
+            db.register_asset("S001", "CLIP", "/tmp/S001.mp4", role="video")
+        thread = threading.Thread(target=stage)
+        thread.start()
+        await asyncio.to_thread(thread.join)
+
+        events = []
+        while (event := await subscription.get(timeout=0.2)) is not None:
+            events.append(event)
+        subscription.close()
+        return events
+
+    try:
+        events = asyncio.run(watch())
+    finally:
+        db.close()
+
+    assert [e.type for e in events] == ["status", "progress", "asset"]
+    assert events[0].data == {"current_stage": "CLIPS", "stage_status": "running"}
+    assert events[1].data["current"] == 1 and events[1].data["total"] == 4
+    assert events[2].data["shot_id"] == "S001" and events[2].data["is_selected"] is True
+    assert events[0].id < events[1].id < events[2].id
+    assert not bus.has_subscribers()
+
+def test_slow_subscriber_overflows_and_resyncs():
+    bus = EventBus()
+
+    async def watch():
+        subscription = bus.subscribe("RUN_1", max_queue=3)
+        for i in range(5):
+            bus.publish("progress", "RUN_1", 1, {"current": i})
+        await asyncio.sleep(0)  # deliveries run on the loop
+        assert subscription.take_overflow() is True
+        assert subscription.take_overflow() is False
+        bus.publish("progress", "RUN_1", 1, {"current": 9})
+        event = await subscription.get(timeout=1)
+        subscription.close()
+        return event
+
+    assert asyncio.run(watch()).data == {"current": 9}
+
+def test_publish_without_subscribers_is_a_no_op():
+    bus = EventBus()
+    assert bus.publish("status", "RUN_1", 1, {"stage_status": "done"}) is None
+
+def test_asset_selection_change_is_published(tmp_path):
+    bus = EventBus()
+    db = DatabaseManager(str(tmp_path / "pipeline.db"), events=bus)
+    db.register_shot({"id": "S001", "run_id": "RUN_1", "version": 1, "script_text": "hello"})
+    first = db.register_asset("S001", "CLIP", "/tmp/a.mp4", role="video")
+    second = db.register_asset("S001", "CLIP", "/tmp/b.mp4", role="video")
+
+    async def watch():
+        subscription = bus.subscribe("RUN_1", 1)
+        assert db.set_asset_selected(first, True)
+        assert not db.set_asset_selected("missing", True)
+        events = []
+        while (event := await subscription.get(timeout=0.2)) is not None:
+            events.append(event)
+        subscription.close()
+        return events
+
+    try:
+        events = asyncio.run(watch())
+        selected = {r["asset_id"]: r["is_selected"] for r in db._get_connection().execute("SELECT asset_id, is_selected FROM assets")}
+    finally:
+        db.close()
+
+    assert selected == {first: 1, second: 0}
+    assert sorted((e.data["asset_id"], e.data["is_selected"]) for e in events) == sorted([(first, True), (second, False)])
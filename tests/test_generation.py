@@ -0,0 +1,213 @@
+import json
+import time
+import threading
+from concurrent.futures import Future
+import pytest
+from src.clients.download import write_atomic
+from src.generation import ImageGenerator, ClipGenerator
+from src.models import GenerationMode, NanobananaRequest, PairRole, VeoRequest
+
+@pytest.fixture(autouse=True)
+def no_generation_cache(monkeypatch):
+    monkeypatch.setenv("GENERATION_CACHE", "0")
+    monkeypatch.delenv("ALIGNMENT_MODE", raising=False)
+    monkeypatch.delenv("DISABLE_IMG2IMG", raising=False)
+
+class FakeImageClient:
+    """Writes "png:<shot>_<role>" and tracks concurrency and init images per call."""
+    model_id = "fake"
+
+    def __init__(self, delay=0.02, fail_shot=None):
+        self.delay = delay
+        self.fail_shot = fail_shot
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate_image(self, req, dest_path):
+        with self._lock:
+            self.calls.append((req.shot_id, req.pair_role, req.image_input_path))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if req.shot_id == self.fail_shot:
+                raise RuntimeError(f"render failed for {req.shot_id}")
+            name = f"{req.shot_id}_{req.pair_role.value}"
+            return write_atomic(dest_path, f"png:{name}".encode()), f"https://cdn/{name}.png"
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+def pair(shot_id):
+    common = dict(beat_id="B1", negative_prompt="text", style_bible_hash="h", seed=12345)
+    return [
+        NanobananaRequest(request_id=f"R_{shot_id}_a", shot_id=shot_id, pair_role=PairRole.START_REF, prompt=f"{shot_id} before", **common),
+        NanobananaRequest(request_id=f"R_{shot_id}_b", shot_id=shot_id, pair_role=PairRole.END_REF, prompt=f"{shot_id} after", **common),
+    ]
+
+def make_generator(tmp_path, client, max_workers=2):
+    generator = ImageGenerator(str(tmp_path / "run"), max_workers=max_workers)
+    generator.client = client
+    return generator
+
+def test_shots_run_in_parallel_with_stable_output_order(tmp_path):
+    client = FakeImageClient()
+    requests = [req for shot in ["S04", "S02", "S03", "S01"] for req in pair(shot)]
+
+    files = make_generator(tmp_path, client).generate_images(requests, GenerationMode.REAL)
+
+    assert client.max_in_flight == 2
+    assert [f.rsplit("/", 1)[-1] for f in files] == [
+        f"S0{i}_{role}.png" for i in range(1, 5) for role in ("start_ref", "end_ref")
+    ]
+    # A before B inside every shot
+    for shot in ["S01", "S02", "S03", "S04"]:
+        roles = [role for shot_id, role, _ in client.calls if shot_id == shot]
+        assert roles == [PairRole.START_REF, PairRole.END_REF]
+
+def test_clean_score_binds_end_frame_to_start_url(tmp_path, monkeypatch):
+    monkeypatch.setenv("ALIGNMENT_MODE", "CLEAN_SCORE")
+    client = FakeImageClient(delay=0)
+
+    make_generator(tmp_path, client).generate_images(pair("S01"), GenerationMode.REAL)
+
+    end_call = [c for c in client.calls if c[1] == PairRole.END_REF][0]
+    assert end_call[2] == "https://cdn/S01_start_ref.png"
+
+def test_binding_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("ALIGNMENT_MODE", "CLEAN_SCORE")
+    monkeypatch.setenv("DISABLE_IMG2IMG", "1")
+    client = FakeImageClient(delay=0)
+
+    make_generator(tmp_path, client).generate_images(pair("S01"), GenerationMode.REAL)
+
+    assert all(init is None for _, _, init in client.calls)
+
+def test_url_map_is_persisted_and_reused_for_binding_on_rerun(tmp_path, monkeypatch):
+    monkeypatch.setenv("ALIGNMENT_MODE", "CLEAN_SCORE")
+    make_generator(tmp_path, FakeImageClient(delay=0)).generate_images(pair("S01"), GenerationMode.REAL)
+
+    url_map = json.loads((tmp_path / "run" / "image_urls.json").read_text())
+    assert url_map == {
+        "S01_start_ref.png": "https://cdn/S01_start_ref.png",
+        "S01_end_ref.png": "https://cdn/S01_end_ref.png",
+    }
+
+    # A exists on disk: it is skipped, and B is bound to A's URL from the map
+    (tmp_path / "run" / "assets" / "S01_end_ref.png").unlink()
+    client = FakeImageClient(delay=0)
+    make_generator(tmp_path, client).generate_images(pair("S01"), GenerationMode.REAL)
+
+    assert client.calls == [("S01", PairRole.END_REF, "https://cdn/S01_start_ref.png")]
+
+def test_one_failing_shot_raises_and_keeps_finished_urls(tmp_path):
+    client = FakeImageClient(fail_shot="S02")
+    requests = pair("S01") + pair("S02") + pair("S03")
+
+    with pytest.raises(RuntimeError, match="S02"):
+        make_generator(tmp_path, client, max_workers=3).generate_images(requests, GenerationMode.REAL)
+
+    url_map = json.loads((tmp_path / "run" / "image_urls.json").read_text())
+    assert "S01_end_ref.png" in url_map and "S03_end_ref.png" in url_map
+    assert not any(name.startswith("S02") for name in url_map)
+    # The failed shot never got to its B frame
+    assert ("S02", PairRole.END_REF) not in [(s, r) for s, r, _ in client.calls]
+
+class FakeVeoClient:
+    """submit_clip returns task ids; jobs complete on a timer thread like the shared poller."""
+    model_id = "fake-veo"
+    mock_mode = False
+
+    def __init__(self, delay=0.05, fail_submit=None):
+        self.delay = delay
+        self.fail_submit = fail_submit
+        self.submitted = []
+        self.collected = []
+        self.outstanding = 0
+        self.max_outstanding = 0
+        self._lock = threading.Lock()
+
+    def submit_clip(self, req):
+        if req.shot_id == self.fail_submit:
+            raise RuntimeError(f"createTask rejected {req.shot_id}")
+        with self._lock:
+            self.submitted.append(req.shot_id)
+        return f"task_{req.shot_id}"
+
+    def collect_clip_async(self, task_id, dest_path):
+        future = Future()
+        with self._lock:
+            self.collected.append(task_id)
+            self.outstanding += 1
+            self.max_outstanding = max(self.max_outstanding, self.outstanding)
+
+        def land():
+            with self._lock:
+                self.outstanding -= 1
+            future.set_result((write_atomic(dest_path, task_id.encode()), f"https://cdn/{task_id}.mp4"))
+        threading.Timer(self.delay, land).start()
+        return future
+
+def clip(shot_id):
+    return VeoRequest(request_id=f"V_{shot_id}", shot_id=shot_id, beat_id="B1", prompt=f"{shot_id} push in",
+                      duration_s=8.0, style_profile_id="style", negative_profile_id="neg")
+
+def make_clip_generator(tmp_path, client, max_in_flight=2):
+    generator = ClipGenerator(str(tmp_path / "run"), max_in_flight=max_in_flight, submit_interval_s=0)
+    generator.client = client
+    return generator
+
+def read_tasks(tmp_path):
+    return json.loads((tmp_path / "run" / "veo_tasks.json").read_text())
+
+def test_fanout_bounds_jobs_in_flight_and_keeps_request_order(tmp_path):
+    client = FakeVeoClient()
+    shots = ["S01", "S02", "S03", "S04", "S05"]
+
+    files = make_clip_generator(tmp_path, client).generate_clips([clip(s) for s in shots], GenerationMode.REAL)
+
+    assert files == [f"{s}.mp4" for s in shots]
+    assert client.max_outstanding <= 2
+    assert {shot: t["status"] for shot, t in read_tasks(tmp_path).items()} == {s: "done" for s in shots}
+    assert (tmp_path / "run" / "assets" / "S03.mp4").read_bytes() == b"task_S03"
+
+def test_fanout_resumes_submitted_tasks_from_veo_tasks_json(tmp_path):
+    (tmp_path / "run").mkdir()
+    (tmp_path / "run" / "veo_tasks.json").write_text(json.dumps({
+        "S01": {"task_id": "task_earlier", "request_id": "V_S01", "status": "submitted"},
+        # Another request for the shot (prompt changed): must be submitted again
+        "S02": {"task_id": "task_stale", "request_id": "V_OLD", "status": "submitted"},
+    }))
+    client = FakeVeoClient(delay=0.01)
+
+    make_clip_generator(tmp_path, client).generate_clips([clip("S01"), clip("S02")], GenerationMode.REAL)
+
+    assert client.submitted == ["S02"]
+    assert sorted(client.collected) == ["task_S02", "task_earlier"]
+    assert read_tasks(tmp_path)["S01"]["status"] == "done"
+
+def test_failed_submission_aborts_remaining_and_lands_in_flight(tmp_path):
+    client = FakeVeoClient(fail_submit="S02")
+
+    with pytest.raises(RuntimeError, match="S02"):
+        make_clip_generator(tmp_path, client).generate_clips([clip(s) for s in ["S01", "S02", "S03"]], GenerationMode.REAL)
+
+    assert client.submitted == ["S01"]  # S03 never submitted
+    tasks = read_tasks(tmp_path)
+    assert tasks["S01"]["status"] == "done" and "S03" not in tasks
+    assert (tmp_path / "run" / "assets" / "S01.mp4").exists()
+
+def test_placeholders_replace_adopted_clips_without_touching_the_blob(tmp_path):
+    from src.foundation.blob_store import BlobStore
+    store = BlobStore(str(tmp_path / "store"))
+    generator = make_clip_generator(tmp_path, client=None)
+    clip_path = tmp_path / "run" / "assets" / "S001.mp4"
+    clip_path.write_bytes(b"real render")
+    digest = store.adopt(str(clip_path))
+
+    assert generator._generate_placeholders([clip("S001")]) == ["S001.mp4"]
+
+    assert open(store.blob_path(digest), "rb").read() == b"real render"
+    assert clip_path.read_bytes().startswith(b"\x00\x00\x00\x20ftyp")
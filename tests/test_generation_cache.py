@@ -0,0 +1,93 @@
+import os
+import pytest
+from src.cache.generation_cache import GenerationCache
+from src.clients.download import write_atomic
+from src.database_manager import DatabaseManager
+from src.generation import ImageGenerator, ClipGenerator
+from src.models import GenerationMode, NanobananaRequest, PairRole, VeoRequest
+
+@pytest.fixture
+def cache(tmp_path):
+    db = DatabaseManager(str(tmp_path / "pipeline.db"))
+    yield GenerationCache(db)
+    db.close()
+
+def image_request(shot_id, prompt="a lighthouse at dusk"):
+    return NanobananaRequest(
+        request_id=f"R_{shot_id}", shot_id=shot_id, beat_id="B1", pair_role=PairRole.START_REF,
+        prompt=prompt, negative_prompt="text", style_bible_hash="h", seed=12345,
+    )
+
+def clip_request(shot_id, prompt="slow push in"):
+    return VeoRequest(
+        request_id=f"V_{shot_id}", shot_id=shot_id, beat_id="B1", prompt=prompt, duration_s=8.0,
+        style_profile_id="style", negative_profile_id="neg",
+    )
+
+def counting_image_client(generator, calls):
+    def generate_image(req, dest_path):
+        calls.append(req.shot_id)
+        return write_atomic(dest_path, f"png:{req.prompt}".encode()), f"https://cdn/{req.shot_id}.png"
+    generator.client.generate_image = generate_image
+
+def test_image_cache_reuses_renders_across_runs(tmp_path, cache):
+    calls = []
+    run1 = ImageGenerator(str(tmp_path / "run1"), max_workers=2, cache=cache)
+    counting_image_client(run1, calls)
+    run1.generate_images([image_request("S01"), image_request("S02", "a harbour")], GenerationMode.REAL)
+    assert sorted(calls) == ["S01", "S02"]
+
+    # Next version: S02's prompt was tweaked, S01 is unchanged
+    calls.clear()
+    run2 = ImageGenerator(str(tmp_path / "run2"), max_workers=2, cache=cache)
+    counting_image_client(run2, calls)
+    files = run2.generate_images([image_request("S01"), image_request("S02", "a harbour at dawn")], GenerationMode.REAL)
+
+    assert calls == ["S02"]
+    reused = tmp_path / "run2" / "assets" / "S01_start_ref.png"
+    assert reused.read_bytes() == b"png:a lighthouse at dusk"
+    assert [os.path.basename(f) for f in files] == ["S01_start_ref.png", "S02_start_ref.png"]
+
+def test_existing_file_is_rerendered_when_inputs_change(tmp_path, cache):
+    calls = []
+    generator = ImageGenerator(str(tmp_path / "run"), max_workers=1, cache=cache)
+    counting_image_client(generator, calls)
+    generator.generate_images([image_request("S01")], GenerationMode.REAL)
+    generator.generate_images([image_request("S01")], GenerationMode.REAL)
+    assert calls == ["S01"]
+
+    generator.generate_images([image_request("S01", "a storm")], GenerationMode.REAL)
+    assert calls == ["S01", "S01"]
+    assert (tmp_path / "run" / "assets" / "S01_start_ref.png").read_bytes() == b"png:a storm"
+
+def test_clip_cache_skips_submission(tmp_path, cache):
+    submitted = []
+    def make_generator(run):
+        generator = ClipGenerator(str(tmp_path / run), max_in_flight=1, submit_interval_s=0, cache=cache)
+        def generate_clip(req, dest_path):
+            submitted.append(req.shot_id)
+            return write_atomic(dest_path, b"mp4"), f"https://cdn/{req.shot_id}.mp4"
+        generator.client.generate_clip = generate_clip
+        return generator
+
+    make_generator("run1").generate_clips([clip_request("S01")], GenerationMode.REAL)
+    files = make_generator("run2").generate_clips([clip_request("S01")], GenerationMode.REAL)
+
+    assert submitted == ["S01"]
+    assert files == ["S01.mp4"]
+    assert (tmp_path / "run2" / "assets" / "S01.mp4").read_bytes() == b"mp4"
+
+def test_cache_hits_share_one_blob(tmp_path):
+    from src.foundation.blob_store import BlobStore
+    db = DatabaseManager(str(tmp_path / "pipeline.db"))
+    cache = GenerationCache(db, BlobStore(str(tmp_path / "store")))
+    calls = []
+    for run in ("run1", "run2"):
+        generator = ImageGenerator(str(tmp_path / run), max_workers=1, cache=cache)
+        counting_image_client(generator, calls)
+        generator.generate_images([image_request("S01")], GenerationMode.REAL)
+    db.close()
+
+    assert calls == ["S01"]
+    assert os.path.samefile(tmp_path / "run1" / "assets" / "S01_start_ref.png",
+                            tmp_path / "run2" / "assets" / "S01_start_ref.png")
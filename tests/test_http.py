@@ -0,0 +1,13 @@
+from src.clients.http import build_retry, build_session, get_session
+
+def test_retry_policy_never_resends_post_on_status():
+    retry = build_retry()
+    assert retry.is_retry("GET", 503)
+    assert retry.is_retry("GET", 429)
+    assert not retry.is_retry("POST", 503)
+    assert not retry.is_retry("GET", 404)
+
+def test_session_is_shared_and_pooled():
+    assert get_session() is get_session()
+    adapter = build_session(pool_maxsize=7).get_adapter("https://api.kie.ai")
+    assert adapter._pool_maxsize == 7
@@ -0,0 +1,41 @@
+import os
+import wave
+from src.foundation.blob_store import BlobStore
+from src.foundation.hashing import hash_file_sha256
+from src.foundation.ingest import ingest_file, ingest_files, HEAD_BYTES
+
+def write_wav(path, seconds, rate=16000):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00\x00" * int(seconds * rate))
+
+def test_ingest_hashes_stores_and_sniffs_in_one_pass(tmp_path):
+    store = BlobStore(str(tmp_path / "store"))
+    audio = tmp_path / "voiceover.wav"
+    write_wav(audio, 3.5)
+
+    result = ingest_file(str(audio), store)
+
+    assert result.sha256 == hash_file_sha256(str(audio))
+    assert result.size_bytes == os.path.getsize(audio)
+    assert len(result.head) == min(HEAD_BYTES, result.size_bytes)
+    assert result.wav_duration_s == 3.5
+    assert store.has(result.sha256)
+    assert not [name for name in os.listdir(store.root) if name.startswith(".incoming")]
+
+def test_ingest_files_skips_missing_and_detects_locked_bible(tmp_path):
+    store = BlobStore(str(tmp_path / "store"))
+    bible = tmp_path / "bible.md"
+    bible.write_text("# Style Bible\nSTATUS: LOCKED\n")
+    script = tmp_path / "script.txt"
+    script.write_text("Hello")
+
+    results = ingest_files({"script": str(script), "style_bible": str(bible), "audio": str(tmp_path / "missing.mp3")}, store)
+
+    assert results["audio"] is None
+    assert results["style_bible"].locked
+    assert not results["script"].locked and results["script"].wav_duration_s is None
+    # Same content ingested twice reuses the blob
+    assert ingest_file(str(script), store).sha256 == results["script"].sha256
@@ -0,0 +1,82 @@
+import time
+import asyncio
+import threading
+import pytest
+from src.llm import (
+    LLMClient, LLMMessage, LLMRequest, LLMJsonRequest, LLMResponse, LLMError,
+    CachingLLMClient, LLMResponseCache, generate_many, agenerate_many
+)
+
+class SlowClient(LLMClient):
+    """Sync-only client: the async interface falls back to worker threads."""
+    def __init__(self, delay=0.05, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _call(self, req):
+        content = req.messages[-1].content
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if content == self.fail_on:
+                raise LLMError(f"boom: {content}")
+            return LLMResponse(text=content, json={"echo": content}, provider="fake", model=req.model)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def generate_text(self, req):
+        return self._call(req)
+
+    def generate_json(self, req):
+        return self._call(req)
+
+def text_request(content):
+    return LLMRequest(messages=[LLMMessage(role="user", content=content)], model="gpt-4o-mini")
+
+def json_request(content):
+    return LLMJsonRequest(messages=[LLMMessage(role="user", content=content)], model="gpt-4o-mini", json_schema={"type": "object"})
+
+def test_generate_many_preserves_order_and_bounds_concurrency():
+    client = SlowClient()
+    requests = [json_request(f"chunk {i}") for i in range(6)] + [text_request("plain")]
+
+    responses = generate_many(client, requests, max_concurrency=3)
+
+    assert [r.text for r in responses] == [f"chunk {i}" for i in range(6)] + ["plain"]
+    assert responses[0].json == {"echo": "chunk 0"}
+    assert client.max_in_flight == 3
+
+def test_generate_many_raises_first_failure_and_skips_queued():
+    client = SlowClient(fail_on="chunk 0")
+    requests = [json_request(f"chunk {i}") for i in range(6)]
+
+    with pytest.raises(LLMError, match="boom"):
+        generate_many(client, requests, max_concurrency=1)
+    # The slot freed by the failure may start one more request; the rest never run
+    assert client.calls <= 2
+
+def test_generate_many_refuses_running_loop():
+    async def inside_loop():
+        with pytest.raises(LLMError, match="agenerate_many"):
+            generate_many(SlowClient(), [text_request("x")])
+        return await agenerate_many(SlowClient(delay=0), [text_request("x")])
+
+    assert [r.text for r in asyncio.run(inside_loop())] == ["x"]
+
+def test_caching_client_async_path(tmp_path):
+    inner = SlowClient(delay=0)
+    client = CachingLLMClient(inner, LLMResponseCache(str(tmp_path / "llm.db")))
+
+    first = asyncio.run(client.agenerate_json(json_request("same")))
+    second = generate_many(client, [json_request("same"), json_request("other")])
+
+    assert inner.calls == 2
+    assert second[0].json == first.json and second[0].latency_ms == 0
@@ -0,0 +1,117 @@
+import time
+from src.llm import (
+    LLMClient, LLMMessage, LLMRequest, LLMJsonRequest, LLMResponse, LLMUsage,
+    CachingLLMClient, LLMResponseCache
+)
+
+class CountingClient(LLMClient):
+    def __init__(self):
+        self.calls = 0
+
+    def generate_text(self, req):
+        self.calls += 1
+        return LLMResponse(text=f"answer {self.calls}", usage=LLMUsage(1, 2, 3), provider="fake", model=req.model, raw={"big": "payload"})
+
+    def generate_json(self, req):
+        self.calls += 1
+        return LLMResponse(text='{"n": 1}', json={"n": self.calls}, provider="fake", model=req.model)
+
+def json_request(content="Segment this script", step_name="BEAT_SEGMENTER", run_id="run_1", **kwargs):
+    return LLMJsonRequest(
+        messages=[LLMMessage(role="user", content=content)], model="gpt-4o-mini",
+        json_schema={"type": "object"}, step_name=step_name, run_id=run_id, **kwargs
+    )
+
+def test_identical_requests_hit_across_runs(tmp_path):
+    inner = CountingClient()
+    client = CachingLLMClient(inner, LLMResponseCache(str(tmp_path / "llm.db")))
+
+    first = client.generate_json(json_request(run_id="run_1"))
+    # A new process / resumed run: same prompt, different tracing metadata
+    reopened = CachingLLMClient(inner, LLMResponseCache(str(tmp_path / "llm.db")))
+    second = reopened.generate_json(json_request(run_id="run_2"))
+
+    assert inner.calls == 1
+    assert second.json == first.json and second.latency_ms == 0
+
+    # Anything that changes the completion misses
+    client.generate_json(json_request(content="Edited script"))
+    client.generate_json(json_request(temperature=0.9))
+    assert inner.calls == 3
+
+def test_text_responses_are_only_cached_on_opt_in(tmp_path):
+    inner = CountingClient()
+    client = CachingLLMClient(inner, LLMResponseCache(str(tmp_path / "llm.db")))
+    req = LLMRequest(messages=[LLMMessage(role="user", content="hi")], model="m")
+
+    # Unvalidated text: never replayed by default
+    client.generate_text(req)
+    client.generate_text(req)
+    assert inner.calls == 2
+
+    req.tags = {"cache": "on"}
+    client.generate_text(req)
+    cached = client.generate_text(req)
+
+    assert inner.calls == 3
+    assert cached.text == "answer 3" and cached.usage.total_tokens == 3 and cached.raw is None
+
+def test_rejected_response_is_invalidated(tmp_path):
+    inner = CountingClient()
+    client = CachingLLMClient(inner, LLMResponseCache(str(tmp_path / "llm.db")))
+    req = json_request()
+
+    client.generate_json(req)
+    client.invalidate(req)  # caller couldn't use it
+    assert client.generate_json(req).json == {"n": 2}
+    assert client.generate_json(req).json == {"n": 2}
+    assert inner.calls == 2
+
+def test_relative_cache_path_is_anchored_to_project_root(tmp_path, monkeypatch):
+    from src.foundation import paths
+    monkeypatch.setattr(paths, "BASE_DIR", str(tmp_path / "project"))
+    monkeypatch.setenv("LLM_CACHE_PATH", "cache/llm.db")
+    monkeypatch.chdir(tmp_path)
+
+    assert LLMResponseCache().path == str(tmp_path / "project" / "cache" / "llm.db")
+
+def test_opt_out_per_step_and_per_request(tmp_path):
+    inner = CountingClient()
+    client = CachingLLMClient(inner, LLMResponseCache(str(tmp_path / "llm.db")), skip_steps=["VISUAL_PLANNER"])
+
+    for _ in range(2):
+        client.generate_json(json_request(step_name="VISUAL_PLANNER"))
+        client.generate_json(json_request(tags={"cache": "off"}))
+    assert inner.calls == 4
+
+def test_ttl_and_lru_eviction(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.db"), ttl_s=60, max_bytes=920)  # ~174 bytes per entry: room for 5
+    for i in range(5):
+        cache.put(f"k{i}", LLMResponse(text="x" * 60))
+        time.sleep(0.01)
+    cache.get("k0")  # refresh: k0 is now most recently used
+    cache.put("k5", LLMResponse(text="x" * 60))
+
+    assert cache.get("k0") is not None and cache.get("k5") is not None
+    assert cache.get("k1") is None  # least recently used went first
+
+    cache.ttl_s = 0.001
+    time.sleep(0.01)
+    assert cache.get("k5") is None
+
+def test_beat_segmenter_invalidates_unparseable_cached_response(tmp_path):
+    import pytest
+    from src.agents.beat_segmenter import BeatSegmenterAgent
+
+    class BadBeats(CountingClient):
+        def generate_json(self, req):
+            self.calls += 1
+            # Passes the schema but not BeatLLMResponse
+            return LLMResponse(text="", json={"beats": [{"order": 1}]}, provider="fake", model=req.model)
+
+    inner = BadBeats()
+    agent = BeatSegmenterAgent(CachingLLMClient(inner, LLMResponseCache(str(tmp_path / "llm.db"))))
+    for _ in range(2):
+        with pytest.raises(TypeError):
+            agent._get_segmentation_from_llm("run_1", "1: Hello.", 1, 3)
+    assert inner.calls == 2
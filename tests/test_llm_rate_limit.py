@@ -0,0 +1,118 @@
+import json
+import pytest
+import requests
+from src.llm import rate_limit
+from src.llm.rate_limit import RateGovernor, estimate_tokens, parse_retry_after
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+def test_rpm_bucket_holds_calls_over_budget(clock):
+    governor = RateGovernor(rpm=2, tpm=0)
+
+    governor.acquire("openai", "gpt-4o-mini", 10)
+    governor.acquire("openai", "gpt-4o-mini", 10)
+    assert clock.slept == []
+
+    governor.acquire("openai", "gpt-4o-mini", 10)
+    assert sum(clock.slept) == pytest.approx(30.0)  # 2/min refills one request every 30s
+
+    # Other models have their own budget
+    governor.acquire("openai", "gpt-4o", 10)
+    assert sum(clock.slept) == pytest.approx(30.0)
+
+def test_tpm_estimate_is_corrected_from_usage(clock):
+    governor = RateGovernor(rpm=0, tpm=1000)
+
+    lease = governor.acquire("openai", "gpt-4o-mini", 800)
+    lease.record(100)  # the completion was much shorter than max_tokens
+    governor.acquire("openai", "gpt-4o-mini", 800)
+    assert clock.slept == []
+
+    # Without usage the estimate stays charged
+    governor.acquire("openai", "gpt-4o-mini", 500)
+    assert sum(clock.slept) == pytest.approx(400 / (1000 / 60))
+
+def test_retry_after_pauses_every_caller(clock):
+    governor = RateGovernor(rpm=100, tpm=0)
+
+    governor.penalize("openai", "gpt-4o-mini", parse_retry_after({"retry-after": "7"}))
+    governor.acquire("openai", "gpt-4o-mini", 10)
+
+    assert sum(clock.slept) == pytest.approx(7.0)
+
+def test_parse_retry_after_formats():
+    assert parse_retry_after({"retry-after-ms": "1500", "retry-after": "9"}) == 1.5
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0  # in the past
+    assert parse_retry_after({}) is None
+    assert estimate_tokens(400, max_tokens=100) == 200
+
+def test_agent_client_goes_through_governor(monkeypatch, clock):
+    from src.clients.agent import AgentClient
+
+    monkeypatch.setenv("AGENT_API_KEY", "sk-test")
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.setenv("AGENT_MOCK_MODE", "0")
+
+    class FakeSession:
+        def __init__(self, responses):
+            self.responses = responses
+
+        def post(self, url, json=None, **kwargs):
+            return self.responses.pop(0)
+
+    def response(status, body, headers=None):
+        r = requests.Response()
+        r.status_code = status
+        r._content = json.dumps(body).encode()
+        r.headers.update(headers or {})
+        return r
+
+    client = AgentClient()
+    client.governor = RateGovernor(rpm=0, tpm=10_000)
+    client.http = FakeSession([
+        response(429, {"error": "slow down"}, {"Retry-After": "12"}),
+        response(200, {"choices": [{"message": {"content": "ok"}}], "usage": {"total_tokens": 50}}),
+    ])
+
+    assert client._call_llm("sys", "user").endswith("[ERROR_FALLBACK]")
+    assert client._call_llm("sys", "user") == "ok"
+    assert sum(clock.slept) == pytest.approx(12.0)
+
+@pytest.mark.parametrize("status, retried", [(400, False), (401, False), (404, False), (429, True), (500, True), (503, True)])
+def test_openai_client_retries_only_transient_errors(monkeypatch, status, retried):
+    import httpx
+    from openai import APIStatusError, RateLimitError, InternalServerError
+    from tenacity import wait_none
+    from src.llm import OpenAIClient, LLMMessage, LLMRequest, LLMError
+
+    client = OpenAIClient(api_key="sk-test", governor=RateGovernor(rpm=0, tpm=0))
+    monkeypatch.setattr(OpenAIClient._call_openai.retry, "wait", wait_none())
+    error_type = {429: RateLimitError}.get(status, InternalServerError if status >= 500 else APIStatusError)
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        response = httpx.Response(status, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+        raise error_type(f"HTTP {status}", response=response, body=None)
+    monkeypatch.setattr(client.client.chat.completions, "create", create)
+
+    with pytest.raises(LLMError):
+        client.generate_text(LLMRequest(messages=[LLMMessage(role="user", content="hi")], model="gpt-4o-mini"))
+    assert len(calls) == (3 if retried else 1)
@@ -0,0 +1,71 @@
+import pytest
+from types import SimpleNamespace
+from src.foundation import media_probe
+from src.foundation.media_probe import MediaProbe, MediaInfo, FFprobeNotFound
+
+FFPROBE_JSON = {
+    "streams": [
+        {"index": 0, "codec_type": "video", "codec_name": "h264", "width": 1280, "height": 720,
+         "pix_fmt": "yuv420p", "r_frame_rate": "24/1", "avg_frame_rate": "24/1", "duration": "8.000000"},
+        {"index": 1, "codec_type": "audio", "codec_name": "aac", "sample_rate": "48000", "channels": 2},
+    ],
+    "format": {"duration": "8.021333", "format_name": "mov,mp4,m4a,3gp,3g2,mj2"},
+}
+
+def test_from_ffprobe_parses_streams():
+    info = MediaInfo.from_ffprobe("/x/clip.mp4", 1234, FFPROBE_JSON)
+    assert info.duration_s == pytest.approx(8.021333)
+    assert (info.width, info.height, info.fps, info.codec) == (1280, 720, 24.0, "h264")
+    assert info.audio.sample_rate == 48000
+    assert MediaInfo.from_dict(info.to_dict()) == info
+
+def test_probe_is_cached_in_memory_and_on_disk(tmp_path, monkeypatch):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"v1")
+    calls = []
+
+    def fake_run(self, abs_path, size_bytes):
+        calls.append(abs_path)
+        return MediaInfo.from_ffprobe(abs_path, size_bytes, FFPROBE_JSON)
+    monkeypatch.setattr(MediaProbe, "_run_ffprobe", fake_run)
+
+    cache_dir = str(tmp_path / "probe_cache")
+    probe = MediaProbe(cache_dir=cache_dir)
+    probe.probe(str(clip))
+    probe.probe(str(clip))
+    assert len(calls) == 1
+
+    # A new process (fresh instance) reads the disk cache
+    assert MediaProbe(cache_dir=cache_dir).probe(str(clip)).width == 1280
+    assert len(calls) == 1
+
+    # Changing the file invalidates the entry
+    clip.write_bytes(b"v2 longer")
+    probe.probe(str(clip))
+    assert len(calls) == 2
+
+def test_probe_many_returns_none_for_unreadable(tmp_path, monkeypatch):
+    good = [tmp_path / f"c{i}.mp4" for i in range(5)]
+    for p in good:
+        p.write_bytes(b"x")
+    monkeypatch.setattr(MediaProbe, "_run_ffprobe",
+                        lambda self, path, size: MediaInfo.from_ffprobe(path, size, FFPROBE_JSON))
+    probe = MediaProbe(cache_dir=str(tmp_path / "cache"))
+    paths = [str(p) for p in good] + [str(tmp_path / "missing.mp4")]
+
+    results = probe.probe_many(paths)
+
+    assert all(results[str(p)].duration_s > 8 for p in good)
+    assert results[str(tmp_path / "missing.mp4")] is None
+
+def test_audio_duration_falls_back_to_mutagen_without_ffprobe(tmp_path, monkeypatch):
+    import mutagen.mp3
+    audio = tmp_path / "vo.mp3"
+    audio.write_bytes(b"mp3")
+    monkeypatch.setattr(media_probe, "find_ffprobe", lambda: None)
+    monkeypatch.setattr(media_probe, "_probe", MediaProbe(cache_dir=str(tmp_path / "cache")))
+    monkeypatch.setattr(mutagen.mp3, "MP3", lambda path: SimpleNamespace(info=SimpleNamespace(length=42.5)))
+
+    with pytest.raises(FFprobeNotFound):
+        media_probe.get_media_probe().probe(str(audio))
+    assert media_probe.probe_audio_duration(str(audio)) == 42.5
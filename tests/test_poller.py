@@ -0,0 +1,73 @@
+import pytest
+import threading
+from concurrent.futures import Future
+from src.clients.poller import TaskPoller, PollPolicy, chain
+from src.clients.veo import VeoClient
+
+FAST_POLICY = PollPolicy(
+    name="Test", initial_delay_s=0.0, interval_s=0.01,
+    max_interval_s=0.05, backoff_after_s=0.05, timeout_s=0.5
+)
+
+def test_poller_multiplexes_many_tasks():
+    poller = TaskPoller(workers=2)
+    calls = {}
+    lock = threading.Lock()
+
+    def check(task_id, attempt, elapsed_s):
+        with lock:
+            calls[task_id] = attempt
+        # Every task needs 3 checks before it is done
+        return f"url-{task_id}" if attempt >= 3 else None
+
+    futures = {f"t{i}": poller.track(f"t{i}", check, FAST_POLICY) for i in range(50)}
+    for task_id, future in futures.items():
+        assert future.result(timeout=5) == f"url-{task_id}"
+
+    assert all(attempt == 3 for attempt in calls.values())
+    assert poller.pending() == 0
+
+def test_poller_propagates_failure_and_timeout():
+    poller = TaskPoller(workers=1)
+
+    def failing(task_id, attempt, elapsed_s):
+        raise RuntimeError("Generation Failed")
+
+    def never_done(task_id, attempt, elapsed_s):
+        return None
+
+    failed = poller.track("bad", failing, FAST_POLICY)
+    stuck = poller.track("slow", never_done, FAST_POLICY)
+
+    with pytest.raises(RuntimeError, match="Generation Failed"):
+        failed.result(timeout=5)
+    with pytest.raises(TimeoutError, match="slow"):
+        stuck.result(timeout=5)
+
+def test_chain_runs_after_poll():
+    poller = TaskPoller(workers=1)
+    future = poller.track("t1", lambda task_id, attempt, elapsed_s: "url", FAST_POLICY)
+    downloaded = chain(future, lambda url: (b"bytes", url))
+    assert downloaded.result(timeout=5) == (b"bytes", "url")
+
+def test_veo_clients_share_the_download_pool(tmp_path, monkeypatch):
+    monkeypatch.setenv("KIE_API_KEY", "test")
+    before = threading.active_count()
+    clients = [VeoClient() for _ in range(20)]
+    assert threading.active_count() == before  # no per-client pools
+
+    ran_on = []
+    def poll_async(task_id):
+        done = Future()
+        done.set_result(f"https://cdn/{task_id}.mp4")
+        return done
+    def download(url, dest_path):
+        ran_on.append(threading.current_thread().name)
+        return url
+
+    for client in clients[:2]:
+        client.poll_async = poll_async
+        client._download_video = download
+        assert client.collect_clip_async("t1", str(tmp_path / "c.mp4")).result(timeout=5)[1] == "https://cdn/t1.mp4"
+
+    assert all(name.startswith("kie-dl") for name in ran_on)
@@ -0,0 +1,171 @@
+import threading
+import time
+from src.database_manager import DatabaseManager
+from src.foundation.progress import ProgressReporter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeTimer:
+    """Stands in for threading.Timer; tests fire it by hand."""
+    def __init__(self, delay, fn):
+        self.delay, self.fn = delay, fn
+        self.cancelled = False
+        FakeTimer.armed.append(self)
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        self.cancelled = True
+
+    def fire(self):
+        if not self.cancelled:
+            self.fn()
+
+def make_reporter(writes, clock, **kwargs):
+    kwargs.setdefault("min_interval_ms", 1000)
+    kwargs.setdefault("min_step_pct", 10)
+    kwargs.setdefault("timer", FakeTimer)
+    FakeTimer.armed = []
+    return ProgressReporter(lambda c, t, m: writes.append((c, t, m)), clock=clock, **kwargs)
+
+def test_updates_are_coalesced_by_interval_and_step():
+    writes, clock = [], FakeClock()
+    progress = make_reporter(writes, clock)
+
+    progress.start(100, "Rendering")
+    for i in range(1, 10):
+        progress.update(i)          # < 10% and < 1s since the last write
+    assert writes == [(0, 100, "Rendering")]
+
+    progress.update(10)             # 10% step
+    clock.now = 1.5
+    progress.update(11)             # interval elapsed
+    progress.update(12)
+    assert [w[0] for w in writes] == [0, 10, 11]
+
+    progress.update(100)            # completion always writes
+    assert writes[-1][0] == 100
+
+def test_pending_updates_are_written_when_the_interval_elapses():
+    writes, clock = [], FakeClock()
+    progress = make_reporter(writes, clock)
+
+    progress.start(100, "Rendering")
+    clock.now = 0.25
+    progress.advance(3, message="3 done")
+    progress.advance(2, message="5 done")   # still inside the window: one timer, not two
+    assert writes == [(0, 100, "Rendering")]
+    assert len(FakeTimer.armed) == 1 and FakeTimer.armed[0].delay == 0.75
+
+    # The stage now blocks on a slow call; the timer writes the held-back state
+    FakeTimer.armed[0].fire()
+    assert writes[-1] == (5, 100, "5 done")
+
+    # A write made before the timer fires cancels it
+    progress.advance(1)
+    progress.flush()
+    assert FakeTimer.armed[1].cancelled and writes[-1][0] == 6
+
+def test_timer_flushes_with_the_real_clock():
+    writes = []
+    progress = ProgressReporter(lambda c, t, m: writes.append(c), min_interval_ms=20, min_step_pct=100)
+    progress.start(100)
+    progress.advance(1)
+    assert writes == [0]
+    deadline = time.monotonic() + 2
+    while writes[-1] != 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writes == [0, 1]
+
+def test_close_flushes_latest_state_once():
+    writes, clock = [], FakeClock()
+    progress = make_reporter(writes, clock)
+
+    with progress:
+        progress.start(1000)
+        progress.advance(3, message="3 done")
+    progress.flush()
+
+    assert writes == [(0, 1000, ""), (3, 1000, "3 done")]
+
+def test_concurrent_advance_counts_every_item():
+    writes, clock = [], FakeClock()
+    progress = make_reporter(writes, clock)
+    progress.start(400)
+
+    threads = [threading.Thread(target=lambda: [progress.advance() for _ in range(100)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert progress.current == 400 and writes[-1][0] == 400
+    assert len(writes) <= 12  # start + one per 10% (+ completion)
+
+def test_sink_errors_do_not_fail_the_stage():
+    def broken_sink(current, total, message):
+        raise RuntimeError("database is locked")
+
+    progress = ProgressReporter(broken_sink)
+    progress.start(2)
+    progress.advance(2)
+    progress.close()
+    assert progress.current == 2
+
+def test_for_run_writes_run_status(tmp_path):
+    db = DatabaseManager(str(tmp_path / "pipeline.db"))
+    try:
+        db.register_run("RUN_1", 1, "VID_001")
+        db.update_run_status("RUN_1", 1, "CLIPS", "running")
+        with ProgressReporter.for_run(db, "RUN_1", 1, min_interval_ms=60_000) as progress:
+            progress.start(10, "Generating clips")
+            progress.advance(4, message="Clip S004 done")
+
+        status = db.get_run_status("RUN_1", 1)
+        assert (status["progress_current"], status["progress_total"], status["progress_message"]) == (4, 10, "Clip S004 done")
+    finally:
+        db.close()
+
+def test_step_progress_reaches_run_status_through_context(tmp_path, monkeypatch):
+    import shutil
+    from src.foundation.manifest import State
+    from src.foundation.step_runner import StepContext
+    from src.llm import LLMClient, LLMResponse
+    from src.steps import planning
+
+    class OneBeatLLM(LLMClient):
+        def generate_json(self, req):
+            return LLMResponse(text="", json={"beats": [
+                {"order": 1, "line_start": 1, "line_end": 1, "intent": "Beat", "estimated_seconds": 3.0, "priority": 2}
+            ]})
+
+        def generate_text(self, req):
+            return LLMResponse(text="")
+
+    run_dir = tmp_path / "run"
+    (run_dir / "inputs" / "config").mkdir(parents=True)
+    shutil.copy("config/system_rules.yaml", run_dir / "inputs" / "config" / "system_rules.yaml")
+    (run_dir / "inputs" / "script.txt").write_text("Markets fell today. Investors panicked.\n")
+    monkeypatch.setattr(planning, "build_llm_client_from_config", lambda config: OneBeatLLM())
+    monkeypatch.chdir(tmp_path)
+
+    db = DatabaseManager(str(tmp_path / "pipeline.db"))
+    try:
+        db.register_run("RUN_1", 1, "VID_001")
+        db.update_run_status("RUN_1", 1, "PLANNING", "running")
+        # What the orchestrator hands every step
+        context = StepContext(run_id="RUN_1", run_dir=str(run_dir),
+                              services={"db": db, "progress": ProgressReporter.for_run(db, "RUN_1", 1)})
+
+        assert planning.BeatSegmenterStep().run(context).status == State.DONE
+
+        status = db.get_run_status("RUN_1", 1)
+        assert (status["progress_current"], status["progress_total"], status["progress_message"]) == (1, 1, "Segmenting script")
+    finally:
+        db.close()
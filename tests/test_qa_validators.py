@@ -0,0 +1,117 @@
+import threading
+import time
+from src.foundation.media_probe import MediaInfo, StreamInfo
+from src.qa import validators
+from src.qa.engine import QARulesEngine, QAResult, QAStatus
+
+FFMPEG_STDERR = """
+[blackdetect @ 0x55d] black_start:0 black_end:1.25 black_duration:1.25
+[freezedetect @ 0x56e] lavfi.freezedetect.freeze_start: 3.5
+[freezedetect @ 0x56e] lavfi.freezedetect.freeze_duration: 2.5
+[freezedetect @ 0x56e] lavfi.freezedetect.freeze_end: 6
+"""
+
+class FakeProbe:
+    def __init__(self, info):
+        self.info = info
+
+    def probe(self, path):
+        return self.info
+
+def clip_info(duration=8.0, width=1280, height=720, fps=24.0, audio=True):
+    streams = [StreamInfo(index=0, codec_type="video", codec_name="h264", width=width, height=height, fps=fps)]
+    if audio:
+        streams.append(StreamInfo(index=1, codec_type="audio", codec_name="aac", sample_rate=48000, channels=2))
+    return MediaInfo(path="clip.mp4", size_bytes=1, duration_s=duration, streams=streams)
+
+def test_parse_frame_analysis():
+    analysis = validators._parse_frame_analysis(FFMPEG_STDERR)
+    assert analysis["black"] == [{"start": 0.0, "end": 1.25, "duration": 1.25}]
+    assert analysis["freeze"] == [{"start": 3.5, "duration": 2.5, "end": 6.0}]
+
+def test_probe_validators(tmp_path, monkeypatch):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"x")
+    probe = FakeProbe(clip_info())
+    monkeypatch.setattr(validators, "get_media_probe", lambda: probe)
+
+    assert validators.make_duration_validator()(str(clip)).status == QAStatus.PASS
+    assert validators.make_fps_validator()(str(clip)).status == QAStatus.PASS
+    assert validators.make_resolution_validator()(str(clip)).status == QAStatus.PASS
+    assert validators.validate_audio_stream(str(clip)).status == QAStatus.PASS
+
+    probe.info = clip_info(duration=7.5, width=640, height=360, fps=29.97, audio=False)
+    assert validators.make_duration_validator()(str(clip)).status == QAStatus.FAIL
+    assert validators.make_fps_validator()(str(clip)).status == QAStatus.FAIL
+    assert validators.make_resolution_validator()(str(clip)).status == QAStatus.FAIL
+    assert validators.validate_audio_stream(str(clip)).status == QAStatus.WARNING
+
+def test_frame_validators_share_one_analysis(tmp_path, monkeypatch):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"x")
+    calls = []
+
+    def fake_analyze(path):
+        calls.append(path)
+        return validators._parse_frame_analysis(FFMPEG_STDERR)
+    monkeypatch.setattr(validators, "analyze_frames", fake_analyze)
+
+    black = validators.validate_black_frames(str(clip))
+    frozen = validators.validate_frozen_frames(str(clip))
+    assert black.status == QAStatus.FAIL and black.details["black_segments"][0]["duration"] == 1.25
+    assert frozen.status == QAStatus.FAIL
+
+    monkeypatch.setattr(validators, "analyze_frames", lambda path: None)  # no ffmpeg
+    assert validators.validate_black_frames(str(clip)).status == QAStatus.PASS
+
+def test_frame_analysis_cache_is_bounded_lru(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    clips = []
+    for i in range(3):
+        clip = tmp_path / f"S{i}.mp4"
+        clip.write_bytes(b"clip")
+        clips.append(str(clip))
+    runs = []
+    def fake_run(cmd, **kwargs):
+        runs.append(cmd[cmd.index("-i") + 1])
+        return SimpleNamespace(returncode=0, stderr=FFMPEG_STDERR)
+    monkeypatch.setattr(validators.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+    monkeypatch.setattr(validators.subprocess, "run", fake_run)
+    monkeypatch.setattr(validators, "_frame_analysis_cache", validators.OrderedDict())
+    monkeypatch.setattr(validators, "FRAME_ANALYSIS_CACHE_MAX", 2)
+
+    validators.analyze_frames(clips[0])
+    validators.analyze_frames(clips[1])
+    validators.analyze_frames(clips[0])  # hit: S0 becomes most recent
+    validators.analyze_frames(clips[2])  # evicts S1
+
+    assert len(validators._frame_analysis_cache) == 2
+    assert runs == [clips[0], clips[1], clips[2]]
+    validators.analyze_frames(clips[0])
+    validators.analyze_frames(clips[1])
+    assert runs[3:] == [clips[1]]
+
+def test_validate_clips_runs_concurrently_in_order():
+    engine = QARulesEngine()
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_validator(path):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        if path == "boom.mp4":
+            raise RuntimeError("ffmpeg crashed")
+        return QAResult(QAStatus.WARNING, path)
+    engine.register_clip_validator(slow_validator)
+
+    paths = [f"c{i}.mp4" for i in range(8)] + ["boom.mp4"]
+    results = engine.validate_clips(paths, max_workers=4)
+
+    assert list(results) == paths
+    assert [results[p].reason for p in paths[:-1]] == [f"Warnings: {p}" for p in paths[:-1]]
+    assert results["boom.mp4"].status == QAStatus.FAIL
+    assert peak[0] > 1
@@ -0,0 +1,86 @@
+import threading
+from src.models import CameraMovement
+from src.visual_director import VisualDirector
+
+class FakeAgent:
+    """Answers batches from `answers` (batch number -> suggestions); single calls echo the text."""
+    def __init__(self, answers):
+        self.answers = answers
+        self.batches = []
+        self.singles = []
+        self._lock = threading.Lock()
+
+    def suggest_visuals_batch(self, texts, context=None):
+        with self._lock:
+            batch_no = len(self.batches)
+            self.batches.append(list(texts))
+        return self.answers(batch_no, texts)
+
+    def suggest_visuals(self, text, context=None):
+        with self._lock:
+            self.singles.append(text)
+        return {"metaphor": f"single {text}", "camera": "ZOOM_IN", "intent": "single"}
+
+def make_director(monkeypatch, agent, batch_size="3"):
+    monkeypatch.setenv("AGENT_MOCK_MODE", "1")
+    monkeypatch.setenv("VISUAL_INTENT_BATCH_SIZE", batch_size)
+    director = VisualDirector(global_config=None)
+    director.agent = agent
+    return director
+
+def test_batches_cover_segments_in_order(monkeypatch):
+    def answers(batch_no, texts):
+        return {i: {"metaphor": f"batch {t}", "camera": "TILT_UP", "intent": "b"} for i, t in enumerate(texts)}
+
+    agent = FakeAgent(answers)
+    texts = [f"seg{i}" for i in range(7)]
+    intents = make_director(monkeypatch, agent)._derive_visual_intents(texts)
+
+    assert sorted(len(b) for b in agent.batches) == [1, 3, 3]
+    assert agent.singles == []
+    assert [i["metaphor"] for i in intents] == [f"batch seg{i}" for i in range(7)]
+    assert intents[0]["camera"] == CameraMovement.TILT_UP
+
+def test_invalid_or_missing_indices_fall_back_per_segment(monkeypatch):
+    def answers(batch_no, texts):
+        out = {i: {"metaphor": f"batch {t}", "camera": "PAN_LEFT"} for i, t in enumerate(texts)}
+        if "seg1" in texts:
+            del out[texts.index("seg1")]                          # missing
+            out[texts.index("seg2")]["camera"] = "DOLLY_ZOOM"     # unknown camera
+        if "seg4" in texts:
+            return None                                           # whole batch failed
+        return out
+
+    agent = FakeAgent(answers)
+    texts = [f"seg{i}" for i in range(6)]
+    intents = make_director(monkeypatch, agent)._derive_visual_intents(texts)
+
+    assert sorted(agent.singles) == ["seg1", "seg2", "seg3", "seg4", "seg5"]
+    assert intents[0]["metaphor"] == "batch seg0"
+    assert intents[1]["metaphor"] == "single seg1"
+    assert intents[2]["camera"] == CameraMovement.ZOOM_IN
+
+def test_batch_size_one_keeps_per_segment_calls(monkeypatch):
+    agent = FakeAgent(lambda batch_no, texts: {})
+    intents = make_director(monkeypatch, agent, batch_size="1")._derive_visual_intents(["a", "b"])
+
+    assert agent.batches == []
+    assert [i["metaphor"] for i in intents] == ["single a", "single b"]
+
+def test_progress_advances_as_batches_finish(monkeypatch):
+    from src.foundation.progress import ProgressReporter
+    writes = []
+    progress = ProgressReporter(lambda current, total, message: writes.append(current), min_interval_ms=0)
+
+    def answers(batch_no, texts):
+        # Each batch sees the progress of the ones before it (workers=1)
+        assert progress.current == 3 * batch_no
+        return {i: {"metaphor": t, "camera": "TILT_UP"} for i, t in enumerate(texts)}
+
+    monkeypatch.setenv("VISUAL_INTENT_WORKERS", "1")
+    progress.start(7, "Deriving visual intents")
+    make_director(monkeypatch, FakeAgent(answers))._derive_visual_intents(
+        [f"seg{i}" for i in range(7)], on_done=progress.advance
+    )
+
+    assert writes == [0, 3, 6, 7]